@@ -0,0 +1 @@
+"""Benchmarks for django-create-initial-user."""
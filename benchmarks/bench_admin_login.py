@@ -0,0 +1,234 @@
+"""
+End-to-end admin login throughput on a local WSGI server.
+
+Serves the test project from Django's threaded WSGI server on 127.0.0.1, with
+the default database in a temporary SQLite file, and drives concurrent POSTs
+to /admin/login/ from a pool of client threads. Two scenarios are reported:
+
+* steady_state: a superuser exists and every login goes through the
+  ModelBackend fallback, for ``--duration`` seconds
+* first_run: each round starts with no users and fires ``--concurrency``
+  simultaneous logins, one of which creates the initial superuser
+
+Each reports throughput, latency percentiles, the error rate and the status
+codes seen; first_run also counts rounds that did not end with exactly one
+superuser. Nothing leaves localhost.
+
+Usage::
+
+    python -m benchmarks.bench_admin_login --concurrency 8 --duration 10
+"""
+
+import argparse
+import http.client
+import secrets
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from benchmarks.harness import emit, environment, percentile, setup_django
+
+LOGIN_PATH = "/admin/login/"
+USERNAME = "admin"
+PASSWORD = "benchmark-password"
+
+
+class LoginClient:
+    """
+    Posts the admin login form, timing each request.
+
+    Django's CSRF check compares the form token with the cookie, so the
+    client picks its own token and sends both instead of fetching the form.
+    """
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        token = secrets.token_hex(16)
+        self.body = urlencode(
+            {
+                "csrfmiddlewaretoken": token,
+                "username": USERNAME,
+                "password": PASSWORD,
+                "next": "/admin/",
+            }
+        )
+        self.headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Cookie": f"csrftoken={token}",
+            "Connection": "close",
+        }
+
+    def login(self) -> Tuple[Optional[int], float]:
+        """
+        POST the form once.
+
+        Returns:
+            The status code, or None if the request failed, and the seconds
+            it took. A successful login is a 302 to the admin index.
+        """
+        started = time.perf_counter()
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        try:
+            connection.request("POST", LOGIN_PATH, self.body, self.headers)
+            response = connection.getresponse()
+            response.read()
+            status: Optional[int] = response.status
+        except (OSError, http.client.HTTPException):
+            status = None
+        finally:
+            connection.close()
+        return status, time.perf_counter() - started
+
+
+def start_server() -> Tuple[Any, int]:
+    """Serve the test project on an ephemeral localhost port in a thread."""
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadedWSGIServer(
+        ("127.0.0.1", 0), QuietHandler, allow_reuse_address=False
+    )
+    server.set_app(WSGIHandler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+def summarise(
+    results: List[Tuple[Optional[int], float]], elapsed: float
+) -> Dict[str, Any]:
+    """Turn ``(status, seconds)`` pairs into throughput, latency and errors."""
+    latencies = [seconds for _, seconds in results]
+    statuses = Counter(
+        "error" if status is None else str(status) for status, _ in results
+    )
+    succeeded = statuses.get("302", 0)
+    return {
+        "requests": len(results),
+        "elapsed_s": elapsed,
+        "requests_per_sec": len(results) / elapsed,
+        "logins_per_sec": succeeded / elapsed,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "error_rate": 1 - succeeded / len(results),
+        "statuses": dict(statuses),
+    }
+
+
+def steady_state(port: int, concurrency: int, duration: float) -> Dict[str, Any]:
+    """Log in as the existing superuser from every client until time is up."""
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    User.objects.all().delete()
+    User.objects.create_superuser(username=USERNAME, password=PASSWORD)
+
+    def worker() -> List[Tuple[Optional[int], float]]:
+        client = LoginClient(port)
+        results = []
+        while time.perf_counter() < deadline:
+            results.append(client.login())
+        return results
+
+    started = time.perf_counter()
+    deadline = started + duration
+    with ThreadPoolExecutor(concurrency) as pool:
+        futures = [pool.submit(worker) for _ in range(concurrency)]
+        results = [result for future in futures for result in future.result()]
+    return summarise(results, time.perf_counter() - started)
+
+
+def first_run(port: int, concurrency: int, rounds: int) -> Dict[str, Any]:
+    """Fire simultaneous logins at an empty user table, ``rounds`` times."""
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    barrier = threading.Barrier(concurrency)
+
+    def worker() -> Tuple[Optional[int], float]:
+        client = LoginClient(port)
+        barrier.wait()
+        return client.login()
+
+    results: List[Tuple[Optional[int], float]] = []
+    elapsed = 0.0
+    bad_rounds = 0
+    with ThreadPoolExecutor(concurrency) as pool:
+        for _ in range(rounds):
+            # Deleting the users resets the backend's latch and cache.
+            User.objects.all().delete()
+            started = time.perf_counter()
+            results.extend(pool.map(lambda _: worker(), range(concurrency)))
+            elapsed += time.perf_counter() - started
+            if User.objects.filter(is_superuser=True).count() != 1:
+                bad_rounds += 1
+
+    summary = summarise(results, elapsed)
+    summary["rounds"] = rounds
+    summary["rounds_without_exactly_one_superuser"] = bad_rounds
+    return summary
+
+
+def run(
+    concurrency: int, duration: float, rounds: int, hasher: Optional[str]
+) -> Dict[str, Any]:
+    """Run both scenarios against one server."""
+    from django.conf import settings
+    from django.test.utils import override_settings
+
+    hashers = [hasher] if hasher else settings.PASSWORD_HASHERS
+    server, port = start_server()
+    try:
+        with override_settings(DEBUG=True, PASSWORD_HASHERS=hashers):
+            first = first_run(port, concurrency, rounds)
+            steady = steady_state(port, concurrency, duration)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {
+        "environment": environment(),
+        "concurrency": concurrency,
+        "hasher": hashers[0],
+        "first_run": first,
+        "steady_state": steady,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds of steady-state load"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=20, help="First-run rounds from an empty table"
+    )
+    parser.add_argument(
+        "--hasher",
+        help="Dotted path of the password hasher to use instead of PASSWORD_HASHERS",
+    )
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(test_database=str(Path(directory) / "bench.sqlite3"))
+        emit(
+            run(args.concurrency, args.duration, args.rounds, args.hasher), args.output
+        )
+
+
+if __name__ == "__main__":
+    main()
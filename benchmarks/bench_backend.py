@@ -0,0 +1,114 @@
+"""
+Microbenchmarks for the CreateInitialSuperUserBackend hot paths.
+
+Measures, for every configured password hasher:
+
+- ``steady_state``: a regular login with a superuser present
+- ``cold_create``: the first login that creates the superuser
+- ``email_create``: the first login with an email-like username
+- ``failed_fallback``: a wrong password handled by the ModelBackend fallback
+
+Usage::
+
+    python -m benchmarks.bench_backend --iterations 20 --output results.json
+"""
+
+import argparse
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.harness import (
+    available_hashers,
+    emit,
+    environment,
+    measure,
+    setup_django,
+)
+
+PASSWORD = "benchmark-password"
+
+
+def build_paths(backend: Any, User: Any) -> Dict[str, Dict[str, Callable[[], Any]]]:
+    """Return the setup/operation pairs for each benchmarked path."""
+    from create_initial_superuser.state import superuser_latch
+
+    def with_users() -> None:
+        User.objects.create_superuser(username="admin", password=PASSWORD)
+        User.objects.create_user(username="regular", password=PASSWORD)
+        superuser_latch.set()
+
+    def without_users() -> None:
+        superuser_latch.reset()
+
+    return {
+        "steady_state": {
+            "setup": with_users,
+            "operation": lambda: backend.authenticate(
+                None, username="regular", password=PASSWORD
+            ),
+        },
+        "cold_create": {
+            "setup": without_users,
+            "operation": lambda: backend.authenticate(
+                None, username="admin", password=PASSWORD
+            ),
+        },
+        "email_create": {
+            "setup": without_users,
+            "operation": lambda: backend.authenticate(
+                None, username="admin@example.com", password=PASSWORD
+            ),
+        },
+        "failed_fallback": {
+            "setup": with_users,
+            "operation": lambda: backend.authenticate(
+                None, username="regular", password="wrong-password"
+            ),
+        },
+    }
+
+
+def run(
+    iterations: int, warmup: int, hashers: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Run every path against every available hasher, or just ``hashers``."""
+    from django.contrib.auth import get_user_model
+    from django.test.utils import override_settings
+
+    from create_initial_superuser.backends import CreateInitialSuperUserBackend
+
+    backend = CreateInitialSuperUserBackend()
+    paths = build_paths(backend, get_user_model())
+
+    results: Dict[str, Any] = {"environment": environment(), "results": []}
+    for hasher in hashers or available_hashers():
+        with override_settings(PASSWORD_HASHERS=[hasher]):
+            for name, path in paths.items():
+                stats = measure(
+                    path["operation"],
+                    iterations=iterations,
+                    warmup=warmup,
+                    setup=path["setup"],
+                )
+                results["results"].append({"path": name, "hasher": hasher, **stats})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--hasher",
+        action="append",
+        dest="hashers",
+        help="Dotted path of a hasher to benchmark (repeatable, default: all)",
+    )
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    setup_django()
+    emit(run(args.iterations, args.warmup, args.hashers), args.output)
+
+
+if __name__ == "__main__":
+    main()
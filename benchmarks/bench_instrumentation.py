@@ -0,0 +1,94 @@
+"""
+Overhead of the authenticate() stage instrumentation.
+
+Times the steady-state login path (superuser latched, ModelBackend fallback)
+with instrumentation disabled and enabled, and the disabled-mode check on its
+own, to show that turning instrumentation off costs essentially nothing.
+
+Usage::
+
+    python -m benchmarks.bench_instrumentation --iterations 5000
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+from benchmarks.harness import emit, environment, rollback, setup_django
+
+PASSWORD = "benchmark-password"
+FAST_HASHER = "django.contrib.auth.hashers.MD5PasswordHasher"
+
+
+def time_per_op(operation: Callable[[], Any], iterations: int) -> float:
+    """Return the mean seconds per call of ``operation``."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    return (time.perf_counter() - started) / iterations
+
+
+def run(iterations: int, rounds: int) -> Dict[str, Any]:
+    """Alternate disabled and enabled rounds and keep the best of each."""
+    from django.contrib.auth import get_user_model
+    from django.test.utils import override_settings
+
+    from create_initial_superuser.backends import CreateInitialSuperUserBackend
+    from create_initial_superuser.instrumentation import get_sink
+    from create_initial_superuser.state import superuser_latch
+
+    backend = CreateInitialSuperUserBackend()
+    User = get_user_model()
+
+    def login() -> None:
+        backend.authenticate(None, username="regular", password=PASSWORD)
+
+    disabled = override_settings(CREATE_INITIAL_SUPERUSER={"TRACING": False})
+    enabled = override_settings(
+        CREATE_INITIAL_SUPERUSER={
+            "INSTRUMENTATION": {"ENABLED": True},
+            "TRACING": False,
+        }
+    )
+
+    best = {"disabled": float("inf"), "enabled": float("inf"), "check": float("inf")}
+    with override_settings(PASSWORD_HASHERS=[FAST_HASHER]), rollback():
+        User.objects.create_superuser(username="admin", password=PASSWORD)
+        User.objects.create_user(username="regular", password=PASSWORD)
+        superuser_latch.set()
+
+        for _ in range(rounds):
+            with disabled:
+                best["disabled"] = min(best["disabled"], time_per_op(login, iterations))
+                best["check"] = min(
+                    best["check"], time_per_op(get_sink, iterations * 10)
+                )
+            with enabled:
+                best["enabled"] = min(best["enabled"], time_per_op(login, iterations))
+
+    return {
+        "environment": environment(),
+        "iterations": iterations,
+        "rounds": rounds,
+        "disabled_us_per_login": best["disabled"] * 1e6,
+        "enabled_us_per_login": best["enabled"] * 1e6,
+        "disabled_check_ns": best["check"] * 1e9,
+        # Share of a disabled login spent deciding that instrumentation is off.
+        "disabled_overhead_pct": best["check"] / best["disabled"] * 100,
+        "enabled_overhead_pct": (best["enabled"] / best["disabled"] - 1) * 100,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    setup_django()
+    emit(run(args.iterations, args.rounds), args.output)
+
+
+if __name__ == "__main__":
+    main()
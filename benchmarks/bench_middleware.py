@@ -0,0 +1,91 @@
+"""
+Per-request cost of FirstRunMiddleware.
+
+Times a trivial view called directly, through the middleware after it has
+switched itself off (the steady state once a superuser exists), and through
+the middleware during the first run, when every page request checks for a
+superuser and redirects to the login page.
+
+Usage::
+
+    python -m benchmarks.bench_middleware --iterations 100000
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+from benchmarks.harness import emit, environment, rollback, setup_django
+
+
+def time_per_op(operation: Callable[[], Any], iterations: int) -> float:
+    """Return the mean seconds per call of ``operation``."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    return (time.perf_counter() - started) / iterations
+
+
+def run(iterations: int, rounds: int) -> Dict[str, Any]:
+    """Alternate the three variants and keep the best round of each."""
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.test.utils import override_settings
+
+    from create_initial_superuser.middleware import FirstRunMiddleware
+    from create_initial_superuser.state import superuser_latch
+
+    response = HttpResponse("ok")
+    request = RequestFactory().get("/home/")
+
+    def view(request: Any) -> HttpResponse:
+        return response
+
+    best = {"direct": float("inf"), "done": float("inf"), "first_run": float("inf")}
+    with override_settings(CREATE_INITIAL_SUPERUSER={"ENABLED": True}), rollback():
+        superuser_latch.reset()
+        first_run = FirstRunMiddleware(view)
+        done = FirstRunMiddleware(view)
+        superuser_latch.set()
+        done(request)
+        superuser_latch.reset()
+        assert done.done and not first_run.done
+
+        for _ in range(rounds):
+            best["direct"] = min(
+                best["direct"], time_per_op(lambda: view(request), iterations)
+            )
+            best["done"] = min(
+                best["done"], time_per_op(lambda: done(request), iterations)
+            )
+            best["first_run"] = min(
+                best["first_run"],
+                time_per_op(lambda: first_run(request), max(1, iterations // 100)),
+            )
+
+    return {
+        "environment": environment(),
+        "iterations": iterations,
+        "rounds": rounds,
+        "direct_ns_per_request": best["direct"] * 1e9,
+        "done_ns_per_request": best["done"] * 1e9,
+        # What the middleware adds once a superuser exists: one attribute
+        # check and a call.
+        "done_overhead_ns": (best["done"] - best["direct"]) * 1e9,
+        "first_run_us_per_request": best["first_run"] * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    setup_django()
+    emit(run(args.iterations, args.rounds), args.output)
+
+
+if __name__ == "__main__":
+    main()
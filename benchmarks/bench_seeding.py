@@ -0,0 +1,72 @@
+"""
+Speedup of process-pool password hashing for bulk provisioning.
+
+Builds the same users serially and with increasing numbers of worker
+processes, using the project's real password hasher, and reports users/sec
+and the speedup over the serial path. Only row parsing and hashing are timed;
+database inserts are the same for every run.
+
+Usage::
+
+    python -m benchmarks.bench_seeding --users 256 --processes 1 2 4 8
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.harness import emit, environment, setup_django
+
+PASSWORD = "benchmark-password"
+
+
+def run(users: int, processes: List[int], hasher: Optional[str]) -> Dict[str, Any]:
+    """Time build_users() for each process count."""
+    from django.contrib.auth.hashers import get_hasher
+
+    from create_initial_superuser.seeding import build_users
+
+    rows = [{"username": f"user{i}", "password": PASSWORD} for i in range(users)]
+
+    results = {}
+    for count in processes:
+        started = time.perf_counter()
+        built = sum(1 for _ in build_users(rows, hasher=hasher, processes=count))
+        elapsed = time.perf_counter() - started
+        results[count] = {"seconds": elapsed, "users_per_sec": built / elapsed}
+
+    serial = results[processes[0]]["seconds"]
+    for result in results.values():
+        result["speedup"] = serial / result["seconds"]
+
+    return {
+        "environment": environment(),
+        "cpu_count": os.cpu_count(),
+        "hasher": get_hasher(hasher or "default").algorithm,
+        "users": users,
+        # Keyed by worker count; the first entry is the baseline.
+        "processes": {str(count): result for count, result in results.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=256)
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+        help="Worker counts to compare; the first is the baseline (default 1)",
+    )
+    parser.add_argument("--hasher", help="Hasher algorithm, e.g. pbkdf2_sha256")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    setup_django()
+    emit(run(args.users, args.processes, args.hasher), args.output)
+
+
+if __name__ == "__main__":
+    main()
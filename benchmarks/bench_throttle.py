@@ -0,0 +1,154 @@
+"""
+CPU cost of a credential flood with and without the attempt throttle.
+
+Replays a paced flood of failed logins, with a fresh username on every
+attempt from a small pool of client addresses, against the backend for a
+fixed wall-clock duration. Each attempt that gets through costs a full
+password hash (ModelBackend hashes a dummy password for unknown users), so
+without the throttle the process spends all of its CPU hashing. With the
+throttle, hashing is capped at ``clients * (burst + rate * seconds)`` attempts
+and the rest are rejected for microseconds each.
+
+Usage::
+
+    python -m benchmarks.bench_throttle --seconds 10 --offered-rate 100
+"""
+
+import argparse
+import time
+from typing import Any, Dict
+
+from benchmarks.harness import emit, environment, rollback, setup_django
+
+PASSWORD = "benchmark-password"
+
+
+def flood(
+    backend: Any, seconds: float, offered_rate: float, clients: int
+) -> Dict[str, Any]:
+    """Send paced failed logins for ``seconds`` and measure the CPU used."""
+    from django.test import RequestFactory
+
+    requests = [
+        RequestFactory().post("/admin/login/", REMOTE_ADDR=f"198.51.100.{i + 1}")
+        for i in range(clients)
+    ]
+    interval = 1.0 / offered_rate
+    attempts = 0
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    deadline = wall_started + seconds
+
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        # Attempts arrive on a fixed schedule; a slow backend falls behind.
+        next_at = wall_started + attempts * interval
+        if next_at > now:
+            time.sleep(min(next_at, deadline) - now)
+            continue
+        backend.authenticate(
+            requests[attempts % clients],
+            username=f"bot-{attempts}",
+            password=PASSWORD,
+        )
+        attempts += 1
+
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+    return {
+        "offered": int(seconds * offered_rate),
+        "attempts": attempts,
+        "cpu_seconds": cpu,
+        "cpu_share": cpu / wall,
+    }
+
+
+def run(
+    seconds: float,
+    offered_rate: float,
+    clients: int,
+    rate: float,
+    burst: int,
+    hasher: str,
+) -> Dict[str, Any]:
+    """Run the flood with the throttle disabled, then enabled."""
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.test.utils import override_settings
+
+    from create_initial_superuser.backends import CreateInitialSuperUserBackend
+    from create_initial_superuser.instrumentation import get_sink
+    from create_initial_superuser.state import superuser_latch
+
+    backend = CreateInitialSuperUserBackend()
+    User = get_user_model()
+    throttle = {"RATE": rate, "BURST": burst}
+    results = {}
+
+    with override_settings(PASSWORD_HASHERS=[hasher]), rollback():
+        User.objects.create_superuser(username="admin", password=PASSWORD)
+        superuser_latch.set()
+
+        started = time.process_time()
+        make_password(PASSWORD)
+        hash_seconds = time.process_time() - started
+
+        for name, options in (("unthrottled", None), ("throttled", throttle)):
+            settings = {"THROTTLE": options, "INSTRUMENTATION": {"ENABLED": True}}
+            with override_settings(CREATE_INITIAL_SUPERUSER=settings):
+                get_sink().reset()
+                result = flood(backend, seconds, offered_rate, clients)
+                throttled = get_sink().snapshot()["outcomes"].get("throttled", 0)
+            result["hashed"] = result["attempts"] - throttled
+            result["throttled"] = throttled
+            results[name] = result
+
+    return {
+        "environment": environment(),
+        "hasher": hasher,
+        "hash_cpu_seconds": hash_seconds,
+        "seconds": seconds,
+        "offered_rate": offered_rate,
+        "clients": clients,
+        "throttle": throttle,
+        # Most attempts the throttle can let through in the run.
+        "max_hashed": int(clients * (burst + rate * seconds)),
+        **results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument(
+        "--offered-rate", type=float, default=100.0, help="Attempts per second"
+    )
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=0.1)
+    parser.add_argument("--burst", type=int, default=1)
+    parser.add_argument(
+        "--hasher",
+        default="django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        help="Dotted path of the password hasher to flood",
+    )
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    setup_django()
+    emit(
+        run(
+            args.seconds,
+            args.offered_rate,
+            args.clients,
+            args.rate,
+            args.burst,
+            args.hasher,
+        ),
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
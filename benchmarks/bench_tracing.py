@@ -0,0 +1,99 @@
+"""
+Overhead of the optional tracing spans.
+
+Times the steady-state login path (superuser latched, ModelBackend fallback)
+with tracing off, which uses the no-op tracer, and with tracing on through
+whatever tracer provider is installed, plus one no-op span on its own. With
+only opentelemetry-api installed the spans are non-recording; without it the
+"on" variant is skipped.
+
+Usage::
+
+    python -m benchmarks.bench_tracing --iterations 5000
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+from benchmarks.harness import emit, environment, rollback, setup_django
+
+PASSWORD = "benchmark-password"
+FAST_HASHER = "django.contrib.auth.hashers.MD5PasswordHasher"
+
+
+def time_per_op(operation: Callable[[], Any], iterations: int) -> float:
+    """Return the mean seconds per call of ``operation``."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    return (time.perf_counter() - started) / iterations
+
+
+def run(iterations: int, rounds: int) -> Dict[str, Any]:
+    """Alternate tracing off and on rounds and keep the best of each."""
+    from django.contrib.auth import get_user_model
+    from django.test.utils import override_settings
+
+    from create_initial_superuser.backends import CreateInitialSuperUserBackend
+    from create_initial_superuser.state import superuser_latch
+    from create_initial_superuser.tracing import NOOP_TRACER, build_tracer
+
+    backend = CreateInitialSuperUserBackend()
+    User = get_user_model()
+    traced = build_tracer(True) is not NOOP_TRACER
+
+    def login() -> None:
+        backend.authenticate(None, username="regular", password=PASSWORD)
+
+    def noop_span() -> None:
+        with NOOP_TRACER.start_as_current_span("span"):
+            pass
+
+    off = override_settings(CREATE_INITIAL_SUPERUSER={"TRACING": False})
+    on = override_settings(CREATE_INITIAL_SUPERUSER={"TRACING": True})
+
+    best = {"off": float("inf"), "on": float("inf"), "span": float("inf")}
+    with override_settings(PASSWORD_HASHERS=[FAST_HASHER]), rollback():
+        User.objects.create_superuser(username="admin", password=PASSWORD)
+        User.objects.create_user(username="regular", password=PASSWORD)
+        superuser_latch.set()
+
+        for _ in range(rounds):
+            with off:
+                best["off"] = min(best["off"], time_per_op(login, iterations))
+            best["span"] = min(best["span"], time_per_op(noop_span, iterations * 10))
+            if traced:
+                with on:
+                    best["on"] = min(best["on"], time_per_op(login, iterations))
+
+    result = {
+        "environment": environment(),
+        "iterations": iterations,
+        "rounds": rounds,
+        "opentelemetry": traced,
+        "off_us_per_login": best["off"] * 1e6,
+        "noop_span_ns": best["span"] * 1e9,
+        # A steady-state login opens three spans: authenticate, exists and
+        # fallback.
+        "off_overhead_pct": 3 * best["span"] / best["off"] * 100,
+    }
+    if traced:
+        result["on_us_per_login"] = best["on"] * 1e6
+        result["on_overhead_pct"] = (best["on"] / best["off"] - 1) * 100
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    setup_django()
+    emit(run(args.iterations, args.rounds), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Shared helpers for the benchmark scripts.
+
+The benchmarks run against the test project in ``tests/settings.py`` with an
+in-memory SQLite database, so they need no network or external services.
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(test_database: Optional[str] = None) -> None:
+    """
+    Configure Django with the test settings and create the test database.
+
+    Args:
+        test_database: File for the default test database instead of the
+            in-memory one, for benchmarks that use it from several threads
+    """
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+    import django
+
+    if test_database is not None:
+        from django.conf import settings
+
+        settings.DATABASES["default"]["TEST"] = {"NAME": test_database}
+
+    django.setup()
+
+    from django.db import connection
+
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    # Bootstrap events may also be reported as warnings; they are expected here.
+    warnings.simplefilter("ignore")
+
+
+def available_hashers() -> List[str]:
+    """Return the configured password hashers whose libraries are installed."""
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+
+    hashers = []
+    for path in settings.PASSWORD_HASHERS:
+        hasher = import_string(path)()
+        try:
+            if getattr(hasher, "library", None):
+                hasher._load_library()
+        except ValueError:
+            continue
+        hashers.append(path)
+    return hashers
+
+
+@contextmanager
+def rollback() -> Iterator[None]:
+    """Run the block in a transaction that is always rolled back."""
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(
+    operation: Callable[[], Any],
+    iterations: int,
+    warmup: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Time ``operation`` and count the queries it runs.
+
+    Each iteration runs inside a rolled-back transaction, after the optional
+    ``setup`` callable, so every iteration starts from the same database state.
+    Only ``operation`` itself is timed.
+
+    Returns:
+        A dict with ops/sec, latency percentiles in milliseconds and the mean
+        number of queries per operation
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    durations = []
+    queries = []
+    for index in range(warmup + iterations):
+        with rollback():
+            if setup is not None:
+                setup()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                operation()
+                elapsed = time.perf_counter() - started
+        if index >= warmup:
+            durations.append(elapsed)
+            queries.append(len(captured))
+
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / sum(durations),
+        "mean_ms": statistics.mean(durations) * 1000,
+        "p50_ms": percentile(durations, 0.50) * 1000,
+        "p99_ms": percentile(durations, 0.99) * 1000,
+        "queries_per_op": statistics.mean(queries),
+    }
+
+
+def emit(results: Dict[str, Any], output: Optional[str]) -> None:
+    """Write ``results`` as JSON to ``output``, or to stdout."""
+    payload = json.dumps(results, indent=2, sort_keys=True)
+    if output:
+        Path(output).write_text(payload + "\n")
+    else:
+        print(payload)
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the interpreter and Django version for the JSON report."""
+    import platform
+
+    import django
+
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "platform": platform.platform(),
+    }
@@ -1,7 +1,39 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core import checks
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_init, post_save
 
 
 class CreateInitialSuperuserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "create_initial_superuser"
     verbose_name = "Create Initial Superuser"
+
+    def ready(self) -> None:
+        from . import checks as app_checks
+        from . import conf, signals
+
+        conf.reload_config()
+        checks.register(
+            app_checks.check_superuser_query_plan, checks.Tags.database, deploy=True
+        )
+        setting_changed.connect(
+            signals.settings_changed,
+            dispatch_uid="create_initial_superuser.settings_changed",
+        )
+        post_init.connect(
+            signals.user_initialized,
+            sender=settings.AUTH_USER_MODEL,
+            dispatch_uid="create_initial_superuser.user_initialized",
+        )
+        post_save.connect(
+            signals.user_saved,
+            sender=settings.AUTH_USER_MODEL,
+            dispatch_uid="create_initial_superuser.user_saved",
+        )
+        post_delete.connect(
+            signals.user_deleted,
+            sender=settings.AUTH_USER_MODEL,
+            dispatch_uid="create_initial_superuser.user_deleted",
+        )
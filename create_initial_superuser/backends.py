@@ -1,16 +1,126 @@
 """Django authentication backend for creating initial superuser."""
 
+from __future__ import annotations
+
+import logging
+import random
+import time
 import warnings
-from typing import Any, Optional
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
-from django.contrib.auth.hashers import make_password
-from django.contrib.auth.models import AbstractUser
-from django.http import HttpRequest
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import IntegrityError, OperationalError, router, transaction
+
+from asgiref.sync import sync_to_async
+
+from .cache import (
+    aget_superuser_exists,
+    aset_superuser_exists,
+    get_superuser_exists,
+    set_superuser_exists,
+)
+from .conf import get_config
+from .events import (
+    EVENT_CREATED,
+    EVENT_FELL_BACK,
+    EVENT_REJECTED,
+    EVENT_SKIPPED,
+    EVENT_THROTTLED,
+    log_event,
+)
+from .hashing import HashingExecutorSaturated, get_hashing_executor
+from .instrumentation import (
+    OUTCOME_CACHE_HIT,
+    OUTCOME_CREATED,
+    OUTCOME_EXISTS_QUERY,
+    OUTCOME_FELL_BACK,
+    OUTCOME_LATCH_HIT,
+    OUTCOME_LOST_RACE,
+    OUTCOME_REJECTED,
+    OUTCOME_THROTTLED,
+    STAGE_EXISTS,
+    STAGE_FALLBACK,
+    STAGE_HASH,
+    STAGE_INSERT,
+)
+from .models import BootstrapLock
+from .state import superuser_latch
+from .tracing import (
+    ATTR_DATABASE,
+    SPAN_AUTHENTICATE,
+    SPAN_EXISTS,
+    SPAN_FALLBACK,
+    SPAN_HASH,
+    SPAN_INSERT,
+    set_outcome,
+)
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractUser
+    from django.db.models import QuerySet
+    from django.http import HttpRequest
+
+    from .conf import BootstrapConfig
+    from .instrumentation import InstrumentationSink
+
+BOOTSTRAP_LOCK_NAME = "initial-superuser"
+
+# Lock errors worth retrying the bootstrap transaction for: SQLSTATEs of
+# serialization failures, deadlocks and lock timeouts, and the messages of
+# SQLite's busy errors and of MySQL's deadlock and lock wait timeout errors.
+# Any other OperationalError, such as a missing table, is raised at once.
+TRANSIENT_SQLSTATES = frozenset({"40001", "40P01", "55P03"})
+TRANSIENT_MESSAGES = (
+    "database is locked",
+    "database table is locked",
+    "deadlock",
+    "lock wait timeout",
+    "could not serialize access",
+    "could not obtain lock",
+)
 
-User = get_user_model()
+# User models resolved so far, by AUTH_USER_MODEL value.
+_user_models: Dict[str, type] = {}
+
+# The request being handled, set by TenantUserMiddleware so that get_user(),
+# which Django calls without the request, can resolve its tenant too.
+_current_request: ContextVar[Optional[HttpRequest]] = ContextVar(
+    "create_initial_superuser_request", default=None
+)
+
+
+def _user_model() -> type:
+    """
+    Return the user model, resolved on first use.
+
+    Resolving lazily keeps importing the backend free of model lookups, and
+    keying by ``AUTH_USER_MODEL`` picks up a different model swapped in with
+    ``override_settings``.
+    """
+    label = settings.AUTH_USER_MODEL
+    User = _user_models.get(label)
+    if User is None:
+        User = _user_models[label] = get_user_model()
+    return User
+
+
+def _call(fn: Callable[..., Any], *args: Any) -> Any:
+    return fn(*args)
+
+
+def _is_transient_lock_error(exc: OperationalError) -> bool:
+    """Return True if ``exc`` is a lock conflict that a retry can resolve."""
+    cause = exc.__cause__
+    # psycopg2 exposes the SQLSTATE as pgcode, psycopg 3 as sqlstate.
+    sqlstate = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+    if sqlstate in TRANSIENT_SQLSTATES:
+        return True
+    message = str(exc).lower()
+    return any(fragment in message for fragment in TRANSIENT_MESSAGES)
 
 
 class CreateInitialSuperUserBackend(ModelBackend):
@@ -27,13 +137,18 @@ class CreateInitialSuperUserBackend(ModelBackend):
         AUTHENTICATION_BACKENDS when DEBUG=True.
     """
 
+    # Retries and base delay, in seconds, for transient lock errors while
+    # creating the initial superuser.
+    create_retries = 5
+    create_backoff = 0.05
+
     def authenticate(
         self,
         request: Optional[HttpRequest],
         username: Optional[str] = "",
         password: Optional[str] = "",
         **kwargs: Any,
-    ) -> Optional[User]:
+    ) -> Optional[AbstractUser]:
         """
         Authenticate user and create initial superuser if needed.
 
@@ -57,18 +172,453 @@ class CreateInitialSuperUserBackend(ModelBackend):
         if not username or not password:
             return None
 
-        # Check if we should create an initial superuser
-        if settings.DEBUG and not User.objects.filter(is_superuser=True).exists():
-            return self._create_initial_superuser(User, username, password)
-        else:
-            # Fallback to the default ModelBackend authentication
-            return super().authenticate(
-                request, username=username, password=password, **kwargs
+        config = get_config()
+        with config.tracer.start_as_current_span(SPAN_AUTHENTICATE) as span:
+            sink = config.sink
+            if config.throttle is not None and not config.throttle.allow_request(
+                request, username
+            ):
+                self._record_throttled(request, username, sink)
+                set_outcome(span, OUTCOME_THROTTLED)
+                return None
+            using = self._tenant_database(request, config)
+            User = _user_model()
+            database = self._span_database(span, User, using)
+
+            # Check if we should create an initial superuser
+            try:
+                if config.enabled:
+                    if self._superuser_exists(User, sink, using):
+                        log_event(
+                            logging.DEBUG,
+                            EVENT_SKIPPED,
+                            username=username,
+                            lost_race=False,
+                        )
+                    else:
+                        user = self._create_initial_superuser(
+                            User, username, password, using
+                        )
+                        if user is not None:
+                            set_outcome(span, OUTCOME_CREATED)
+                            return user
+
+                # Fallback to the default ModelBackend authentication
+                with config.tracer.start_as_current_span(SPAN_FALLBACK) as stage:
+                    if sink is None:
+                        user = self._fallback_authenticate(
+                            request,
+                            username=username,
+                            password=password,
+                            using=using,
+                            **kwargs,
+                        )
+                    else:
+                        started = time.perf_counter()
+                        user = self._fallback_authenticate(
+                            request,
+                            username=username,
+                            password=password,
+                            using=using,
+                            **kwargs,
+                        )
+                        sink.record_stage(STAGE_FALLBACK, time.perf_counter() - started)
+                        sink.record_outcome(OUTCOME_FELL_BACK)
+                    set_outcome(stage, OUTCOME_FELL_BACK, database)
+            except HashingExecutorSaturated:
+                self._record_rejected(username, sink, span)
+                return None
+
+            log_event(
+                logging.DEBUG,
+                EVENT_FELL_BACK,
+                username=username,
+                authenticated=user is not None,
+            )
+            set_outcome(span, OUTCOME_FELL_BACK)
+            return user
+
+    async def aauthenticate(
+        self,
+        request: Optional[HttpRequest],
+        username: Optional[str] = "",
+        password: Optional[str] = "",
+        **kwargs: Any,
+    ) -> Optional[AbstractUser]:
+        """
+        Asynchronous version of authenticate() for ASGI deployments.
+
+        Uses the async ORM and offloads password hashing to a worker thread so
+        neither blocks the event loop.
+
+        Args:
+            request: The HTTP request object
+            username: Username (can be empty for email-only authentication)
+            password: Password
+            **kwargs: Additional keyword arguments (may include 'email')
+
+        Returns:
+            User object if authentication successful, None otherwise
+        """
+        email = kwargs.get("email", "")
+
+        if not username and email:
+            username = email
+
+        if not username or not password:
+            return None
+
+        config = get_config()
+        with config.tracer.start_as_current_span(SPAN_AUTHENTICATE) as span:
+            sink = config.sink
+            if config.throttle is not None and not config.throttle.allow_request(
+                request, username
+            ):
+                self._record_throttled(request, username, sink)
+                set_outcome(span, OUTCOME_THROTTLED)
+                return None
+            using = self._tenant_database(request, config)
+            User = _user_model()
+            database = self._span_database(span, User, using)
+
+            try:
+                if config.enabled:
+                    if await self._asuperuser_exists(User, sink, using):
+                        log_event(
+                            logging.DEBUG,
+                            EVENT_SKIPPED,
+                            username=username,
+                            lost_race=False,
+                        )
+                    else:
+                        user = await self._acreate_initial_superuser(
+                            User, username, password, using
+                        )
+                        if user is not None:
+                            set_outcome(span, OUTCOME_CREATED)
+                            return user
+
+                with config.tracer.start_as_current_span(SPAN_FALLBACK) as stage:
+                    started = time.perf_counter()
+                    # A tenant database, or hashing on the executor, needs
+                    # _model_authenticate(), which is synchronous.
+                    if using is not None or config.hashing_executor is not None:
+                        user = await sync_to_async(self._fallback_authenticate)(
+                            request,
+                            username=username,
+                            password=password,
+                            using=using,
+                            **kwargs,
+                        )
+                    # ModelBackend.aauthenticate() was added in Django 5.0.
+                    elif hasattr(ModelBackend, "aauthenticate"):
+                        user = await super().aauthenticate(
+                            request, username=username, password=password, **kwargs
+                        )
+                    else:
+                        user = await sync_to_async(super().authenticate)(
+                            request, username=username, password=password, **kwargs
+                        )
+
+                    if sink is not None:
+                        sink.record_stage(STAGE_FALLBACK, time.perf_counter() - started)
+                        sink.record_outcome(OUTCOME_FELL_BACK)
+                    set_outcome(stage, OUTCOME_FELL_BACK, database)
+            except HashingExecutorSaturated:
+                self._record_rejected(username, sink, span)
+                return None
+
+            log_event(
+                logging.DEBUG,
+                EVENT_FELL_BACK,
+                username=username,
+                authenticated=user is not None,
             )
+            set_outcome(span, OUTCOME_FELL_BACK)
+
+            return user
+
+    def _span_database(
+        self, span: Any, User: type, using: Optional[str], write: bool = False
+    ) -> Optional[str]:
+        """
+        Record the database a login reads from on its span, if it is recording.
+
+        With ``write``, record the database the initial superuser is written
+        to instead.
+
+        Returns:
+            The database alias, or None when the span is not recording
+        """
+        if not span.is_recording():
+            return None
+        if using is not None:
+            database = using
+        elif write:
+            database = router.db_for_write(User)
+        else:
+            database = router.db_for_read(User)
+        span.set_attribute(ATTR_DATABASE, database)
+        return database
+
+    def _record_throttled(
+        self,
+        request: Optional[HttpRequest],
+        username: str,
+        sink: Optional[InstrumentationSink],
+    ) -> None:
+        """Count and log an attempt refused by the throttle."""
+        if sink is not None:
+            sink.record_outcome(OUTCOME_THROTTLED)
+        log_event(
+            logging.INFO,
+            EVENT_THROTTLED,
+            username=username,
+            client=get_config().throttle.client(request),
+        )
+
+    def _record_rejected(
+        self, username: str, sink: Optional[InstrumentationSink], span: Any
+    ) -> None:
+        """Count and log an attempt refused by the saturated hashing executor."""
+        if sink is not None:
+            sink.record_outcome(OUTCOME_REJECTED)
+        log_event(logging.WARNING, EVENT_REJECTED, username=username)
+        set_outcome(span, OUTCOME_REJECTED)
+
+    def _fallback_authenticate(
+        self,
+        request: Optional[HttpRequest],
+        username: str,
+        password: str,
+        using: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Optional[AbstractUser]:
+        """
+        Authenticate through ModelBackend, hashing on the executor if enabled.
+
+        Args:
+            using: The tenant's database alias, or None to let the routers
+                pick one
+
+        Raises:
+            HashingExecutorSaturated: If the hashing executor is saturated
+        """
+        if using is not None or get_hashing_executor() is not None:
+            return self._model_authenticate(_user_model(), username, password, using)
+        return super().authenticate(
+            request, username=username, password=password, **kwargs
+        )
+
+    def _model_authenticate(
+        self, User: type, username: str, password: str, using: Optional[str] = None
+    ) -> Optional[AbstractUser]:
+        """
+        ModelBackend.authenticate() against a given database, with hashing
+        run on the hashing executor when one is configured.
+
+        Mirrors ModelBackend, including the dummy hash for unknown users that
+        evens out response times, but only the pure hashing work is sent to
+        the pool. Hash upgrades are saved on the calling thread so the pool
+        never touches the database.
+
+        Raises:
+            HashingExecutorSaturated: If the hashing executor is saturated
+        """
+        executor = get_hashing_executor()
+        run = _call if executor is None else executor.run
+        manager = User._default_manager
+        if using is not None:
+            manager = manager.db_manager(using)
+
+        try:
+            user = manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            run(make_password, password)
+            return None
+
+        needs_upgrade = []
+        is_correct = run(check_password, password, user.password, needs_upgrade.append)
+        if not (is_correct and self.user_can_authenticate(user)):
+            return None
+
+        if needs_upgrade:
+            user.password = run(make_password, password)
+            user.save(using=using, update_fields=["password"])
+
+        return user
+
+    def get_user(self, user_id: Any) -> Optional[AbstractUser]:
+        """
+        Return the active user with primary key ``user_id``, or None.
+
+        Django calls this without the request to load the session's user.
+        With ``TENANT_RESOLVER`` set and TenantUserMiddleware installed, the
+        user is loaded from the tenant database of the request being
+        handled, where the login found or created it; otherwise the routers
+        pick the database, as with ModelBackend.
+        """
+        using = self._tenant_database(_current_request.get(), get_config())
+        if using is None:
+            return super().get_user(user_id)
+        User = _user_model()
+        try:
+            user = User._default_manager.db_manager(using).get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id: Any) -> Optional[AbstractUser]:
+        """Asynchronous version of get_user()."""
+        using = self._tenant_database(_current_request.get(), get_config())
+        if using is None:
+            return await super().aget_user(user_id)
+        User = _user_model()
+        try:
+            user = await User._default_manager.db_manager(using).aget(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    def _tenant_database(
+        self, request: Optional[HttpRequest], config: BootstrapConfig
+    ) -> Optional[str]:
+        """
+        Return the database alias of the request's tenant.
+
+        Returns:
+            The alias chosen by the ``TENANT_RESOLVER`` option, or None when
+            no resolver is configured, there is no request, or the resolver
+            returned None; the routers then decide
+        """
+        if config.tenant_resolver is None or request is None:
+            return None
+        return config.tenant_resolver(request)
+
+    def _make_password(self, password: str) -> str:
+        """
+        Hash a password, on the hashing executor when one is configured.
+
+        Raises:
+            HashingExecutorSaturated: If the hashing executor is saturated
+        """
+        config = get_config()
+        hasher = self._bootstrap_hasher(config)
+        if config.hashing_executor is None:
+            return make_password(password, hasher=hasher)
+        return config.hashing_executor.run(make_password, password, None, hasher)
+
+    def _bootstrap_hasher(self, config: BootstrapConfig) -> str:
+        """
+        Return the hasher algorithm for the initial superuser's password.
+
+        ``DEBUG_HASHER`` wins while DEBUG is on. DEBUG is read here rather
+        than when the config is built, so the cheaper hasher can never be
+        used with DEBUG off, even if DEBUG was changed without a
+        ``setting_changed`` signal. The account is rehashed with the primary
+        hasher by the fallback on its next successful login.
+        """
+        if config.debug_hasher is not None and settings.DEBUG:
+            return config.debug_hasher
+        return config.hasher
+
+    def _superuser_exists(
+        self,
+        User: type,
+        sink: Optional[InstrumentationSink] = None,
+        using: Optional[str] = None,
+    ) -> bool:
+        """
+        Return True if at least one superuser exists.
+
+        The answer is latched per process and database once a superuser has
+        been seen, so the steady-state login path makes no extra query. When
+        a cache alias is configured, processes that have not latched yet read
+        the shared cache before querying the database. The latch and the
+        cache are reset by the user model signal receivers when a superuser
+        is deleted or demoted.
+
+        Args:
+            User: The user model class
+            sink: Instrumentation sink to report to, if enabled
+            using: Database alias to check; defaults to the router's
+                ``db_for_read`` for the user model
+
+        Returns:
+            True if a superuser exists, False otherwise
+        """
+        if using is None:
+            using = router.db_for_read(User)
+
+        with get_config().tracer.start_as_current_span(SPAN_EXISTS) as span:
+            if superuser_latch.is_set(using):
+                if sink is not None:
+                    sink.record_outcome(OUTCOME_LATCH_HIT)
+                set_outcome(span, OUTCOME_LATCH_HIT, using)
+                return True
+
+            started = time.perf_counter()
+            exists = get_superuser_exists(using)
+            if exists is None:
+                exists = self._superuser_queryset(User, using).exists()
+                set_superuser_exists(exists, using)
+                outcome = OUTCOME_EXISTS_QUERY
+            else:
+                outcome = OUTCOME_CACHE_HIT
+
+            if sink is not None:
+                sink.record_stage(STAGE_EXISTS, time.perf_counter() - started)
+                sink.record_outcome(outcome)
+            set_outcome(span, outcome, using)
+
+        if exists:
+            superuser_latch.set(using)
+
+        return exists
+
+    def _superuser_queryset(self, User: type, using: str) -> QuerySet:
+        """Return the queryset whose existence the backend checks."""
+        return User.objects.using(using).filter(is_superuser=True)
+
+    async def _asuperuser_exists(
+        self,
+        User: type,
+        sink: Optional[InstrumentationSink] = None,
+        using: Optional[str] = None,
+    ) -> bool:
+        """Asynchronous version of _superuser_exists()."""
+        if using is None:
+            using = router.db_for_read(User)
+
+        with get_config().tracer.start_as_current_span(SPAN_EXISTS) as span:
+            if superuser_latch.is_set(using):
+                if sink is not None:
+                    sink.record_outcome(OUTCOME_LATCH_HIT)
+                set_outcome(span, OUTCOME_LATCH_HIT, using)
+                return True
+
+            started = time.perf_counter()
+            exists = await aget_superuser_exists(using)
+            if exists is None:
+                exists = await self._superuser_queryset(User, using).aexists()
+                await aset_superuser_exists(exists, using)
+                outcome = OUTCOME_EXISTS_QUERY
+            else:
+                outcome = OUTCOME_CACHE_HIT
+
+            if sink is not None:
+                sink.record_stage(STAGE_EXISTS, time.perf_counter() - started)
+                sink.record_outcome(outcome)
+            set_outcome(span, outcome, using)
+
+        if exists:
+            superuser_latch.set(using)
+
+        return exists
 
     def _create_initial_superuser(
-        self, User: type, username: str, password: str
-    ) -> AbstractUser:
+        self, User: type, username: str, password: str, using: Optional[str] = None
+    ) -> Optional[AbstractUser]:
         """
         Create the initial superuser account.
 
@@ -76,28 +626,261 @@ class CreateInitialSuperUserBackend(ModelBackend):
             User: The user model class
             username: Username for the new superuser
             password: Password for the new superuser
+            using: Database alias to create it in, or None for the router's
+                choice
 
         Returns:
-            The created user object
+            The created user object, or None if another request created a
+            superuser first
+
+        Raises:
+            HashingExecutorSaturated: If the hashing executor is saturated
         """
-        warnings.warn(
-            f"django-create-initial-user: No superusers exist! "
-            f"Creating initial superuser with username '{username}'",
-            UserWarning,
-            stacklevel=3,
+        user = self._bootstrap_superuser(User, username, password, using=using)
+
+        if user is not None:
+            self._announce_created(user, username, stacklevel=4)
+        else:
+            log_event(logging.DEBUG, EVENT_SKIPPED, username=username, lost_race=True)
+
+        return user
+
+    def _announce_created(
+        self, user: AbstractUser, username: str, stacklevel: int
+    ) -> None:
+        """
+        Log the creation of the initial superuser.
+
+        Also emits the UserWarning of earlier releases when the
+        ``LOGGING['WARNINGS']`` option is on; ``stacklevel`` points it at the
+        caller of authenticate().
+        """
+        log_event(
+            logging.WARNING, EVENT_CREATED, username=username, database=user._state.db
         )
+        if get_config().warnings:
+            warnings.warn(
+                f"django-create-initial-user: No superusers exist! "
+                f"Creating initial superuser with username '{username}'",
+                UserWarning,
+                stacklevel=stacklevel,
+            )
 
-        hashed_password = make_password(password)
-        user = User.objects.create(
-            username=username,
-            password=hashed_password,
-            is_staff=True,
-            is_superuser=True,
+    def _bootstrap_superuser(
+        self,
+        User: type,
+        username: str,
+        password: Optional[str] = None,
+        email: Optional[str] = None,
+        password_hash: Optional[str] = None,
+        using: Optional[str] = None,
+    ) -> Optional[AbstractUser]:
+        """
+        Hash the password and insert the initial superuser.
+
+        This is the creation logic shared by the login path and the
+        ``create_initial_superuser`` management command. It does not check
+        ``ENABLED`` and logs no event; callers decide both.
+
+        Args:
+            User: The user model class
+            username: Username for the new superuser
+            password: Password for the new superuser
+            email: Email for the new superuser, instead of the one derived
+                from an email-like username
+            password_hash: Already-encoded password, stored as-is instead of
+                hashing ``password``; validate it with
+                ``validate_password_hash()`` first
+            using: Database alias to create the superuser in; defaults to
+                the router's ``db_for_write`` for the user model
+
+        Returns:
+            The created user object, or None if a superuser already exists or
+            the username is taken
+
+        Raises:
+            HashingExecutorSaturated: If the hashing executor is saturated
+        """
+        config = get_config()
+        sink = config.sink
+
+        started = time.perf_counter()
+        if password_hash is None:
+            with config.tracer.start_as_current_span(SPAN_HASH) as span:
+                self._span_database(span, User, using, write=True)
+                password_hash = self._make_password(password)
+        hashed = time.perf_counter()
+        with config.tracer.start_as_current_span(SPAN_INSERT) as span:
+            database = self._span_database(span, User, using, write=True)
+            user = self._insert_initial_superuser(
+                User, username, password_hash, email, using
+            )
+            outcome = OUTCOME_LOST_RACE if user is None else OUTCOME_CREATED
+            set_outcome(span, outcome, database if user is None else user._state.db)
+
+        if sink is not None:
+            sink.record_stage(STAGE_HASH, hashed - started)
+            sink.record_stage(STAGE_INSERT, time.perf_counter() - hashed)
+            sink.record_outcome(outcome)
+
+        return user
+
+    async def _acreate_initial_superuser(
+        self, User: type, username: str, password: str, using: Optional[str] = None
+    ) -> Optional[AbstractUser]:
+        """Asynchronous version of _create_initial_superuser()."""
+        config = get_config()
+        sink = config.sink
+
+        # Hashing is CPU-bound; run it off the event loop without tying up
+        # the thread-sensitive executor used by the ORM. _make_password()
+        # sends it on to the hashing executor when one is configured.
+        started = time.perf_counter()
+        with config.tracer.start_as_current_span(SPAN_HASH) as span:
+            self._span_database(span, User, using, write=True)
+            hashed_password = await sync_to_async(
+                self._make_password, thread_sensitive=False
+            )(password)
+        hashed = time.perf_counter()
+
+        # The creation transaction needs the sync ORM.
+        with config.tracer.start_as_current_span(SPAN_INSERT) as span:
+            database = self._span_database(span, User, using, write=True)
+            user = await sync_to_async(self._insert_initial_superuser)(
+                User, username, hashed_password, None, using
+            )
+            outcome = OUTCOME_LOST_RACE if user is None else OUTCOME_CREATED
+            set_outcome(span, outcome, database if user is None else user._state.db)
+
+        if sink is not None:
+            sink.record_stage(STAGE_HASH, hashed - started)
+            sink.record_stage(STAGE_INSERT, time.perf_counter() - hashed)
+            sink.record_outcome(outcome)
+
+        if user is not None:
+            self._announce_created(user, username, stacklevel=3)
+        else:
+            log_event(logging.DEBUG, EVENT_SKIPPED, username=username, lost_race=True)
+
+        return user
+
+    def _build_initial_superuser(
+        self,
+        User: type,
+        username: str,
+        hashed_password: str,
+        email: Optional[str] = None,
+    ) -> AbstractUser:
+        """
+        Build the initial superuser in memory, ready for a single INSERT.
+
+        Field values from the ``USER_DEFAULTS`` option of the
+        ``CREATE_INITIAL_SUPERUSER`` settings dict are applied first; the
+        username, password and superuser flags always take precedence. An
+        email-like username is copied to the email field unless
+        ``EMAIL_FROM_USERNAME`` is False or an explicit email is given.
+
+        Args:
+            User: The user model class
+            username: Username for the new superuser
+            hashed_password: Encoded password for the new superuser
+            email: Explicit email for the new superuser, if any
+
+        Returns:
+            An unsaved user object
+        """
+        config = get_config()
+        user = User(
+            **{
+                **config.user_defaults,
+                "username": username,
+                "password": hashed_password,
+                "is_staff": True,
+                "is_superuser": True,
+            }
         )
 
+        if email:
+            user.email = email
         # Set email if the username looks like an email
-        if "@" in username and hasattr(user, "email"):
+        elif config.email_from_username and "@" in username and hasattr(user, "email"):
             user.email = username
-            user.save(update_fields=["email"])
 
         return user
+
+    def _insert_initial_superuser(
+        self,
+        User: type,
+        username: str,
+        hashed_password: str,
+        email: Optional[str] = None,
+        using: Optional[str] = None,
+    ) -> Optional[AbstractUser]:
+        """
+        Insert the initial superuser unless another request got there first.
+
+        The check and the insert run in one transaction that starts by
+        claiming the BootstrapLock row, so concurrent first logins across
+        threads, processes and replicas are serialised and exactly one of them
+        creates a superuser. Transient lock errors, such as SQLite's
+        "database is locked" or a deadlock, are retried with jittered
+        exponential backoff; other database errors are raised at once.
+
+        Args:
+            User: The user model class
+            username: Username for the new superuser
+            hashed_password: Encoded password for the new superuser
+            email: Explicit email for the new superuser, if any
+            using: Database alias to write to; defaults to the router's
+                ``db_for_write`` for the user model. The lock row is taken
+                in the same database, so the app's table must be migrated
+                wherever users are written.
+
+        Returns:
+            The created user object, or None if a superuser already exists or
+            the username is taken
+        """
+        # The databases whose latch and cache learn of a superuser found
+        # here: the one written to and, unless the caller chose the database,
+        # the one the existence check reads from.
+        found_in = {using} if using is not None else {router.db_for_read(User)}
+        if using is None:
+            using = router.db_for_write(User)
+        found_in.add(using)
+
+        for attempt in range(self.create_retries + 1):
+            try:
+                with transaction.atomic(using=using):
+                    locks = BootstrapLock.objects.using(using)
+                    locks.create(name=BOOTSTRAP_LOCK_NAME)
+
+                    lost_race = (
+                        User.objects.using(using).filter(is_superuser=True).exists()
+                    )
+                    if lost_race:
+                        user = None
+                    else:
+                        user = self._build_initial_superuser(
+                            User, username, hashed_password, email
+                        )
+                        user.save(using=using, force_insert=True)
+
+                    locks.filter(name=BOOTSTRAP_LOCK_NAME).delete()
+
+                if lost_race:
+                    # The winner's on_commit write may have landed before our
+                    # own read stored False in the cache; replace that stale
+                    # answer so that other workers stop trying to bootstrap.
+                    for alias in found_in:
+                        superuser_latch.set(alias)
+                        set_superuser_exists(True, alias)
+                return user
+            except IntegrityError:
+                # The username belongs to an existing, non-superuser account.
+                return None
+            except OperationalError as exc:
+                if attempt == self.create_retries or not _is_transient_lock_error(exc):
+                    raise
+                time.sleep(self.create_backoff * 2**attempt * random.uniform(0.5, 1.5))
+
+        return None
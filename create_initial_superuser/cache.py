@@ -0,0 +1,92 @@
+"""Cross-process superuser existence cache built on Django's cache framework."""
+
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from .conf import get_config
+
+CACHE_KEY = "create_initial_superuser:superuser_exists"
+
+# Bump when the meaning of the cached value changes so stale entries written
+# by older releases are ignored.
+CACHE_KEY_VERSION = 1
+
+
+def cache_key(using: str = DEFAULT_DB_ALIAS) -> str:
+    """Return the cache key of the existence answer for database ``using``."""
+    return f"{CACHE_KEY}:{using}"
+
+
+def get_cache() -> Any:
+    """
+    Return the configured cache, or None when the cache mode is disabled.
+
+    The cache mode is enabled by setting ``CACHE_ALIAS`` in the
+    ``CREATE_INITIAL_SUPERUSER`` settings dict to one of the ``CACHES`` aliases.
+    """
+    alias = get_config().cache_alias
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+def get_superuser_exists(using: str = DEFAULT_DB_ALIAS) -> Optional[bool]:
+    """
+    Return the cached existence answer for database ``using``.
+
+    Returns:
+        True or False if an answer is cached, None on a miss or when the
+        cache mode is disabled
+    """
+    cache = get_cache()
+    if cache is None:
+        return None
+    return cache.get(cache_key(using), version=CACHE_KEY_VERSION)
+
+
+async def aget_superuser_exists(using: str = DEFAULT_DB_ALIAS) -> Optional[bool]:
+    """Asynchronous version of get_superuser_exists()."""
+    cache = get_cache()
+    if cache is None:
+        return None
+    return await cache.aget(cache_key(using), version=CACHE_KEY_VERSION)
+
+
+def set_superuser_exists(exists: bool, using: str = DEFAULT_DB_ALIAS) -> None:
+    """Store the existence answer for ``using`` for ``CACHE_TIMEOUT`` seconds."""
+    cache = get_cache()
+    if cache is None:
+        return
+    cache.set(
+        cache_key(using),
+        exists,
+        timeout=get_config().cache_timeout,
+        version=CACHE_KEY_VERSION,
+    )
+
+
+async def aset_superuser_exists(exists: bool, using: str = DEFAULT_DB_ALIAS) -> None:
+    """Asynchronous version of set_superuser_exists()."""
+    cache = get_cache()
+    if cache is None:
+        return
+    await cache.aset(
+        cache_key(using),
+        exists,
+        timeout=get_config().cache_timeout,
+        version=CACHE_KEY_VERSION,
+    )
+
+
+def invalidate_superuser_exists(using: Optional[str] = None) -> None:
+    """Drop the cached existence answer for ``using``, or for every database."""
+    cache = get_cache()
+    if cache is None:
+        return
+    aliases = settings.DATABASES if using is None else [using]
+    cache.delete_many(
+        [cache_key(alias) for alias in aliases], version=CACHE_KEY_VERSION
+    )
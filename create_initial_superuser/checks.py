@@ -0,0 +1,108 @@
+"""
+Deployment check for the cost of the superuser existence query.
+
+Runs ``EXPLAIN`` on the exact query the backend uses to decide whether a
+superuser exists and warns when the database would answer it with a full
+scan of a large user table. The check queries the database, so it is tagged
+both ``database`` and deploy-only::
+
+    python manage.py check --deploy --database default
+
+Query plans are understood for SQLite and PostgreSQL; other databases are
+skipped.
+"""
+
+import re
+from typing import Any, List, Optional, Sequence
+
+from django.contrib.auth import get_user_model
+from django.core.checks import CheckMessage, Warning
+from django.db import DatabaseError, connections, router
+
+# Tables estimated to hold fewer rows than this are cheap to scan.
+LARGE_TABLE_ROWS = 10000
+
+W001 = "create_initial_superuser.W001"
+
+
+def check_superuser_query_plan(
+    app_configs: Optional[Sequence[Any]] = None,
+    databases: Optional[Sequence[str]] = None,
+    **kwargs: Any,
+) -> List[CheckMessage]:
+    """Warn if the superuser existence query scans a large table."""
+    from .backends import CreateInitialSuperUserBackend
+
+    User = get_user_model()
+    using = router.db_for_read(User)
+    if not databases or using not in databases:
+        return []
+
+    connection = connections[using]
+    table = User._meta.db_table
+    queryset = CreateInitialSuperUserBackend()._superuser_queryset(User, using)
+    try:
+        plan = _exists_query(queryset).explain(using=using)
+        if not _is_full_scan(connection.vendor, plan, table):
+            return []
+        rows = _estimate_rows(connection, table)
+    except DatabaseError:
+        return []
+    if rows is None or rows < LARGE_TABLE_ROWS:
+        return []
+
+    return [
+        Warning(
+            f"The superuser existence check scans the whole {table} table "
+            f"(about {rows} rows) on database '{using}'.",
+            hint=(
+                "Run 'manage.py install_superuser_index' to index the "
+                f"superuser rows. Query plan: {plan}"
+            ),
+            obj=User,
+            id=W001,
+        )
+    ]
+
+
+def _exists_query(queryset: Any) -> Any:
+    """Return the query that ``queryset.exists()`` runs."""
+    try:
+        return queryset.query.exists(limit=True)
+    except TypeError:
+        # Django < 4.2 takes the database alias.
+        return queryset.query.exists(queryset.db)
+
+
+def _is_full_scan(vendor: str, plan: str, table: str) -> bool:
+    if vendor == "sqlite":
+        pattern = re.compile(rf'\bSCAN (?:TABLE )?"?{re.escape(table)}"?\b')
+        return any(
+            pattern.search(line) and "USING" not in line for line in plan.splitlines()
+        )
+    if vendor == "postgresql":
+        return re.search(rf'\bSeq Scan on "?{re.escape(table)}"?\b', plan) is not None
+    return False
+
+
+def _estimate_rows(connection: Any, table: str) -> Optional[int]:
+    """Return the planner's row estimate for ``table`` without counting it."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(table)],
+            )
+            row = cursor.fetchone()
+            # -1 until the table has been vacuumed or analyzed.
+            return row[0] if row and row[0] >= 0 else None
+
+        # SQLite: ANALYZE statistics when present, else the highest rowid,
+        # which is read from the end of the table's B-tree.
+        if "sqlite_stat1" in connection.introspection.table_names(cursor):
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+            row = cursor.fetchone()
+            if row:
+                return int(row[0].split()[0])
+        cursor.execute(f"SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}")
+        return cursor.fetchone()[0] or 0
@@ -0,0 +1,457 @@
+"""
+Compiled configuration for create_initial_superuser.
+
+The ``CREATE_INITIAL_SUPERUSER`` settings dict is parsed and validated once,
+when the app is ready, into an immutable BootstrapConfig. The hot path only
+reads its precomputed attributes. The config is rebuilt after a setting it
+depends on changes through ``setting_changed``, so ``override_settings``
+keeps working in tests.
+
+Supported keys::
+
+    CREATE_INITIAL_SUPERUSER = {
+        # Create the initial superuser on first login. Defaults to DEBUG.
+        "ENABLED": None,
+        # Extra field values for the created superuser, e.g. first_name.
+        "USER_DEFAULTS": {},
+        # Copy an email-like username into the email field.
+        "EMAIL_FROM_USERNAME": True,
+        # Hasher algorithm for the bootstrap password. Defaults to the first
+        # entry of PASSWORD_HASHERS.
+        "HASHER": None,
+        # Cheaper hasher for the bootstrap account while DEBUG is on, e.g.
+        # "md5". The account is rehashed with the primary hasher on its next
+        # login. Ignored, and not validated, when DEBUG is off.
+        "DEBUG_HASHER": None,
+        # Already-encoded password used by the create_initial_superuser
+        # command instead of hashing one at startup.
+        "PASSWORD_HASH": None,
+        # CACHES alias for the cross-worker existence cache, and its TTL.
+        "CACHE_ALIAS": None,
+        "CACHE_TIMEOUT": 300,
+        # Bounded thread pool for password hashing.
+        "HASHING_EXECUTOR": None,  # {"MAX_WORKERS": 4, "MAX_QUEUE": 16, "TIMEOUT": None}
+        # Token buckets per client and per username in front of password
+        # hashing; rejected attempts fail without hashing or querying.
+        # CLIENT_KEY is a dotted path to a callable taking the request and
+        # returning the client's key; the default, its REMOTE_ADDR, is the
+        # proxy's address behind a reverse proxy or load balancer.
+        "THROTTLE": None,  # {"RATE": 1.0, "BURST": 10, "MAX_KEYS": 10000, "CLIENT_KEY": None}
+        # Stage timing and outcome counters.
+        "INSTRUMENTATION": None,  # {"ENABLED": True, "SINK": "dotted.path"}
+        # Bootstrap events are logged to "create_initial_superuser.events".
+        # QUEUE writes them from a QueueListener thread, started by each
+        # process's first event, instead of the request; WARNINGS also emits
+        # the UserWarning of earlier releases when the superuser is created.
+        "LOGGING": {"QUEUE": True, "WARNINGS": False},
+        # OpenTelemetry spans around each authentication stage, when
+        # opentelemetry-api is installed.
+        "TRACING": True,
+        # Dotted path to a callable taking the request and returning the
+        # database alias of its tenant, or None to let the routers decide.
+        "TENANT_RESOLVER": None,
+        # Number of databases whose superuser state is remembered per process.
+        "TENANT_STATE_SIZE": 1024,
+    }
+"""
+
+import threading
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers_by_algorithm
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+SETTING_NAME = "CREATE_INITIAL_SUPERUSER"
+
+# Settings that feed into the compiled config.
+WATCHED_SETTINGS = frozenset({SETTING_NAME, "DEBUG", "CACHES", "PASSWORD_HASHERS"})
+
+DEFAULT_CACHE_TIMEOUT = 300
+DEFAULT_TENANT_STATE_SIZE = 1024
+
+_KNOWN_KEYS = frozenset(
+    {
+        "ENABLED",
+        "USER_DEFAULTS",
+        "EMAIL_FROM_USERNAME",
+        "HASHER",
+        "DEBUG_HASHER",
+        "PASSWORD_HASH",
+        "CACHE_ALIAS",
+        "CACHE_TIMEOUT",
+        "HASHING_EXECUTOR",
+        "THROTTLE",
+        "INSTRUMENTATION",
+        "LOGGING",
+        "TENANT_RESOLVER",
+        "TENANT_STATE_SIZE",
+        "TRACING",
+    }
+)
+_EXECUTOR_KEYS = frozenset({"MAX_WORKERS", "MAX_QUEUE", "TIMEOUT"})
+_THROTTLE_KEYS = frozenset({"RATE", "BURST", "MAX_KEYS", "CLIENT_KEY"})
+_INSTRUMENTATION_KEYS = frozenset({"ENABLED", "SINK"})
+_LOGGING_KEYS = frozenset({"QUEUE", "WARNINGS"})
+
+
+class BootstrapConfig:
+    """
+    Immutable, validated view of the ``CREATE_INITIAL_SUPERUSER`` setting.
+
+    Attributes:
+        enabled: Whether first-login superuser creation is active
+        user_defaults: Read-only mapping of extra field values
+        email_from_username: Whether to copy an email-like username to email
+        hasher: Hasher algorithm for the bootstrap password
+        debug_hasher: Hasher algorithm for the bootstrap password while DEBUG
+            is on, or None; always None when DEBUG is off
+        password_hash: Pre-encoded bootstrap password, or None
+        cache_alias: CACHES alias of the existence cache, or None
+        cache_timeout: TTL of the existence cache in seconds, or None to
+            never expire
+        hashing_executor: The HashingExecutor, or None to hash inline
+        throttle: The TokenBucketThrottle, or None when disabled
+        sink: The instrumentation sink, or None when disabled
+        event_log: The running QueuedEventLog, or None when bootstrap events
+            are written on the calling thread
+        warnings: Whether the superuser's creation also emits a UserWarning
+        tracer: The OpenTelemetry tracer, or NOOP_TRACER when tracing is off
+            or unavailable
+        tenant_resolver: Callable mapping a request to a database alias, or
+            None
+        tenant_state_size: Maximum number of database aliases remembered by
+            the superuser latch
+    """
+
+    __slots__ = (
+        "enabled",
+        "user_defaults",
+        "email_from_username",
+        "hasher",
+        "debug_hasher",
+        "password_hash",
+        "cache_alias",
+        "cache_timeout",
+        "hashing_executor",
+        "throttle",
+        "sink",
+        "event_log",
+        "warnings",
+        "tracer",
+        "tenant_resolver",
+        "tenant_state_size",
+    )
+
+    def __init__(self, **values: Any) -> None:
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _error(message: str) -> ImproperlyConfigured:
+    return ImproperlyConfigured(f"{SETTING_NAME}: {message}")
+
+
+def _check_keys(options: Mapping[str, Any], known: frozenset, where: str) -> None:
+    unknown = set(options) - known
+    if unknown:
+        raise _error(f"unknown {where} key(s): {', '.join(sorted(unknown))}")
+
+
+def _positive_number(value: Any, name: str, allow_none: bool = False) -> Any:
+    if value is None and allow_none:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise _error(f"{name} must be a positive number, got {value!r}")
+    return value
+
+
+def _hasher(options: Mapping[str, Any], name: str) -> Optional[str]:
+    algorithm = options.get(name)
+    if algorithm is not None and algorithm not in get_hashers_by_algorithm():
+        raise _error(
+            f"{name} {algorithm!r} is not the algorithm of any hasher in "
+            f"PASSWORD_HASHERS"
+        )
+    return algorithm
+
+
+def _parse_executor(options: Any, previous: Any) -> Any:
+    if options is None:
+        return None
+    if not isinstance(options, Mapping):
+        raise _error("HASHING_EXECUTOR must be a dict or None")
+    _check_keys(options, _EXECUTOR_KEYS, "HASHING_EXECUTOR")
+
+    max_workers = options.get("MAX_WORKERS", 4)
+    max_queue = options.get("MAX_QUEUE", 16)
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise _error(
+            f"HASHING_EXECUTOR['MAX_WORKERS'] must be >= 1, got {max_workers!r}"
+        )
+    if not isinstance(max_queue, int) or max_queue < 0:
+        raise _error(f"HASHING_EXECUTOR['MAX_QUEUE'] must be >= 0, got {max_queue!r}")
+    timeout = _positive_number(
+        options.get("TIMEOUT"), "HASHING_EXECUTOR['TIMEOUT']", allow_none=True
+    )
+
+    # Keep the running pool when only unrelated settings changed.
+    if previous is not None and (
+        previous.max_workers,
+        previous.max_queue,
+        previous.timeout,
+    ) == (max_workers, max_queue, timeout):
+        return previous
+
+    from .hashing import HashingExecutor
+
+    return HashingExecutor(max_workers, max_queue, timeout)
+
+
+def _parse_throttle(options: Any, previous: Any) -> Any:
+    if options is None:
+        return None
+    if not isinstance(options, Mapping):
+        raise _error("THROTTLE must be a dict or None")
+    _check_keys(options, _THROTTLE_KEYS, "THROTTLE")
+
+    rate = _positive_number(options.get("RATE", 1.0), "THROTTLE['RATE']")
+    burst = options.get("BURST", 10)
+    max_keys = options.get("MAX_KEYS", 10000)
+    if not isinstance(burst, int) or burst < 1:
+        raise _error(f"THROTTLE['BURST'] must be >= 1, got {burst!r}")
+    if not isinstance(max_keys, int) or max_keys < 1:
+        raise _error(f"THROTTLE['MAX_KEYS'] must be >= 1, got {max_keys!r}")
+
+    from .throttle import TokenBucketThrottle, remote_addr
+
+    client_key = _import_callable(options.get("CLIENT_KEY"), "THROTTLE['CLIENT_KEY']")
+    if client_key is None:
+        client_key = remote_addr
+
+    # Keep the buckets, and the clients they are limiting, across reloads.
+    if previous is not None and (
+        previous.rate,
+        previous.burst,
+        previous.max_keys,
+        previous.client_key,
+    ) == (rate, burst, max_keys, client_key):
+        return previous
+
+    return TokenBucketThrottle(rate, burst, max_keys, client_key)
+
+
+def _parse_sink(options: Any, previous: Any) -> Any:
+    if options is None:
+        return None
+    if not isinstance(options, Mapping):
+        raise _error("INSTRUMENTATION must be a dict or None")
+    _check_keys(options, _INSTRUMENTATION_KEYS, "INSTRUMENTATION")
+    if not options.get("ENABLED", True):
+        return None
+
+    from .instrumentation import default_aggregator
+
+    path = options.get("SINK")
+    if path is None:
+        return default_aggregator
+    try:
+        sink_class = import_string(path)
+    except ImportError as exc:
+        raise _error(f"cannot import INSTRUMENTATION['SINK'] {path!r}: {exc}") from exc
+
+    # Keep the sink instance, and whatever it has recorded, across reloads.
+    if type(previous) is sink_class:
+        return previous
+    return sink_class()
+
+
+def _parse_event_log(options: Mapping[str, Any], previous: Any) -> Any:
+    if not options.get("QUEUE", True):
+        return None
+    # Keep the rerouted logger, its listener and the records it has queued
+    # across reloads.
+    if previous is not None:
+        return previous
+
+    from .events import QueuedEventLog
+
+    event_log = QueuedEventLog()
+    event_log.start()
+    return event_log
+
+
+def _import_callable(path: Any, name: str) -> Any:
+    if path is None:
+        return None
+    try:
+        value = import_string(path)
+    except ImportError as exc:
+        raise _error(f"cannot import {name} {path!r}: {exc}") from exc
+    if not callable(value):
+        raise _error(f"{name} {path!r} is not callable")
+    return value
+
+
+def build_config(previous: Optional[BootstrapConfig] = None) -> BootstrapConfig:
+    """
+    Parse and validate the current settings into a BootstrapConfig.
+
+    The hashing executor, the throttle, the instrumentation sink and the event
+    log of ``previous`` are reused when their options are unchanged.
+
+    Raises:
+        ImproperlyConfigured: If the setting contains unknown keys or invalid
+            values
+    """
+    options = getattr(settings, SETTING_NAME, None) or {}
+    if not isinstance(options, Mapping):
+        raise _error("must be a dict")
+    _check_keys(options, _KNOWN_KEYS, "top-level")
+
+    enabled = options.get("ENABLED")
+    if enabled is None:
+        enabled = bool(settings.DEBUG)
+    elif not isinstance(enabled, bool):
+        raise _error(f"ENABLED must be True, False or None, got {enabled!r}")
+
+    user_defaults = options.get("USER_DEFAULTS") or {}
+    if not isinstance(user_defaults, Mapping):
+        raise _error("USER_DEFAULTS must be a dict")
+
+    hasher = _hasher(options, "HASHER")
+    # Only resolved while DEBUG is on, so that one settings module can name a
+    # development hasher that production does not install. DEBUG is watched,
+    # so turning it on rebuilds the config and validates the option.
+    debug_hasher = _hasher(options, "DEBUG_HASHER") if settings.DEBUG else None
+
+    password_hash = options.get("PASSWORD_HASH")
+    if password_hash is not None:
+        from .hashing import validate_password_hash
+
+        try:
+            validate_password_hash(password_hash)
+        except ValueError as exc:
+            raise _error(f"PASSWORD_HASH is {exc}") from exc
+
+    cache_alias = options.get("CACHE_ALIAS")
+    if cache_alias is not None and cache_alias not in settings.CACHES:
+        raise _error(f"CACHE_ALIAS {cache_alias!r} is not defined in CACHES")
+
+    tenant_state_size = options.get("TENANT_STATE_SIZE", DEFAULT_TENANT_STATE_SIZE)
+    if (
+        isinstance(tenant_state_size, bool)
+        or not isinstance(tenant_state_size, int)
+        or tenant_state_size < 1
+    ):
+        raise _error(f"TENANT_STATE_SIZE must be >= 1, got {tenant_state_size!r}")
+
+    tracing = options.get("TRACING", True)
+    if not isinstance(tracing, bool):
+        raise _error(f"TRACING must be True or False, got {tracing!r}")
+
+    from .tracing import build_tracer
+
+    logging_options = options.get("LOGGING") or {}
+    if not isinstance(logging_options, Mapping):
+        raise _error("LOGGING must be a dict or None")
+    _check_keys(logging_options, _LOGGING_KEYS, "LOGGING")
+
+    return BootstrapConfig(
+        enabled=enabled,
+        user_defaults=MappingProxyType(dict(user_defaults)),
+        email_from_username=bool(options.get("EMAIL_FROM_USERNAME", True)),
+        hasher=hasher or "default",
+        debug_hasher=debug_hasher,
+        password_hash=password_hash,
+        cache_alias=cache_alias,
+        cache_timeout=_positive_number(
+            options.get("CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT),
+            "CACHE_TIMEOUT",
+            allow_none=True,
+        ),
+        hashing_executor=_parse_executor(
+            options.get("HASHING_EXECUTOR"),
+            previous.hashing_executor if previous is not None else None,
+        ),
+        throttle=_parse_throttle(
+            options.get("THROTTLE"),
+            previous.throttle if previous is not None else None,
+        ),
+        sink=_parse_sink(
+            options.get("INSTRUMENTATION"),
+            previous.sink if previous is not None else None,
+        ),
+        warnings=bool(logging_options.get("WARNINGS", False)),
+        tracer=build_tracer(tracing),
+        tenant_resolver=_import_callable(
+            options.get("TENANT_RESOLVER"), "TENANT_RESOLVER"
+        ),
+        tenant_state_size=tenant_state_size,
+        # Last, so that the logger is not rerouted for an invalid setting.
+        event_log=_parse_event_log(
+            logging_options, previous.event_log if previous is not None else None
+        ),
+    )
+
+
+_config: Optional[BootstrapConfig] = None
+# The last config dropped by invalidate_config(), kept so the rebuild can
+# reuse its executor, sink and event log.
+_previous: Optional[BootstrapConfig] = None
+_config_lock = threading.Lock()
+
+
+def reload_config() -> BootstrapConfig:
+    """Rebuild the config from settings and return it."""
+    global _config, _previous
+
+    with _config_lock:
+        old = _config or _previous
+        _config = new = build_config(old)
+        _previous = None
+    if (
+        old is not None
+        and old.hashing_executor is not None
+        and old.hashing_executor is not new.hashing_executor
+    ):
+        old.hashing_executor.shutdown(wait=False)
+    if old is not None and old.event_log is not None and new.event_log is None:
+        old.event_log.stop()
+    return new
+
+
+def invalidate_config() -> None:
+    """
+    Drop the compiled config so that the next get_config() rebuilds it.
+
+    Used on ``setting_changed``: ``override_settings`` sends one signal per
+    setting, and rebuilding lazily means the config is only compiled once all
+    of them, and Django's own receivers such as the hasher cache reset, have
+    run.
+    """
+    global _config, _previous
+
+    with _config_lock:
+        if _config is not None:
+            _previous, _config = _config, None
+
+
+def get_config() -> BootstrapConfig:
+    """Return the compiled config, building it on first use."""
+    config = _config
+    if config is None:
+        config = reload_config()
+    return config
@@ -0,0 +1,217 @@
+"""
+Structured log records for the backend's bootstrap decisions.
+
+Every decision is logged to the ``create_initial_superuser.events`` logger
+with the event name and its fields as record attributes, so handlers and
+formatters can use ``record.event``, ``record.username`` and so on:
+
+==============  =======  ==============================================
+Event           Level    When
+==============  =======  ==============================================
+``created``     WARNING  The initial superuser was created
+``skipped``     DEBUG    A superuser exists, so none was created
+``fell_back``   DEBUG    The credentials were checked by ModelBackend
+``throttled``   INFO     The attempt was refused by the THROTTLE option
+``rejected``    WARNING  The hashing executor was saturated
+==============  =======  ==============================================
+
+With the ``LOGGING["QUEUE"]`` option on (the default), the records are put
+on a bounded queue by a QueueHandler and formatted and written by a
+QueueListener thread, so the login request never waits on log I/O. The
+thread is started by the first event of each process, so preforking servers
+get one per worker; a record that finds the queue full is written on the
+calling thread instead.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
+
+EVENT_CREATED = "created"
+EVENT_SKIPPED = "skipped"
+EVENT_FELL_BACK = "fell_back"
+EVENT_THROTTLED = "throttled"
+EVENT_REJECTED = "rejected"
+
+# Records waiting for the listener before further ones are written on the
+# calling thread, so a stalled listener cannot grow memory without bound.
+DEFAULT_QUEUE_SIZE = 10000
+
+logger = logging.getLogger("create_initial_superuser.events")
+
+
+class _Fields:
+    """Render event fields as ``key='value'`` pairs only when formatted."""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: Dict[str, Any]) -> None:
+        self.fields = fields
+
+    def __str__(self) -> str:
+        return " ".join(f"{key}={value!r}" for key, value in self.fields.items())
+
+
+def log_event(level: int, event: str, **fields: Any) -> None:
+    """Log a bootstrap decision, at no cost beyond a level check if disabled."""
+    if logger.isEnabledFor(level):
+        logger.log(
+            level,
+            "bootstrap %s %s",
+            event,
+            _Fields(fields),
+            extra={"event": event, **fields},
+        )
+
+
+class _ForwardHandler(logging.Handler):
+    """Hand records to another logger, which passes them up the hierarchy."""
+
+    def __init__(self, target: logging.Logger) -> None:
+        super().__init__()
+        self.target = target
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.target.handle(record)
+
+
+class _EventQueueHandler(QueueHandler):
+    def __init__(self, event_log: "QueuedEventLog") -> None:
+        super().__init__(event_log.queue)
+        self.event_log = event_log
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # QueueHandler.prepare() formats the message on the calling thread.
+        # Event records carry no exc_info and only immutable arguments, so
+        # they can be queued as they are and formatted by the listener.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.event_log.put(record)
+
+
+class _EventQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue is bounded: wait for room rather than fail to stop.
+        self.queue.put(self._sentinel)
+
+
+class QueuedEventLog:
+    """
+    Move the output of the events logger onto a QueueListener thread.
+
+    While started, the logger's own handlers, and its parent loggers when it
+    propagates, are served by the listener; the logger itself only enqueues.
+    The listener thread is started by the first record of each process, and
+    a forked child drops the parent's queue and starts its own, since the
+    parent's thread does not exist there. When the queue is full, the record
+    is written on the calling thread. Stopping flushes the queue and
+    restores the logger.
+
+    Args:
+        target: The logger to route through the queue
+        maxsize: Number of records the queue holds
+    """
+
+    def __init__(
+        self, target: logging.Logger = logger, maxsize: int = DEFAULT_QUEUE_SIZE
+    ) -> None:
+        self.logger = target
+        self.maxsize = maxsize
+        self.queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize)
+        self.handler = _EventQueueHandler(self)
+        self.listener: Optional[QueueListener] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._started = False
+        self._handlers: list = []
+        self._propagate = True
+        self._targets: List[logging.Handler] = []
+
+    def start(self) -> None:
+        """Route the logger through the queue; the listener starts on first use."""
+        self._handlers = self.logger.handlers[:]
+        self._propagate = self.logger.propagate
+        self._targets = list(self._handlers)
+        if self._propagate and self.logger.parent is not None:
+            self._targets.append(_ForwardHandler(self.logger.parent))
+
+        self.logger.handlers = [self.handler]
+        self.logger.propagate = False
+        self._started = True
+        _event_logs.add(self)
+        atexit.register(self.stop)
+
+    def put(self, record: logging.LogRecord) -> None:
+        """Queue a record for the listener of this process."""
+        if self._pid != os.getpid():
+            self._start_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # The listener has fallen behind: write the record here rather
+            # than drop it or let the queue grow.
+            self._write(record)
+
+    def _start_listener(self) -> None:
+        with self._lock:
+            pid = os.getpid()
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                # Forked without the at-fork hook having run: the queue and
+                # the listener belong to the parent.
+                self._reset_queue()
+            self.listener = _EventQueueListener(
+                self.queue, *self._targets, respect_handler_level=True
+            )
+            self.listener.start()
+            self._pid = pid
+
+    def _write(self, record: logging.LogRecord) -> None:
+        for handler in self._targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _reset_queue(self) -> None:
+        self.queue = self.handler.queue = queue.Queue(self.maxsize)
+        self.listener = None
+        self._pid = None
+
+    def _after_fork_in_child(self) -> None:
+        # Records queued by the parent are the parent's to write, and its
+        # lock may have been held by a thread that does not exist here.
+        self._reset_queue()
+        self._lock = threading.Lock()
+
+    def stop(self) -> None:
+        """Write out the queued records and restore the logger."""
+        if not self._started:
+            return
+        self.logger.handlers = self._handlers
+        self.logger.propagate = self._propagate
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+        self.listener = None
+        self._pid = None
+        self._started = False
+        _event_logs.discard(self)
+        atexit.unregister(self.stop)
+
+
+# Started event logs, reset in a forked child by the hook below.
+_event_logs: "weakref.WeakSet[QueuedEventLog]" = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for event_log in list(_event_logs):
+        event_log._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,162 @@
+"""
+Password hashing helpers: a bounded thread pool for the hashing done during
+authentication, and validation of pre-hashed bootstrap passwords.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from django.contrib.auth.hashers import identify_hasher
+
+from .conf import get_config
+
+
+class HashingExecutorSaturated(Exception):
+    """Raised when a hash cannot be scheduled or does not finish in time."""
+
+
+class HashingExecutor:
+    """
+    Run password hashing on a fixed pool of threads with a bounded queue.
+
+    At most ``max_workers`` hashes run at once and at most ``max_queue`` more
+    wait for a thread. Callers beyond that are rejected immediately with
+    HashingExecutorSaturated instead of piling up, which gives the login view
+    backpressure under a burst of attempts.
+
+    Args:
+        max_workers: Number of hashing threads
+        max_queue: Number of hashes allowed to wait for a free thread
+        timeout: Seconds to wait for a result before giving up, or None to
+            wait indefinitely
+    """
+
+    def __init__(
+        self, max_workers: int = 4, max_queue: int = 16, timeout: Optional[float] = None
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="create-initial-superuser-hash"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``fn(*args)`` on the pool and return its result.
+
+        Raises:
+            HashingExecutorSaturated: If the queue is full or the result is
+                not ready within ``timeout`` seconds
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingExecutorSaturated("password hashing queue is full")
+
+        with self._lock:
+            self._submitted += 1
+            self._queue_depth += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+
+        queued_at = time.perf_counter()
+
+        def task() -> Any:
+            waited = time.perf_counter() - queued_at
+            with self._lock:
+                self._queue_depth -= 1
+                self._wait_time_total += waited
+                self._wait_time_max = max(self._wait_time_max, waited)
+            return fn(*args)
+
+        future = self._executor.submit(task)
+        # The slot is held until the hash actually finishes, even if the
+        # caller gives up waiting, so abandoned work still counts against the
+        # bound.
+        future.add_done_callback(self._task_done)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            raise HashingExecutorSaturated("password hashing timed out") from None
+
+    def _task_done(self, future: Any) -> None:
+        with self._lock:
+            self._completed += 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the executor counters.
+
+        ``queue_depth`` is the number of hashes currently waiting for a thread
+        and ``wait_time_total``/``wait_time_max`` are the seconds spent waiting,
+        which together show whether ``max_workers`` is sized correctly.
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "wait_time_total": self._wait_time_total,
+                "wait_time_max": self._wait_time_max,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool threads."""
+        self._executor.shutdown(wait=wait)
+
+
+def get_hashing_executor() -> Optional[HashingExecutor]:
+    """
+    Return the shared hashing executor, or None when hashing runs inline.
+
+    The executor is enabled by the ``HASHING_EXECUTOR`` entry of the
+    ``CREATE_INITIAL_SUPERUSER`` settings dict, which accepts ``MAX_WORKERS``,
+    ``MAX_QUEUE`` and ``TIMEOUT`` keys.
+    """
+    return get_config().hashing_executor
+
+
+def validate_password_hash(encoded: str) -> str:
+    """
+    Check that ``encoded`` is a password hash the configured hashers accept.
+
+    Used for initial superuser credentials supplied pre-hashed, so that a
+    typo or a plain-text password is caught before it is stored.
+
+    Returns:
+        The algorithm of the hasher that produced ``encoded``
+
+    Raises:
+        ValueError: If no configured hasher recognises ``encoded``, or it is
+            malformed
+    """
+    try:
+        hasher = identify_hasher(encoded)
+        hasher.decode(encoded)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(
+            "not a password hash produced by any hasher in PASSWORD_HASHERS"
+        ) from exc
+    return hasher.algorithm
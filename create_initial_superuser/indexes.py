@@ -0,0 +1,100 @@
+"""
+Optional partial index on superuser rows.
+
+``is_superuser`` is not indexed by ``django.contrib.auth``, so on a large
+user table the backend's ``filter(is_superuser=True).exists()`` check can
+scan the table. A partial index covering only superuser rows stays tiny
+whatever the table size and lets the database answer from the index alone.
+
+The index belongs to the user model's table, which this app cannot migrate,
+so it is installed explicitly, with the ``install_superuser_index`` command
+or the functions below, on databases with partial index support (SQLite and
+PostgreSQL among Django's built-in backends).
+"""
+
+from typing import Optional
+
+from django.contrib.auth import get_user_model
+from django.db import NotSupportedError, connections, router
+from django.db.models import Index, Q
+
+SUPERUSER_INDEX_NAME = "initial_superuser_exists_idx"
+
+
+def superuser_index() -> Index:
+    """Return the partial index on the user model's superuser rows."""
+    return Index(
+        fields=["is_superuser"],
+        condition=Q(is_superuser=True),
+        name=SUPERUSER_INDEX_NAME,
+    )
+
+
+def superuser_index_exists(using: Optional[str] = None) -> bool:
+    """Return True if the index is present in the ``using`` database."""
+    User = get_user_model()
+    connection = connections[using or router.db_for_write(User)]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, User._meta.db_table
+        )
+    return SUPERUSER_INDEX_NAME in constraints
+
+
+def install_superuser_index(
+    using: Optional[str] = None, concurrently: bool = False
+) -> bool:
+    """
+    Create the index unless it already exists.
+
+    Args:
+        using: Database alias; defaults to the router's choice for writing
+            users, since replicas receive the index from their primary
+        concurrently: Build the index without locking out writes
+            (PostgreSQL only)
+
+    Returns:
+        True if the index was created, False if it was already present
+
+    Raises:
+        NotSupportedError: If the database cannot create partial indexes, or
+            ``concurrently`` is requested on a database other than PostgreSQL
+    """
+    User = get_user_model()
+    using = using or router.db_for_write(User)
+    connection = connections[using]
+    if not connection.features.supports_partial_indexes:
+        raise NotSupportedError(
+            f"{connection.display_name} does not support partial indexes."
+        )
+    if concurrently and connection.vendor != "postgresql":
+        raise NotSupportedError(
+            "Building the index concurrently is only supported on PostgreSQL."
+        )
+    if superuser_index_exists(using):
+        return False
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    with connection.schema_editor(atomic=not concurrently) as schema_editor:
+        if concurrently:
+            schema_editor.add_index(User, superuser_index(), concurrently=True)
+        else:
+            schema_editor.add_index(User, superuser_index())
+    return True
+
+
+def remove_superuser_index(using: Optional[str] = None) -> bool:
+    """
+    Drop the index if it exists.
+
+    Returns:
+        True if the index was dropped, False if it was not present
+    """
+    User = get_user_model()
+    using = using or router.db_for_write(User)
+    if not superuser_index_exists(using):
+        return False
+
+    with connections[using].schema_editor() as schema_editor:
+        schema_editor.remove_index(User, superuser_index())
+    return True
@@ -0,0 +1,111 @@
+"""Optional stage timing and outcome counters for the authentication hot path."""
+
+import threading
+from typing import Any, Dict, Optional
+
+from .conf import get_config
+
+try:
+    from typing import Protocol
+except ImportError:  # pragma: no cover
+    Protocol = object  # type: ignore[assignment,misc]
+
+# Stages timed by CreateInitialSuperUserBackend.
+STAGE_EXISTS = "exists"
+STAGE_HASH = "hash"
+STAGE_INSERT = "insert"
+STAGE_FALLBACK = "fallback"
+
+# Outcomes counted by CreateInitialSuperUserBackend.
+OUTCOME_LATCH_HIT = "latch_hit"
+OUTCOME_CACHE_HIT = "cache_hit"
+OUTCOME_EXISTS_QUERY = "exists_query"
+OUTCOME_CREATED = "created"
+OUTCOME_LOST_RACE = "lost_race"
+OUTCOME_FELL_BACK = "fell_back"
+OUTCOME_REJECTED = "rejected"
+OUTCOME_THROTTLED = "throttled"
+
+
+class InstrumentationSink(Protocol):
+    """Receiver for the backend's stage durations and outcome counters."""
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        """Record that ``stage`` took ``seconds``."""
+
+    def record_outcome(self, outcome: str) -> None:
+        """Count one occurrence of ``outcome``."""
+
+
+class InMemoryAggregator:
+    """
+    Default sink that keeps running totals in process memory.
+
+    Each stage keeps a count, total and maximum duration; each outcome keeps
+    a count. Updates take a single short lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: Dict[str, list] = {}
+        self._outcomes: Dict[str, int] = {}
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            totals = self._stages.get(stage)
+            if totals is None:
+                self._stages[stage] = [1, seconds, seconds]
+            else:
+                totals[0] += 1
+                totals[1] += seconds
+                if seconds > totals[2]:
+                    totals[2] = seconds
+
+    def record_outcome(self, outcome: str) -> None:
+        with self._lock:
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return a copy of the collected data.
+
+        Returns:
+            ``{"stages": {stage: {"count", "total", "max"}},
+            "outcomes": {outcome: count}}`` with durations in seconds
+        """
+        with self._lock:
+            return {
+                "stages": {
+                    stage: {"count": count, "total": total, "max": maximum}
+                    for stage, (count, total, maximum) in self._stages.items()
+                },
+                "outcomes": dict(self._outcomes),
+            }
+
+    def reset(self) -> None:
+        """Clear all collected data."""
+        with self._lock:
+            self._stages.clear()
+            self._outcomes.clear()
+
+
+default_aggregator = InMemoryAggregator()
+
+
+def get_sink() -> Optional[InstrumentationSink]:
+    """
+    Return the configured sink, or None when instrumentation is disabled.
+
+    Instrumentation is enabled by the ``INSTRUMENTATION`` entry of the
+    ``CREATE_INITIAL_SUPERUSER`` settings dict::
+
+        CREATE_INITIAL_SUPERUSER = {
+            "INSTRUMENTATION": {
+                "ENABLED": True,
+                # Optional dotted path to a sink class; defaults to the shared
+                # in-memory aggregator.
+                "SINK": "myproject.metrics.StatsdSink",
+            },
+        }
+    """
+    return get_config().sink
@@ -0,0 +1,142 @@
+"""
+Create the initial superuser at deploy time.
+
+Runs the same creation logic as the first-login path, so deploy scripts can
+pay the bootstrap cost once instead of on the request path::
+
+    DJANGO_SUPERUSER_USERNAME=admin DJANGO_SUPERUSER_PASSWORD=... \\
+        python manage.py create_initial_superuser
+
+Setting ``DJANGO_SUPERUSER_PASSWORD_HASH`` (or the ``PASSWORD_HASH`` option)
+to an encoded hash instead, e.g. from ``make_password()``, stores it as-is and
+skips hashing at startup entirely.
+
+The exit status is 0 when the superuser was created and 3 when one was
+already present, so orchestration scripts can tell the two apart.
+"""
+
+import os
+import sys
+from typing import Any, List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import router
+
+from ...backends import CreateInitialSuperUserBackend
+from ...conf import get_config
+from ...hashing import validate_password_hash
+
+EXIT_CREATED = 0
+EXIT_ALREADY_PRESENT = 3
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the initial superuser unless one already exists. The password "
+        "is read from the DJANGO_SUPERUSER_PASSWORD environment variable, or "
+        "supplied pre-hashed in DJANGO_SUPERUSER_PASSWORD_HASH or the "
+        "PASSWORD_HASH option of CREATE_INITIAL_SUPERUSER."
+    )
+
+    exit_code = EXIT_CREATED
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--username",
+            default=os.environ.get("DJANGO_SUPERUSER_USERNAME"),
+            help="Defaults to the DJANGO_SUPERUSER_USERNAME environment variable.",
+        )
+        parser.add_argument(
+            "--email",
+            default=os.environ.get("DJANGO_SUPERUSER_EMAIL"),
+            help="Defaults to the DJANGO_SUPERUSER_EMAIL environment variable.",
+        )
+
+        parser.add_argument(
+            "--database",
+            help=(
+                "Database to create the superuser in. Defaults to the "
+                "router's choice for writing users."
+            ),
+        )
+
+    def run_from_argv(self, argv: List[str]) -> None:
+        super().run_from_argv(argv)
+        if self.exit_code != EXIT_CREATED:
+            sys.exit(self.exit_code)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        User = get_user_model()
+        backend = CreateInitialSuperUserBackend()
+        sink = get_config().sink
+        # Check the database that will be written to, not a read replica
+        # that may lag behind it.
+        using = options["database"] or router.db_for_write(User)
+
+        # A single query, or none once the latch or the cache has the answer.
+        if backend._superuser_exists(User, sink, using):
+            self._already_present(options["verbosity"])
+            return
+
+        username = options["username"]
+        if not username:
+            raise CommandError(
+                "A username is required: pass --username or set "
+                "DJANGO_SUPERUSER_USERNAME."
+            )
+        password, password_hash = self._credentials()
+
+        user = backend._bootstrap_superuser(
+            User,
+            username,
+            password,
+            email=options["email"],
+            password_hash=password_hash,
+            using=using,
+        )
+        if user is None:
+            if not User.objects.using(using).filter(is_superuser=True).exists():
+                raise CommandError(
+                    f"Username '{username}' belongs to an existing user who is "
+                    f"not a superuser."
+                )
+            self._already_present(options["verbosity"])
+            return
+
+        self.exit_code = EXIT_CREATED
+        if options["verbosity"] >= 1:
+            self.stdout.write(
+                self.style.SUCCESS(f"Created initial superuser '{username}'.")
+            )
+
+    def _credentials(self) -> Tuple[Optional[str], Optional[str]]:
+        """Return the plain password or the pre-encoded hash, whichever is set."""
+        password = os.environ.get("DJANGO_SUPERUSER_PASSWORD")
+        password_hash = os.environ.get("DJANGO_SUPERUSER_PASSWORD_HASH")
+        if password and password_hash:
+            raise CommandError(
+                "Set only one of DJANGO_SUPERUSER_PASSWORD and "
+                "DJANGO_SUPERUSER_PASSWORD_HASH."
+            )
+        if password_hash:
+            try:
+                validate_password_hash(password_hash)
+            except ValueError as exc:
+                raise CommandError(f"DJANGO_SUPERUSER_PASSWORD_HASH is {exc}.") from exc
+            return None, password_hash
+        if password:
+            return password, None
+
+        password_hash = get_config().password_hash
+        if password_hash is None:
+            raise CommandError(
+                "DJANGO_SUPERUSER_PASSWORD or DJANGO_SUPERUSER_PASSWORD_HASH "
+                "must be set."
+            )
+        return None, password_hash
+
+    def _already_present(self, verbosity: int) -> None:
+        self.exit_code = EXIT_ALREADY_PRESENT
+        if verbosity >= 1:
+            self.stdout.write("A superuser already exists; nothing to do.")
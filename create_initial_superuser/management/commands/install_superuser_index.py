@@ -0,0 +1,66 @@
+"""
+Install the optional partial index on superuser rows.
+
+Keeps the backend's superuser existence check an index lookup on large user
+tables::
+
+    python manage.py install_superuser_index
+    python manage.py install_superuser_index --concurrently  # PostgreSQL
+    python manage.py install_superuser_index --remove
+
+Running it again is a no-op.
+"""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import NotSupportedError
+
+from ...indexes import (
+    SUPERUSER_INDEX_NAME,
+    install_superuser_index,
+    remove_superuser_index,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create a partial index on the user table's superuser rows, so the "
+        "superuser existence check does not scan large tables."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--database",
+            help=(
+                "Database to index. Defaults to the router's choice for "
+                "writing users."
+            ),
+        )
+        parser.add_argument(
+            "--concurrently",
+            action="store_true",
+            help="Build the index without blocking writes (PostgreSQL only).",
+        )
+        parser.add_argument(
+            "--remove",
+            action="store_true",
+            help="Drop the index instead of creating it.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["remove"]:
+            changed = remove_superuser_index(options["database"])
+            message = "Dropped" if changed else "Not present, nothing to drop:"
+        else:
+            try:
+                changed = install_superuser_index(
+                    options["database"], concurrently=options["concurrently"]
+                )
+            except NotSupportedError as exc:
+                raise CommandError(str(exc)) from exc
+            message = "Created" if changed else "Already present:"
+
+        if options["verbosity"] >= 1:
+            text = f"{message} index {SUPERUSER_INDEX_NAME}."
+            self.stdout.write(self.style.SUCCESS(text) if changed else text)
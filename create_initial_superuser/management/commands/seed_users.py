@@ -0,0 +1,129 @@
+"""
+Stream users from a CSV or JSONL file into the database.
+
+Meant for load-test and staging environments that need many users on top
+of the bootstrapped superuser::
+
+    python manage.py seed_users users.csv --batch-size 2000 --processes 32
+
+Rows are read, hashed and inserted as a stream, so memory use does not grow
+with the size of the file. Run it with DEBUG off: Django's debug query log
+keeps the SQL of every batch.
+"""
+
+import os
+import sys
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...seeding import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_TRANSACTION_BATCHES,
+    READERS,
+    SeedError,
+    build_users,
+    seed_users,
+)
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise ValueError(value)
+    return number
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create users from a CSV or JSONL file. Columns or keys are user "
+        "model field names; a 'password' value is hashed."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="Input file, or '-' for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Input format. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=_positive_int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Users per bulk_create call (default {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--transaction-batches",
+            type=_positive_int,
+            default=DEFAULT_TRANSACTION_BATCHES,
+            help=(
+                f"Batches committed per transaction "
+                f"(default {DEFAULT_TRANSACTION_BATCHES})."
+            ),
+        )
+        parser.add_argument(
+            "--hasher",
+            help="Password hasher algorithm, e.g. md5 for throwaway data.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=_positive_int,
+            default=1,
+            help=(
+                "Hash passwords on this many worker processes "
+                "(default 1: hash inline)."
+            ),
+        )
+        parser.add_argument(
+            "--ignore-conflicts",
+            action="store_true",
+            help="Skip rows whose username already exists.",
+        )
+        parser.add_argument(
+            "--database",
+            help="Database to seed. Defaults to the router's choice for writing users.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path = options["path"]
+        fmt = options["format"]
+        if fmt is None:
+            fmt = os.path.splitext(path)[1].lstrip(".").lower()
+            if fmt not in READERS:
+                raise CommandError(
+                    f"Cannot tell the format of '{path}'; pass --format."
+                )
+
+        verbosity = options["verbosity"]
+
+        def report(inserted: int, elapsed: float) -> None:
+            if verbosity >= 1:
+                rate = inserted / elapsed if elapsed else 0.0
+                self.stdout.write(f"{inserted} users ({rate:.0f} rows/sec)")
+
+        stream = sys.stdin if path == "-" else open(path, newline="")
+        try:
+            users = build_users(
+                READERS[fmt](stream),
+                get_user_model(),
+                options["hasher"],
+                processes=options["processes"],
+            )
+            inserted = seed_users(
+                users,
+                batch_size=options["batch_size"],
+                transaction_batches=options["transaction_batches"],
+                using=options["database"],
+                ignore_conflicts=options["ignore_conflicts"],
+                progress=report,
+            )
+        except SeedError as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if verbosity >= 1:
+            self.stdout.write(self.style.SUCCESS(f"Seeded {inserted} users."))
@@ -0,0 +1,145 @@
+"""
+Prometheus metrics for the backend's stages and outcomes.
+
+Requires ``prometheus_client`` (the ``metrics`` extra). Select the sink and
+mount the view::
+
+    CREATE_INITIAL_SUPERUSER = {
+        "INSTRUMENTATION": {"SINK": "create_initial_superuser.metrics.PrometheusSink"},
+    }
+
+    urlpatterns += [path("bootstrap/", include("create_initial_superuser.urls"))]
+
+Metrics::
+
+    create_initial_superuser_authenticate_total{outcome}
+        Logins by outcome: created, fell_back, throttled or rejected
+    create_initial_superuser_exists_checks_total{result}
+        Existence checks answered by the latch (latch_hit) or the cache
+        (cache_hit), or that queried the database (miss)
+    create_initial_superuser_creations_total{result}
+        Creation attempts that created the superuser (created) or found one
+        already there (lost_race)
+    create_initial_superuser_stage_seconds{stage}
+        Histogram of the exists, hash, insert and fallback stage durations
+
+For preforked servers, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty
+directory shared by the workers before they start: each worker then writes
+its values to its own memory-mapped file there, and the view adds them up.
+"""
+
+import os
+from typing import Dict
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+)
+
+from .instrumentation import (
+    OUTCOME_CACHE_HIT,
+    OUTCOME_CREATED,
+    OUTCOME_EXISTS_QUERY,
+    OUTCOME_FELL_BACK,
+    OUTCOME_LATCH_HIT,
+    OUTCOME_LOST_RACE,
+    OUTCOME_REJECTED,
+    OUTCOME_THROTTLED,
+    STAGE_EXISTS,
+    STAGE_FALLBACK,
+    STAGE_HASH,
+    STAGE_INSERT,
+)
+
+# Covers an existence check served from memory (microseconds) through a
+# slow password hash (seconds).
+STAGE_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    float("inf"),
+)
+
+AUTHENTICATE = Counter(
+    "create_initial_superuser_authenticate",
+    "Logins handled by CreateInitialSuperUserBackend, by outcome.",
+    ["outcome"],
+)
+EXISTS_CHECKS = Counter(
+    "create_initial_superuser_exists_checks",
+    "Superuser existence checks, by where the answer came from.",
+    ["result"],
+)
+CREATIONS = Counter(
+    "create_initial_superuser_creations",
+    "Initial superuser creation attempts, by result.",
+    ["result"],
+)
+STAGE_SECONDS = Histogram(
+    "create_initial_superuser_stage_seconds",
+    "Duration of each authentication stage.",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+
+class PrometheusSink:
+    """
+    Instrumentation sink that updates the module's Prometheus metrics.
+
+    The labelled children are resolved once, so recording is a dict lookup
+    and an increment under the child's own lock; in multiprocess mode the
+    increment goes to this process's file and takes no lock across
+    processes.
+    """
+
+    def __init__(self) -> None:
+        created = AUTHENTICATE.labels(outcome=OUTCOME_CREATED)
+        self._outcomes: Dict[str, tuple] = {
+            OUTCOME_LATCH_HIT: (EXISTS_CHECKS.labels(result="latch_hit"),),
+            OUTCOME_CACHE_HIT: (EXISTS_CHECKS.labels(result="cache_hit"),),
+            OUTCOME_EXISTS_QUERY: (EXISTS_CHECKS.labels(result="miss"),),
+            OUTCOME_CREATED: (CREATIONS.labels(result="created"), created),
+            OUTCOME_LOST_RACE: (CREATIONS.labels(result="lost_race"),),
+            OUTCOME_FELL_BACK: (AUTHENTICATE.labels(outcome=OUTCOME_FELL_BACK),),
+            OUTCOME_THROTTLED: (AUTHENTICATE.labels(outcome=OUTCOME_THROTTLED),),
+            OUTCOME_REJECTED: (AUTHENTICATE.labels(outcome=OUTCOME_REJECTED),),
+        }
+        self._stages = {
+            stage: STAGE_SECONDS.labels(stage=stage)
+            for stage in (STAGE_EXISTS, STAGE_HASH, STAGE_INSERT, STAGE_FALLBACK)
+        }
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        self._stages[stage].observe(seconds)
+
+    def record_outcome(self, outcome: str) -> None:
+        for counter in self._outcomes[outcome]:
+            counter.inc()
+
+
+def get_registry() -> CollectorRegistry:
+    """
+    Return the registry to expose.
+
+    In multiprocess mode, a fresh registry that collects every worker's
+    files; otherwise the process's default registry.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
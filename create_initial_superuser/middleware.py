@@ -0,0 +1,142 @@
+"""
+First-run middleware: send visitors to the admin login until a superuser
+exists.
+
+Add it after the session, authentication and message middleware::
+
+    MIDDLEWARE = [
+        ...
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "create_initial_superuser.middleware.FirstRunMiddleware",
+    ]
+
+Whether it is needed is decided once, when the handler loads the middleware:
+if a superuser already exists, or first-login creation is disabled, it
+raises MiddlewareNotUsed and Django leaves it out of the request chain
+entirely. Otherwise it redirects page requests to the admin login with a
+banner explaining that the first login creates the superuser, and turns
+itself off for the rest of the process as soon as a superuser exists, after
+which each request costs one attribute check.
+
+TenantUserMiddleware is only needed with the ``TENANT_RESOLVER`` option: it
+lets the backend load the logged-in user from the request's tenant database.
+Add it before the authentication middleware.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError
+from django.http import HttpResponseRedirect
+from django.urls import NoReverseMatch, reverse
+from django.utils.http import urlencode
+
+from .backends import CreateInitialSuperUserBackend, _current_request, _user_model
+from .conf import get_config
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest, HttpResponse
+
+FIRST_RUN_MESSAGE = (
+    "No superuser exists yet. Sign in with the username and password you "
+    "want for the initial superuser account."
+)
+
+
+class FirstRunMiddleware:
+    """
+    Redirect page requests to the admin login while no superuser exists.
+
+    Only GET and HEAD requests are redirected; the login page itself, static
+    and media files and every other method pass through, so the first login
+    can create the superuser.
+
+    Raises:
+        MiddlewareNotUsed: At startup, if a superuser already exists or
+            first-login creation is disabled
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        self.backend = CreateInitialSuperUserBackend()
+        self.login_url: Optional[str] = None
+        self.exempt_prefixes: Tuple[str, ...] = ()
+        if not get_config().enabled or self._superuser_exists():
+            raise MiddlewareNotUsed
+        # Set to True for good once a superuser exists.
+        self.done = False
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.done:
+            return self.get_response(request)
+        if self._superuser_exists():
+            self.done = True
+            return self.get_response(request)
+
+        redirect = self._first_run_redirect(request)
+        if redirect is not None:
+            return redirect
+        return self.get_response(request)
+
+    def _superuser_exists(self) -> bool:
+        # Latched, then cached, then a query; an unmigrated database counts
+        # as a first run.
+        try:
+            return self.backend._superuser_exists(_user_model())
+        except DatabaseError:
+            return False
+
+    def _first_run_redirect(self, request: HttpRequest) -> Optional[HttpResponse]:
+        if request.method not in ("GET", "HEAD"):
+            return None
+        if self.login_url is None:
+            try:
+                self.login_url = reverse("admin:login")
+            except NoReverseMatch:
+                # Without the admin there is no login page to send people to.
+                self.done = True
+                return None
+            # An unset MEDIA_URL reads as the script prefix, usually "/".
+            self.exempt_prefixes = tuple(
+                prefix
+                for prefix in (self.login_url, settings.STATIC_URL, settings.MEDIA_URL)
+                if prefix and prefix.strip("/")
+            )
+
+        if request.path.startswith(self.exempt_prefixes):
+            return None
+
+        if hasattr(request, "_messages"):
+            messages.info(request, FIRST_RUN_MESSAGE, fail_silently=True)
+        query = urlencode({"next": request.get_full_path()})
+        return HttpResponseRedirect(f"{self.login_url}?{query}")
+
+
+class TenantUserMiddleware:
+    """
+    Make the request being handled visible to the backend's get_user().
+
+    Django loads the session's user without passing the request to the
+    backend, so ``TENANT_RESOLVER`` could not pick the tenant database there
+    and the user logged in by a tenant login would not be found on the next
+    request.
+
+    Raises:
+        MiddlewareNotUsed: At startup, if no ``TENANT_RESOLVER`` is set
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if get_config().tenant_resolver is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        token = _current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_request.reset(token)
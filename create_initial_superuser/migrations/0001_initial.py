@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="BootstrapLock",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+            ],
+            options={
+                "verbose_name": "bootstrap lock",
+                "verbose_name_plural": "bootstrap locks",
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+"""Models for the create_initial_superuser app."""
+
+from django.db import models
+
+
+class BootstrapLock(models.Model):
+    """
+    Lock row that serialises initial superuser creation.
+
+    The backend inserts a row with a fixed name as the first statement of the
+    creation transaction and deletes it again before committing, so the table
+    is empty at rest. A concurrent creator blocks on (or fails to insert) the
+    same primary key until the first transaction finishes, and then sees the
+    superuser that was just created.
+    """
+
+    name = models.CharField(max_length=64, primary_key=True)
+
+    class Meta:
+        verbose_name = "bootstrap lock"
+        verbose_name_plural = "bootstrap locks"
+
+    def __str__(self) -> str:
+        return self.name
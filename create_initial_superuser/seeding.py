@@ -0,0 +1,232 @@
+"""
+Streaming bulk user creation for load-test and staging data.
+
+The pipeline is a chain of generators: a reader yields one row at a time from
+a CSV or JSONL stream, build_users() turns rows into unsaved users, hashing
+passwords inline or on a process pool, and seed_users() groups them into
+``bulk_create`` batches committed in chunked transactions. At most one
+transaction's worth of users is in memory at once, however large the input
+is.
+"""
+
+import csv
+import json
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import get_context
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+
+from .cache import invalidate_superuser_exists
+from .conf import get_config
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_TRANSACTION_BATCHES = 10
+DEFAULT_HASH_CHUNK_SIZE = 64
+
+
+class SeedError(ValueError):
+    """Raised when an input row cannot be turned into a user."""
+
+
+def read_csv(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Yield rows from a CSV stream with a header line."""
+    yield from csv.DictReader(stream)
+
+
+def read_jsonl(stream: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Yield rows from a stream with one JSON object per line."""
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            raise SeedError(f"line {line_number}: invalid JSON: {exc}") from exc
+        if not isinstance(row, dict):
+            raise SeedError(f"line {line_number}: expected a JSON object")
+        yield row
+
+
+READERS: Dict[str, Callable[[IO[str]], Iterator[Dict[str, Any]]]] = {
+    "csv": read_csv,
+    "jsonl": read_jsonl,
+}
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to ``size`` consecutive items."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _parse_rows(
+    rows: Iterable[Dict[str, Any]], fields: Dict[str, Any]
+) -> Iterator[Tuple[Dict[str, Any], Optional[str]]]:
+    """Yield field values and the raw password (None if absent) per row."""
+    for number, row in enumerate(rows, start=1):
+        row = dict(row)
+        password = row.pop("password", None) or None
+
+        unknown = set(row) - set(fields)
+        if unknown:
+            raise SeedError(
+                f"row {number}: unknown field(s) {', '.join(sorted(unknown))}"
+            )
+        try:
+            values = {
+                name: fields[name].to_python(value) for name, value in row.items()
+            }
+        except ValidationError as exc:
+            raise SeedError(f"row {number}: {'; '.join(exc.messages)}") from exc
+
+        yield values, password
+
+
+def _hash_chunk(hasher: Any, passwords: List[Optional[str]]) -> List[str]:
+    """Hash a chunk of passwords; runs in a pool worker."""
+    return [make_password(password, hasher=hasher) for password in passwords]
+
+
+def _hash_in_processes(
+    parsed: Iterable[Tuple[Dict[str, Any], Optional[str]]],
+    hasher: Any,
+    processes: int,
+    chunk_size: int,
+) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """
+    Hash passwords on a process pool, yielding results in input order.
+
+    Chunks are submitted as the input is read, and at most two per worker
+    are in flight, so the pool never runs ahead of the consumer by more than
+    a fixed number of rows.
+    """
+    # Spawned workers only import the hashers; the hasher instance is sent
+    # along with each chunk, so they need no settings.
+    pool = ProcessPoolExecutor(processes, mp_context=get_context("spawn"))
+    pending: Deque[Tuple[List[Dict[str, Any]], Future]] = deque()
+    try:
+        for chunk in batched(parsed, chunk_size):
+            passwords = [password for _, password in chunk]
+            pending.append(
+                (
+                    [values for values, _ in chunk],
+                    pool.submit(_hash_chunk, hasher, passwords),
+                )
+            )
+            if len(pending) >= processes * 2:
+                values, future = pending.popleft()
+                yield from zip(values, future.result())
+        while pending:
+            values, future = pending.popleft()
+            yield from zip(values, future.result())
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def build_users(
+    rows: Iterable[Dict[str, Any]],
+    User: Optional[type] = None,
+    hasher: Optional[str] = None,
+    processes: int = 1,
+    chunk_size: int = DEFAULT_HASH_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Turn rows into unsaved users.
+
+    Keys must be concrete field names of the user model; values are converted
+    with each field's ``to_python()``, so CSV strings such as ``"1"`` or
+    ``"False"`` work. A ``password`` value is hashed with ``hasher``; rows
+    without one get an unusable password.
+
+    Password hashing dominates the cost of bulk creation. With ``processes``
+    above 1 it is fanned out across a process pool in chunks of
+    ``chunk_size`` rows, and users are still yielded in input order.
+
+    Raises:
+        SeedError: If a row has unknown keys or an invalid value
+    """
+    if User is None:
+        User = get_user_model()
+    hasher = get_hasher(hasher if hasher is not None else get_config().hasher)
+    fields = {field.name: field for field in User._meta.concrete_fields}
+
+    parsed = _parse_rows(rows, fields)
+    if processes > 1:
+        hashed = _hash_in_processes(parsed, hasher, processes, chunk_size)
+    else:
+        hashed = (
+            (values, make_password(password, hasher=hasher))
+            for values, password in parsed
+        )
+
+    for values, encoded in hashed:
+        yield User(**values, password=encoded)
+
+
+def seed_users(
+    users: Iterable[Any],
+    User: Optional[type] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    transaction_batches: int = DEFAULT_TRANSACTION_BATCHES,
+    using: Optional[str] = None,
+    ignore_conflicts: bool = False,
+    progress: Optional[Callable[[int, float], None]] = None,
+) -> int:
+    """
+    Insert ``users`` with ``bulk_create`` and return how many were written.
+
+    Users are inserted ``batch_size`` at a time, and every
+    ``transaction_batches`` batches are committed together. Users for a
+    transaction are built before it opens, so hashing never holds a write
+    lock. ``progress`` is called after each commit with the running row count
+    and the elapsed seconds. ``using`` defaults to the router's
+    ``db_for_write`` for the user model, where the backend creates and checks
+    for superusers.
+
+    ``bulk_create`` sends no ``post_save`` signals, so the existence cache is
+    invalidated once at the end in case superusers were seeded.
+    """
+    if User is None:
+        User = get_user_model()
+    if using is None:
+        using = router.db_for_write(User)
+    manager = User._default_manager.db_manager(using)
+
+    inserted = 0
+    started = time.perf_counter()
+    try:
+        for chunk in batched(batched(users, batch_size), transaction_batches):
+            with transaction.atomic(using=using):
+                for batch in chunk:
+                    manager.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+                    inserted += len(batch)
+            if progress is not None:
+                progress(inserted, time.perf_counter() - started)
+    finally:
+        if inserted:
+            invalidate_superuser_exists()
+
+    return inserted
@@ -0,0 +1,85 @@
+"""Signal receivers that keep the bootstrap state in sync with the user table."""
+
+from functools import partial
+from typing import Any
+
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+
+from .cache import invalidate_superuser_exists, set_superuser_exists
+from .conf import WATCHED_SETTINGS, invalidate_config
+from .state import superuser_latch
+
+# Instance attribute holding whether the user was a superuser when it was
+# loaded or last saved: True, False, or None when is_superuser was deferred.
+WAS_SUPERUSER = "_create_initial_superuser_was_superuser"
+
+
+def _superuser_committed(using: str) -> None:
+    superuser_latch.set(using)
+    set_superuser_exists(True, using)
+
+
+def _superuser_removed(sender: type, instance: Any, using: str) -> None:
+    # The write went to ``using``, but the backend checks the alias the
+    # routers read the user model from, e.g. a replica, so forget the answer
+    # for both. Other databases, such as other tenants', keep theirs.
+    for alias in {using, router.db_for_read(sender, instance=instance)}:
+        superuser_latch.reset(alias)
+        invalidate_superuser_exists(alias)
+
+
+def user_initialized(sender: type, instance: Any, **kwargs: Any) -> None:
+    """
+    Remember whether a user instance starts out as a superuser.
+
+    A deferred ``is_superuser`` is recorded as unknown rather than loaded,
+    so that building users never costs a query.
+    """
+    instance.__dict__[WAS_SUPERUSER] = instance.__dict__.get("is_superuser")
+
+
+def user_saved(
+    sender: type,
+    instance: Any,
+    created: bool = False,
+    update_fields: Any = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Keep the latch and the existence cache in step with superuser saves.
+
+    Creating a superuser, or saving a user that becomes one, sets the latch
+    and writes through to the cache once the transaction commits, so a
+    rolled-back bootstrap is never remembered. This also covers the account
+    created by the backend itself. Saving a user that was a superuser, or
+    may have been one, without the flag resets both for the database written
+    and the one the user model is read from, since that save could have
+    demoted the last superuser. Other saves, such as the ``last_login``
+    update done on every login, leave the state untouched.
+    """
+    using = kwargs.get("using") or DEFAULT_DB_ALIAS
+    is_superuser = getattr(instance, "is_superuser", False)
+    was_superuser = instance.__dict__.get(WAS_SUPERUSER)
+    instance.__dict__[WAS_SUPERUSER] = is_superuser
+
+    if is_superuser:
+        if created or was_superuser is not True:
+            transaction.on_commit(partial(_superuser_committed, using), using=using)
+    elif (
+        not created
+        and was_superuser is not False
+        and (update_fields is None or "is_superuser" in update_fields)
+    ):
+        _superuser_removed(sender, instance, using)
+
+
+def user_deleted(sender: type, instance: Any, **kwargs: Any) -> None:
+    """Reset the latch and the existence cache when a superuser is deleted."""
+    if getattr(instance, "is_superuser", False):
+        _superuser_removed(sender, instance, kwargs.get("using") or DEFAULT_DB_ALIAS)
+
+
+def settings_changed(sender: Any, setting: str, **kwargs: Any) -> None:
+    """Rebuild the compiled config after a setting it depends on changes."""
+    if setting in WATCHED_SETTINGS:
+        invalidate_config()
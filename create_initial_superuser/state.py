@@ -0,0 +1,70 @@
+"""Process-local bootstrap state for CreateInitialSuperUserBackend."""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from django.db import DEFAULT_DB_ALIAS
+
+from .conf import get_config
+
+
+class SuperuserLatch:
+    """
+    Remember, per process and per database alias, that a superuser has been
+    seen.
+
+    Once set for an alias, the backend skips the superuser existence query
+    against that database entirely. The latch is cleared by the user model
+    signal receivers in ``create_initial_superuser.signals`` when a superuser
+    is deleted or demoted, so the next login re-checks the database.
+
+    With one database per tenant the number of aliases is unbounded, so the
+    latch is a least-recently-used index holding at most ``max_size`` aliases,
+    by default the ``TENANT_STATE_SIZE`` option. An evicted alias costs one
+    existence query on its next login.
+
+    Lookups are single dict operations, which are atomic under the GIL;
+    insertion and eviction are done under a lock.
+    """
+
+    __slots__ = ("_aliases", "_lock", "max_size")
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        self._aliases = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_size = max_size
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    def is_set(self, using: str = DEFAULT_DB_ALIAS) -> bool:
+        """Return True if a superuser is known to exist in ``using``."""
+        if using not in self._aliases:
+            return False
+        try:
+            self._aliases.move_to_end(using)
+        except KeyError:
+            # Evicted or reset by another thread since the membership test.
+            pass
+        return True
+
+    def set(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        """Record that a superuser exists in ``using``."""
+        max_size = self.max_size or get_config().tenant_state_size
+        with self._lock:
+            self._aliases[using] = None
+            self._aliases.move_to_end(using)
+            while len(self._aliases) > max_size:
+                self._aliases.popitem(last=False)
+
+    def reset(self, using: Optional[str] = None) -> None:
+        """Forget that a superuser exists in ``using``, or in every database."""
+        with self._lock:
+            if using is None:
+                self._aliases.clear()
+            else:
+                self._aliases.pop(using, None)
+
+
+superuser_latch = SuperuserLatch()
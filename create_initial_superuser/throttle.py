@@ -0,0 +1,127 @@
+"""In-process throttle for the credential attempts that reach password hashing."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Hashable, Optional
+
+from .conf import get_config
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+
+def remote_addr(request: HttpRequest) -> Optional[str]:
+    """
+    Return the default client key: the address of the peer connected to Django.
+
+    Behind a reverse proxy or load balancer this is the proxy's address, shared
+    by every client; set ``THROTTLE['CLIENT_KEY']`` to a callable that reads the
+    client address the proxy forwards instead.
+    """
+    return request.META.get("REMOTE_ADDR")
+
+
+class TokenBucketThrottle:
+    """
+    Token buckets keyed by client and by username.
+
+    Each key starts with ``burst`` tokens and regains ``rate`` tokens per
+    second. An attempt takes one token from every key it is made under and is
+    rejected, without taking any, if one of them is empty. So a single client
+    cannot flood the hashers with many usernames, and many clients cannot
+    hammer one username.
+
+    At most ``max_keys`` buckets are kept, the least recently used being
+    evicted first. An evicted key starts again with a full bucket, so
+    ``max_keys`` should comfortably exceed the number of clients active within
+    ``burst / rate`` seconds.
+
+    Args:
+        rate: Tokens regained per second
+        burst: Bucket capacity, the number of back-to-back attempts allowed
+        max_keys: Maximum number of buckets kept in memory
+        client_key: Callable returning the client's key for a request, by
+            default its ``REMOTE_ADDR``
+        clock: Monotonic time source, replaceable in tests
+    """
+
+    __slots__ = (
+        "rate",
+        "burst",
+        "max_keys",
+        "client_key",
+        "_buckets",
+        "_lock",
+        "_clock",
+    )
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 10,
+        max_keys: int = 10000,
+        client_key: Callable[[HttpRequest], Optional[Hashable]] = remote_addr,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.client_key = client_key
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def allow(self, *keys: Hashable) -> bool:
+        """Take a token for each of ``keys`` and return True, or return False."""
+        now = self._clock()
+        with self._lock:
+            buckets = [self._refill(key, now) for key in keys]
+            if any(bucket[0] < 1 for bucket in buckets):
+                return False
+            for bucket in buckets:
+                bucket[0] -= 1
+            return True
+
+    def client(self, request: Optional[HttpRequest]) -> Optional[Hashable]:
+        """Return the client key of ``request``, or None without a request."""
+        return self.client_key(request) if request is not None else None
+
+    def allow_request(self, request: Optional[HttpRequest], username: str) -> bool:
+        """
+        Return True if an attempt for ``username`` from ``request`` may proceed.
+
+        Without a request, as for scripts and management code calling
+        authenticate(), there is no client to key on, so only the username's
+        bucket applies; such callers do not share one client bucket.
+        """
+        if request is None:
+            return self.allow(("username", username))
+        return self.allow(("client", self.client(request)), ("username", username))
+
+    def reset(self) -> None:
+        """Forget every bucket."""
+        with self._lock:
+            self._buckets.clear()
+
+    def _refill(self, key: Hashable, now: float) -> list:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(self.burst), now]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        return bucket
+
+
+def get_throttle() -> Optional[TokenBucketThrottle]:
+    """Return the configured throttle, or None when throttling is disabled."""
+    return get_config().throttle
@@ -0,0 +1,87 @@
+"""
+Optional OpenTelemetry spans around the authentication stages.
+
+With the ``TRACING`` option on (the default) and ``opentelemetry-api``
+installed, each login gets a ``create_initial_superuser.authenticate`` span
+with child spans for the existence check, password hashing, the superuser
+insert and the ModelBackend fallback, all carrying the database alias and,
+except for hashing, the outcome. Spans go to the globally configured tracer
+provider.
+
+Without the package, or with ``TRACING`` off, the backend uses NOOP_TRACER,
+whose spans are a shared object that does nothing.
+"""
+
+from typing import Any, Optional
+
+from .instrumentation import STAGE_EXISTS, STAGE_FALLBACK, STAGE_HASH, STAGE_INSERT
+
+TRACER_NAME = "create_initial_superuser"
+
+SPAN_AUTHENTICATE = "create_initial_superuser.authenticate"
+SPAN_EXISTS = f"create_initial_superuser.{STAGE_EXISTS}"
+SPAN_HASH = f"create_initial_superuser.{STAGE_HASH}"
+SPAN_INSERT = f"create_initial_superuser.{STAGE_INSERT}"
+SPAN_FALLBACK = f"create_initial_superuser.{STAGE_FALLBACK}"
+
+# Span attributes: the Django database alias, and the instrumentation
+# outcome (latch_hit, created, fell_back, ...).
+ATTR_DATABASE = "create_initial_superuser.database"
+ATTR_OUTCOME = "create_initial_superuser.outcome"
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+class NoopTracer:
+    """Stand-in for an OpenTelemetry tracer whose spans do nothing."""
+
+    __slots__ = ()
+
+    def start_as_current_span(self, name: str, **kwargs: Any) -> _NoopSpan:
+        return NOOP_SPAN
+
+
+NOOP_SPAN = _NoopSpan()
+NOOP_TRACER = NoopTracer()
+
+
+def build_tracer(enabled: bool) -> Any:
+    """
+    Return the OpenTelemetry tracer for the backend, or NOOP_TRACER.
+
+    Args:
+        enabled: The ``TRACING`` option; NOOP_TRACER is returned when it is
+            off or ``opentelemetry-api`` cannot be imported
+    """
+    if not enabled:
+        return NOOP_TRACER
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return NOOP_TRACER
+
+    from . import __version__
+
+    return trace.get_tracer(TRACER_NAME, __version__)
+
+
+def set_outcome(span: Any, outcome: str, database: Optional[str] = None) -> None:
+    """Set the outcome, and the database alias if known, on a recording span."""
+    if span.is_recording():
+        span.set_attribute(ATTR_OUTCOME, outcome)
+        if database is not None:
+            span.set_attribute(ATTR_DATABASE, database)
@@ -0,0 +1,17 @@
+"""
+URL patterns for create_initial_superuser.
+
+Mount them next to the admin::
+
+    path("bootstrap/", include("create_initial_superuser.urls")),
+"""
+
+from django.urls import path
+
+from . import views
+
+app_name = "create_initial_superuser"
+
+urlpatterns = [
+    path("metrics/", views.metrics, name="metrics"),
+]
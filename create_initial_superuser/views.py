@@ -0,0 +1,21 @@
+"""Views for create_initial_superuser."""
+
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.http import require_GET
+
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from .metrics import get_registry
+
+
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    Serve the Prometheus metrics in the text exposition format.
+
+    The view does no access control; expose it only where your scraper can
+    reach it, or wrap it in your own check.
+    """
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,18 @@
+"""Shared test case bases."""
+
+from django.test import TestCase
+
+from create_initial_superuser.state import superuser_latch
+
+
+class LatchResetMixin:
+    """Start every test with the process-local superuser latch cleared."""
+
+    def setUp(self):
+        """Reset the latch, which outlives the rolled-back test transaction."""
+        super().setUp()
+        superuser_latch.reset()
+
+
+class BootstrapTestCase(LatchResetMixin, TestCase):
+    """TestCase for tests that run the bootstrap against a clean latch."""
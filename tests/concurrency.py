@@ -0,0 +1,79 @@
+"""
+Worker functions for the concurrent bootstrap tests.
+
+These run in spawned processes against a file-backed SQLite database, so
+Django is configured lazily inside each worker rather than at import time.
+"""
+
+import os
+import threading
+
+
+def setup_django(db_path):
+    """Configure Django for a worker process against ``db_path``."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = db_path
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    django.setup()
+
+
+def migrate(db_path):
+    """Create the schema in ``db_path``."""
+    setup_django(db_path)
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+
+def login(username):
+    """
+    Attempt a bootstrap login and report the outcome.
+
+    Returns:
+        A ``(username, is_superuser, error)`` tuple where ``error`` is the
+        repr of any exception raised
+    """
+    from django.contrib.auth import authenticate
+    from django.db import connection
+
+    try:
+        user = authenticate(username=username, password="bootstrap-password")
+        if user is None:
+            return (username, False, None)
+        return (username, user.is_superuser, None)
+    except Exception as exc:  # noqa: BLE001 - reported back to the test
+        return (username, False, repr(exc))
+    finally:
+        connection.close()
+
+
+def login_in_threads(db_path, count, results):
+    """Run ``count`` simultaneous bootstrap logins on threads of one process."""
+    setup_django(db_path)
+
+    barrier = threading.Barrier(count)
+    outcomes = []
+
+    def worker(index):
+        barrier.wait()
+        outcomes.append(login(f"thread-{index}"))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results.put(outcomes)
+
+
+def login_in_process(db_path, index, barrier, results):
+    """Run one bootstrap login in this process once all peers are ready."""
+    setup_django(db_path)
+    barrier.wait()
+    results.put([login(f"process-{index}")])
@@ -0,0 +1,45 @@
+"""Database routers and tenant resolvers used by the multi-database tests."""
+
+AUTH_APP_LABELS = {"auth", "contenttypes", "create_initial_superuser"}
+
+
+class OtherDatabaseRouter:
+    """Send users, and the bootstrap lock, to the "other" database."""
+
+    def _route(self, model, **hints):
+        if model._meta.app_label in AUTH_APP_LABELS:
+            return "other"
+        return None
+
+    db_for_read = _route
+    db_for_write = _route
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class SplitReadWriteRouter:
+    """Read users from "other" and write them to "default"."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in AUTH_APP_LABELS:
+            return "other"
+        return None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label in AUTH_APP_LABELS:
+            return "default"
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+def tenant_database(request):
+    """Resolve the tenant database from the request, as a middleware would."""
+    return getattr(request, "tenant_db", None)
+
+
+def tenant_header(request):
+    """Resolve the tenant database from an X-Tenant request header."""
+    return request.headers.get("X-Tenant")
@@ -57,9 +57,22 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
-    }
+    },
+    # Second alias for the multi-database and router tests.
+    "other": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
 }
 
+# One database per tenant for the per-tenant bootstrap tests.
+DATABASES.update(
+    {
+        f"tenant{i}": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        for i in range(8)
+    }
+)
+
 # Authentication backends
 AUTHENTICATION_BACKENDS = [
     "create_initial_superuser.backends.CreateInitialSuperUserBackend",
@@ -107,4 +120,11 @@ LOGGING = {
         "handlers": ["console"],
         "level": "WARNING",
     },
+    "loggers": {
+        # Bootstrap events are checked with assertLogs; keep the rest of
+        # them out of the test output.
+        "create_initial_superuser.events": {
+            "level": "ERROR",
+        },
+    },
 }
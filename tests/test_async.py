@@ -0,0 +1,129 @@
+"""Tests for the native async authentication path."""
+
+import asyncio
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from asgiref.sync import sync_to_async
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from tests.base import BootstrapTestCase
+
+try:
+    from django.contrib.auth import aauthenticate
+except ImportError:  # Django < 5.0
+    aauthenticate = None
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class AsyncAuthenticateTests(BootstrapTestCase):
+    """Test cases for CreateInitialSuperUserBackend.aauthenticate."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+
+    @override_settings(DEBUG=True)
+    async def test_aauthenticate_creates_initial_superuser(self):
+        """Test that the async path bootstraps the initial superuser."""
+        with self.assertLogs("create_initial_superuser.events", "WARNING") as logs:
+            user = await self.backend.aauthenticate(
+                None, username="admin@example.com", password="adminpass"
+            )
+
+        self.assertTrue(user.is_superuser)
+        self.assertTrue(user.is_staff)
+        self.assertEqual(user.email, "admin@example.com")
+        self.assertTrue(await sync_to_async(user.check_password)("adminpass"))
+        self.assertEqual([record.event for record in logs.records], ["created"])
+
+    @override_settings(DEBUG=True)
+    async def test_aauthenticate_falls_back_when_superuser_exists(self):
+        """Test that the async path defers to ModelBackend once bootstrapped."""
+        await sync_to_async(self.User.objects.create_superuser)(
+            username="admin", password="adminpass"
+        )
+        regular = await sync_to_async(self.User.objects.create_user)(
+            username="regular", password="regularpass"
+        )
+
+        user = await self.backend.aauthenticate(
+            None, username="regular", password="regularpass"
+        )
+        wrong = await self.backend.aauthenticate(
+            None, username="regular", password="wrongpass"
+        )
+
+        self.assertEqual(user, regular)
+        self.assertIsNone(wrong)
+        self.assertEqual(await self.User.objects.filter(is_superuser=True).acount(), 1)
+
+    @override_settings(DEBUG=False)
+    async def test_aauthenticate_does_not_create_when_debug_false(self):
+        """Test that the async path never bootstraps with DEBUG=False."""
+        user = await self.backend.aauthenticate(
+            None, username="admin", password="adminpass"
+        )
+
+        self.assertIsNone(user)
+        self.assertFalse(await self.User.objects.filter(is_superuser=True).aexists())
+
+    async def test_aauthenticate_empty_credentials(self):
+        """Test that the async path rejects empty credentials."""
+        self.assertIsNone(
+            await self.backend.aauthenticate(None, username="", password="x")
+        )
+        self.assertIsNone(
+            await self.backend.aauthenticate(None, username="x", password=None)
+        )
+
+    @unittest.skipIf(
+        aauthenticate is None, "django.contrib.auth.aauthenticate needs Django 5.0"
+    )
+    @override_settings(DEBUG=True)
+    async def test_aauthenticate_with_email_only(self):
+        """Test that the async path uses the email as username when needed."""
+        user = await aauthenticate(
+            username="",
+            email="admin@example.com",
+            password="adminpass",
+        )
+
+        self.assertEqual(user.username, "admin@example.com")
+        self.assertTrue(user.is_superuser)
+
+    @unittest.skipIf(
+        aauthenticate is None, "django.contrib.auth.aauthenticate needs Django 5.0"
+    )
+    @override_settings(DEBUG=True)
+    async def test_concurrent_async_logins(self):
+        """Test hundreds of concurrent logins through the async test client."""
+        await sync_to_async(self.User.objects.create_superuser)(
+            username="admin", password="adminpass"
+        )
+        await sync_to_async(self.User.objects.create_user)(
+            username="regular", password="regularpass"
+        )
+
+        async def login(username, password):
+            return await self.async_client.post(
+                "/async-login/", {"username": username, "password": password}
+            )
+
+        responses = await asyncio.gather(
+            *(login("regular", "regularpass") for _ in range(200)),
+            *(login("regular", "wrongpass") for _ in range(100)),
+            *(login("admin", "adminpass") for _ in range(100)),
+        )
+
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        results = [response.json()["authenticated"] for response in responses]
+        self.assertEqual(results.count(True), 300)
+        self.assertEqual(results.count(False), 100)
+        self.assertEqual(await self.User.objects.filter(is_superuser=True).acount(), 1)
@@ -1,19 +1,23 @@
 """Tests for CreateInitialSuperUserBackend."""
 
-import warnings
 from unittest.mock import patch
 
 from django.contrib.auth import authenticate, get_user_model
+from django.db import OperationalError
 from django.test import TestCase, override_settings
 
+from create_initial_superuser import backends, signals
 from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.state import superuser_latch
+from tests.base import BootstrapTestCase
 
 
-class CreateInitialSuperUserBackendTests(TestCase):
+class CreateInitialSuperUserBackendTests(BootstrapTestCase):
     """Test cases for CreateInitialSuperUserBackend."""
 
     def setUp(self):
         """Set up test fixtures."""
+        super().setUp()
         self.User = get_user_model()
         self.backend = CreateInitialSuperUserBackend()
         self.test_username = "testuser"
@@ -48,9 +52,7 @@ class CreateInitialSuperUserBackendTests(TestCase):
         # Ensure no superusers exist
         self.assertFalse(self.User.objects.filter(is_superuser=True).exists())
 
-        with warnings.catch_warnings(record=True) as warning_list:
-            warnings.simplefilter("always")
-
+        with self.assertLogs("create_initial_superuser.events", "WARNING") as logs:
             # Authenticate should create a new superuser
             authenticated_user = authenticate(
                 username=self.test_username,
@@ -65,24 +67,22 @@ class CreateInitialSuperUserBackendTests(TestCase):
         self.assertTrue(authenticated_user.is_staff)
         self.assertTrue(authenticated_user.check_password(self.test_password))
 
-        # Check that warning was issued
-        self.assertEqual(len(warning_list), 1)
-        self.assertIn("No superusers exist", str(warning_list[0].message))
-        self.assertIn(self.test_username, str(warning_list[0].message))
+        # Check that the creation was logged
+        (record,) = logs.records
+        self.assertEqual(record.event, "created")
+        self.assertEqual(record.username, self.test_username)
+        self.assertEqual(record.database, "default")
 
     @override_settings(DEBUG=True)
     def test_authenticate_creates_superuser_with_email_username(self):
         """Test that superuser is created with email when username looks like email."""
         email_username = self.test_email
 
-        with warnings.catch_warnings(record=True):
-            warnings.simplefilter("always")
-
-            authenticated_user = authenticate(
-                username=email_username,
-                password=self.test_password,
-                backend="create_initial_superuser.backends.CreateInitialSuperUserBackend",
-            )
+        authenticated_user = authenticate(
+            username=email_username,
+            password=self.test_password,
+            backend="create_initial_superuser.backends.CreateInitialSuperUserBackend",
+        )
 
         self.assertIsNotNone(authenticated_user)
         self.assertEqual(authenticated_user.username, email_username)
@@ -189,9 +189,7 @@ class CreateInitialSuperUserBackendTests(TestCase):
     @override_settings(DEBUG=True)
     def test_create_initial_superuser_method(self):
         """Test the _create_initial_superuser method directly."""
-        with warnings.catch_warnings(record=True) as warning_list:
-            warnings.simplefilter("always")
-
+        with self.assertLogs("create_initial_superuser.events", "WARNING") as logs:
             user = self.backend._create_initial_superuser(
                 self.User, self.test_username, self.test_password
             )
@@ -206,29 +204,29 @@ class CreateInitialSuperUserBackendTests(TestCase):
         db_user = self.User.objects.get(username=self.test_username)
         self.assertEqual(db_user, user)
 
-        # Check warning was issued
-        self.assertEqual(len(warning_list), 1)
-        self.assertIn("No superusers exist", str(warning_list[0].message))
+        # Check the creation was logged
+        self.assertEqual([record.event for record in logs.records], ["created"])
 
     @override_settings(DEBUG=True)
     def test_create_initial_superuser_with_email_in_username(self):
         """Test _create_initial_superuser with email-like username."""
         email_username = self.test_email
 
-        with warnings.catch_warnings(record=True):
-            warnings.simplefilter("always")
-
-            user = self.backend._create_initial_superuser(
-                self.User, email_username, self.test_password
-            )
+        user = self.backend._create_initial_superuser(
+            self.User, email_username, self.test_password
+        )
 
         self.assertEqual(user.username, email_username)
         self.assertEqual(user.email, email_username)
 
+    # A different AUTH_USER_MODEL value that names the same model, so no
+    # second user model is needed.
+    @override_settings(AUTH_USER_MODEL="auth.user")
     @patch("create_initial_superuser.backends.get_user_model")
     def test_authenticate_with_custom_user_model(self, mock_get_user_model):
         """Test authentication works with custom user model."""
         mock_get_user_model.return_value = self.User
+        self.addCleanup(backends._user_models.pop, "auth.user", None)
 
         # Create a superuser to avoid initial creation
         self.User.objects.create_user(
@@ -247,20 +245,21 @@ class CreateInitialSuperUserBackendTests(TestCase):
         )
 
         self.assertEqual(authenticated_user, user)
-        mock_get_user_model.assert_called()
+        # Resolved on first use, then cached for this AUTH_USER_MODEL.
+        self.backend.authenticate(
+            None, username=self.test_username, password=self.test_password
+        )
+        mock_get_user_model.assert_called_once()
 
     @override_settings(DEBUG=True)
     def test_multiple_authentication_attempts_only_create_one_superuser(self):
         """Test that multiple auth attempts don't create multiple superusers."""
         # First authentication should create superuser
-        with warnings.catch_warnings(record=True):
-            warnings.simplefilter("always")
-
-            user1 = authenticate(
-                username=self.test_username,
-                password=self.test_password,
-                backend="create_initial_superuser.backends.CreateInitialSuperUserBackend",
-            )
+        user1 = authenticate(
+            username=self.test_username,
+            password=self.test_password,
+            backend="create_initial_superuser.backends.CreateInitialSuperUserBackend",
+        )
 
         # Second authentication should not create another superuser
         user2 = authenticate(
@@ -283,9 +282,7 @@ class CreateInitialSuperUserBackendTests(TestCase):
         # Ensure no superusers exist
         self.assertFalse(self.User.objects.filter(is_superuser=True).exists())
 
-        with warnings.catch_warnings(record=True) as warning_list:
-            warnings.simplefilter("always")
-
+        with self.assertLogs("create_initial_superuser.events", "WARNING") as logs:
             # Authenticate with empty username but email in kwargs
             authenticated_user = authenticate(
                 username="",  # Empty username
@@ -302,10 +299,10 @@ class CreateInitialSuperUserBackendTests(TestCase):
         self.assertTrue(authenticated_user.is_staff)
         self.assertTrue(authenticated_user.check_password(self.test_password))
 
-        # Check that warning was issued
-        self.assertEqual(len(warning_list), 1)
-        self.assertIn("No superusers exist", str(warning_list[0].message))
-        self.assertIn(self.test_email, str(warning_list[0].message))
+        # Check that the creation was logged
+        (record,) = logs.records
+        self.assertEqual(record.event, "created")
+        self.assertEqual(record.username, self.test_email)
 
     @override_settings(DEBUG=True)
     def test_authenticate_with_email_only_none_username(self):
@@ -313,16 +310,13 @@ class CreateInitialSuperUserBackendTests(TestCase):
         # Ensure no superusers exist
         self.assertFalse(self.User.objects.filter(is_superuser=True).exists())
 
-        with warnings.catch_warnings(record=True) as warning_list:
-            warnings.simplefilter("always")
-
-            # Authenticate with None username but email in kwargs
-            authenticated_user = authenticate(
-                username=None,  # None username
-                password=self.test_password,
-                email=self.test_email,  # Email provided in kwargs
-                backend="create_initial_superuser.backends.CreateInitialSuperUserBackend",
-            )
+        # Authenticate with None username but email in kwargs
+        authenticated_user = authenticate(
+            username=None,  # None username
+            password=self.test_password,
+            email=self.test_email,  # Email provided in kwargs
+            backend="create_initial_superuser.backends.CreateInitialSuperUserBackend",
+        )
 
         # Check that user was created with email as username
         self.assertIsNotNone(authenticated_user)
@@ -331,3 +325,348 @@ class CreateInitialSuperUserBackendTests(TestCase):
         self.assertTrue(authenticated_user.is_superuser)
         self.assertTrue(authenticated_user.is_staff)
         self.assertTrue(authenticated_user.check_password(self.test_password))
+
+
+class SuperuserLatchTests(BootstrapTestCase):
+    """Test cases for the process-local "superuser exists" latch."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+
+    def _create_superuser(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.User.objects.create_user(
+                username="admin", password="adminpass", is_superuser=True
+            )
+
+    def test_existence_query_sets_latch(self):
+        """Test that seeing a superuser in the database sets the latch."""
+        self.User.objects.create_user(
+            username="admin", password="adminpass", is_superuser=True
+        )
+        superuser_latch.reset()
+
+        self.assertTrue(self.backend._superuser_exists(self.User))
+        self.assertTrue(superuser_latch.is_set())
+
+    def test_latch_skips_existence_query(self):
+        """Test that the steady-state check makes no query once latched."""
+        self._create_superuser()
+        self.assertTrue(superuser_latch.is_set())
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.backend._superuser_exists(self.User))
+
+    @override_settings(DEBUG=True)
+    def test_steady_state_login_makes_no_extra_query(self):
+        """Test that a latched login only runs the ModelBackend lookup."""
+        self._create_superuser()
+        self.User.objects.create_user(username="regular", password="regularpass")
+
+        with self.assertNumQueries(1):
+            user = self.backend.authenticate(
+                None, username="regular", password="regularpass"
+            )
+
+        self.assertEqual(user.username, "regular")
+
+    def test_latch_not_set_before_commit(self):
+        """Test that an uncommitted superuser save does not set the latch."""
+        self.User.objects.create_user(
+            username="admin", password="adminpass", is_superuser=True
+        )
+
+        self.assertFalse(superuser_latch.is_set())
+
+    def test_deleting_superuser_resets_latch(self):
+        """Test that deleting a superuser resets the latch."""
+        superuser = self._create_superuser()
+
+        superuser.delete()
+
+        self.assertFalse(superuser_latch.is_set())
+
+    def test_demoting_superuser_resets_latch(self):
+        """Test that demoting a superuser resets the latch."""
+        superuser = self._create_superuser()
+
+        superuser.is_superuser = False
+        superuser.save()
+
+        self.assertFalse(superuser_latch.is_set())
+
+    def test_demoting_loaded_superuser_resets_latch(self):
+        """Test that demoting a superuser read back from the database resets the latch."""
+        self._create_superuser()
+        superuser = self.User.objects.get(username="admin")
+
+        superuser.is_superuser = False
+        superuser.save()
+
+        self.assertFalse(superuser_latch.is_set())
+
+    def test_saving_regular_user_keeps_latch(self):
+        """Test that a full save of a user who was never a superuser keeps the latch."""
+        self._create_superuser()
+        self.User.objects.create_user(username="regular", password="regularpass")
+        regular = self.User.objects.get(username="regular")
+
+        regular.first_name = "Regular"
+        regular.save()
+
+        self.assertTrue(superuser_latch.is_set())
+
+    def test_deferred_flag_is_not_loaded(self):
+        """Test that tracking the superuser flag never loads a deferred field."""
+        self.User.objects.create_user(username="regular", password="regularpass")
+
+        with self.assertNumQueries(1):
+            regular = self.User.objects.only("username").get(username="regular")
+
+        self.assertIsNone(regular.__dict__[signals.WAS_SUPERUSER])
+
+    def test_unrelated_save_keeps_latch(self):
+        """Test that saves not touching is_superuser keep the latch set."""
+        self._create_superuser()
+        regular = self.User.objects.create_user(
+            username="regular", password="regularpass"
+        )
+
+        regular.save(update_fields=["last_login"])
+
+        self.assertTrue(superuser_latch.is_set())
+
+    def test_deleting_regular_user_keeps_latch(self):
+        """Test that deleting a non-superuser keeps the latch set."""
+        self._create_superuser()
+        regular = self.User.objects.create_user(
+            username="regular", password="regularpass"
+        )
+
+        regular.delete()
+
+        self.assertTrue(superuser_latch.is_set())
+
+    @override_settings(DEBUG=True)
+    def test_bootstrap_honored_after_last_superuser_deleted(self):
+        """Test that a new superuser is created after the last one is deleted."""
+        self._create_superuser().delete()
+
+        user = self.backend.authenticate(
+            None, username="newadmin", password="newadminpass"
+        )
+
+        self.assertTrue(user.is_superuser)
+        self.assertEqual(user.username, "newadmin")
+
+
+@override_settings(
+    DEBUG=True, PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class InitialSuperuserQueryCountTests(BootstrapTestCase):
+    """Lock in the exact query count of every creation variant."""
+
+    # SAVEPOINT, INSERT lock row, SELECT superuser exists, INSERT user,
+    # DELETE lock row, RELEASE SAVEPOINT.
+    CREATE_QUERIES = 6
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+
+    def test_create_plain_username(self):
+        """Test creating a superuser with a plain username."""
+        with self.assertNumQueries(self.CREATE_QUERIES):
+            user = self.backend._create_initial_superuser(
+                self.User, "admin", "adminpass"
+            )
+
+        self.assertEqual(user.email, "")
+
+    def test_create_email_username(self):
+        """Test that an email-like username is stored without an extra UPDATE."""
+        with self.assertNumQueries(self.CREATE_QUERIES):
+            user = self.backend._create_initial_superuser(
+                self.User, "admin@example.com", "adminpass"
+            )
+
+        user.refresh_from_db()
+        self.assertEqual(user.email, "admin@example.com")
+
+    @override_settings(
+        CREATE_INITIAL_SUPERUSER={
+            "USER_DEFAULTS": {"first_name": "Ada", "is_superuser": False}
+        }
+    )
+    def test_create_with_user_defaults(self):
+        """Test that configured defaults are part of the single INSERT."""
+        with self.assertNumQueries(self.CREATE_QUERIES):
+            user = self.backend._create_initial_superuser(
+                self.User, "admin", "adminpass"
+            )
+
+        user.refresh_from_db()
+        self.assertEqual(user.first_name, "Ada")
+        self.assertTrue(user.is_superuser)
+
+    def test_authenticate_plain_username(self):
+        """Test the full bootstrap login with a plain username."""
+        with self.assertNumQueries(1 + self.CREATE_QUERIES):
+            self.backend.authenticate(None, username="admin", password="adminpass")
+
+    def test_authenticate_email_username(self):
+        """Test the full bootstrap login with an email-like username."""
+        with self.assertNumQueries(1 + self.CREATE_QUERIES):
+            self.backend.authenticate(
+                None, username="admin@example.com", password="adminpass"
+            )
+
+    def test_authenticate_email_only(self):
+        """Test the full bootstrap login with only an email supplied."""
+        with self.assertNumQueries(1 + self.CREATE_QUERIES):
+            user = self.backend.authenticate(
+                None, username="", email="admin@example.com", password="adminpass"
+            )
+
+        self.assertEqual(user.email, "admin@example.com")
+
+    def test_lost_race_creates_nothing(self):
+        """Test that finding a superuser under the lock skips the INSERT."""
+        self.User.objects.create_user(
+            username="admin", password="adminpass", is_superuser=True
+        )
+
+        # SAVEPOINT, INSERT lock row, SELECT superuser exists, DELETE lock
+        # row, RELEASE SAVEPOINT.
+        with self.assertNumQueries(5):
+            user = self.backend._create_initial_superuser(
+                self.User, "other", "otherpass"
+            )
+
+        self.assertIsNone(user)
+
+
+@override_settings(
+    DEBUG=True, PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class BootstrapRetryTests(TestCase):
+    """Test cases for retrying the creation transaction on lock errors."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+        sleep = patch.object(backends.time, "sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def insert(self, *errors):
+        """Insert the superuser, the first lock row INSERTs raising ``errors``."""
+        with patch.object(backends, "BootstrapLock") as lock:
+            lock.objects.using.return_value.create.side_effect = [*errors, None]
+            return self.backend._insert_initial_superuser(
+                self.User, "admin", "hash", using="default"
+            )
+
+    def test_database_locked_is_retried(self):
+        """Test that SQLite's busy error is retried after a backoff."""
+        user = self.insert(OperationalError("database is locked"))
+
+        self.assertTrue(user.is_superuser)
+        self.assertEqual(self.sleep.call_count, 1)
+
+    def test_sqlstate_is_retried(self):
+        """Test that a deadlock reported by its SQLSTATE is retried."""
+        cause = Exception("deadlock detected")
+        cause.pgcode = "40P01"
+        error = OperationalError("server closed the transaction")
+        error.__cause__ = cause
+
+        self.assertIsNotNone(self.insert(error))
+        self.assertEqual(self.sleep.call_count, 1)
+
+    def test_other_errors_are_raised_at_once(self):
+        """Test that a missing lock table fails the login without retrying."""
+        with self.assertRaisesMessage(OperationalError, "no such table"):
+            self.insert(
+                OperationalError(
+                    "no such table: create_initial_superuser_bootstraplock"
+                )
+            )
+
+        self.sleep.assert_not_called()
+        self.assertFalse(self.User.objects.exists())
+
+    def test_retries_are_bounded(self):
+        """Test that a lock that never clears is raised after the last retry."""
+        errors = [OperationalError("database is locked")] * (
+            self.backend.create_retries + 1
+        )
+
+        with self.assertRaises(OperationalError):
+            self.insert(*errors)
+
+        self.assertEqual(self.sleep.call_count, self.backend.create_retries)
+
+
+@override_settings(
+    DEBUG=True,
+    PASSWORD_HASHERS=[
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+    ],
+    CREATE_INITIAL_SUPERUSER={"DEBUG_HASHER": "md5"},
+)
+class DebugHasherTests(BootstrapTestCase):
+    """Test cases for the DEBUG-only bootstrap hasher."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+
+    def test_bootstrap_uses_debug_hasher(self):
+        """Test that the bootstrap account is hashed with DEBUG_HASHER."""
+        user = self.backend.authenticate(None, username="admin", password="adminpass")
+
+        self.assertTrue(user.password.startswith("md5$"))
+
+    def test_next_login_upgrades_hash(self):
+        """Test that the fallback login rehashes with the primary hasher."""
+        self.backend.authenticate(None, username="admin", password="adminpass")
+
+        user = self.backend.authenticate(None, username="admin", password="adminpass")
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha1$"))
+        self.assertTrue(user.check_password("adminpass"))
+
+    @override_settings(
+        CREATE_INITIAL_SUPERUSER={
+            "DEBUG_HASHER": "md5",
+            "HASHING_EXECUTOR": {"MAX_WORKERS": 1},
+        }
+    )
+    def test_next_login_upgrades_hash_on_executor(self):
+        """Test that the executor fallback path upgrades the hash too."""
+        self.backend.authenticate(None, username="admin", password="adminpass")
+
+        user = self.backend.authenticate(None, username="admin", password="adminpass")
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha1$"))
+
+    @override_settings(
+        DEBUG=False, CREATE_INITIAL_SUPERUSER={"ENABLED": True, "DEBUG_HASHER": "md5"}
+    )
+    def test_ignored_without_debug(self):
+        """Test that DEBUG_HASHER never activates with DEBUG off."""
+        user = self.backend.authenticate(None, username="admin", password="adminpass")
+
+        self.assertTrue(user.password.startswith("pbkdf2_sha1$"))
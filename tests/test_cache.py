@@ -0,0 +1,221 @@
+"""Tests for the cross-process superuser existence cache."""
+
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.cache import (
+    CACHE_KEY_VERSION,
+    cache_key,
+    get_superuser_exists,
+    set_superuser_exists,
+)
+from create_initial_superuser.state import superuser_latch
+from tests.base import LatchResetMixin
+
+CACHE_SETTINGS = {"CACHE_ALIAS": "bootstrap", "CACHE_TIMEOUT": 60}
+
+
+class SuperuserExistsCacheTestsMixin(LatchResetMixin):
+    """Backend-independent cache tests, mixed into one class per cache backend."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        caches["bootstrap"].clear()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+
+    def test_miss_queries_database_and_stores_answer(self):
+        """Test that a cache miss falls through to the database."""
+        with self.assertNumQueries(1):
+            self.assertFalse(self.backend._superuser_exists(self.User))
+
+        self.assertIs(get_superuser_exists(), False)
+
+    def test_cached_answer_skips_database(self):
+        """Test that a worker with an empty latch trusts the cache."""
+        set_superuser_exists(True)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.backend._superuser_exists(self.User))
+
+        self.assertTrue(superuser_latch.is_set())
+
+    def test_creation_writes_through(self):
+        """Test that bootstrapping a superuser stores True in the cache."""
+        set_superuser_exists(False)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend._create_initial_superuser(self.User, "admin", "adminpass")
+
+        self.assertIs(get_superuser_exists(), True)
+
+    def test_superuser_save_does_not_write_through(self):
+        """Test that saving an existing superuser, as on login, skips the cache."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.User.objects.create_user(
+                username="admin", password="adminpass", is_superuser=True
+            )
+        superuser = self.User.objects.get()
+        caches["bootstrap"].clear()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            superuser.save(update_fields=["last_login"])
+            superuser.save()
+
+        self.assertEqual(callbacks, [])
+        self.assertIsNone(get_superuser_exists())
+
+    def test_promoting_user_writes_through(self):
+        """Test that a regular user saved as a superuser stores True."""
+        regular = self.User.objects.create_user(
+            username="regular", password="regularpass"
+        )
+        set_superuser_exists(False)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            regular = self.User.objects.get()
+            regular.is_superuser = True
+            regular.save()
+
+        self.assertIs(get_superuser_exists(), True)
+
+    @override_settings(DEBUG=True)
+    def test_lost_race_writes_through(self):
+        """Test that losing the creation race replaces a stale cached False."""
+        self.User.objects.create_user(
+            username="winner", password="winnerpass", is_superuser=True
+        )
+        set_superuser_exists(False)
+
+        user = self.backend._create_initial_superuser(self.User, "admin", "adminpass")
+
+        self.assertIsNone(user)
+        self.assertTrue(superuser_latch.is_set())
+        superuser_latch.reset()
+        self.assertIs(get_superuser_exists(), True)
+        with patch.object(self.backend, "_insert_initial_superuser") as insert:
+            user = self.backend.authenticate(
+                None, username="winner", password="winnerpass"
+            )
+
+        self.assertEqual(user.username, "winner")
+        insert.assert_not_called()
+
+    def test_deleting_superuser_invalidates(self):
+        """Test that deleting the last superuser drops the cached answer."""
+        with self.captureOnCommitCallbacks(execute=True):
+            superuser = self.User.objects.create_user(
+                username="admin", password="adminpass", is_superuser=True
+            )
+        self.assertIs(get_superuser_exists(), True)
+
+        superuser.delete()
+
+        self.assertIsNone(get_superuser_exists())
+
+    def test_demoting_superuser_invalidates(self):
+        """Test that demoting a superuser drops the cached answer."""
+        with self.captureOnCommitCallbacks(execute=True):
+            superuser = self.User.objects.create_user(
+                username="admin", password="adminpass", is_superuser=True
+            )
+
+        superuser.is_superuser = False
+        superuser.save(update_fields=["is_superuser"])
+
+        self.assertIsNone(get_superuser_exists())
+
+    def test_other_key_versions_are_ignored(self):
+        """Test that entries written under another key version are ignored."""
+        caches["bootstrap"].set(cache_key(), True, version=CACHE_KEY_VERSION + 1)
+
+        self.assertIsNone(get_superuser_exists())
+
+        caches["bootstrap"].set(cache_key(), True, version=CACHE_KEY_VERSION)
+
+        self.assertIs(get_superuser_exists(), True)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "bootstrap": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+    CREATE_INITIAL_SUPERUSER=CACHE_SETTINGS,
+)
+class LocMemSuperuserExistsCacheTests(SuperuserExistsCacheTestsMixin, TestCase):
+    """Cache tests against the local-memory cache backend."""
+
+
+class FileBasedSuperuserExistsCacheTests(SuperuserExistsCacheTestsMixin, TestCase):
+    """Cache tests against the file-based cache backend."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.cache_dir, ignore_errors=True)
+        cls._cache_settings = override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "bootstrap": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": cls.cache_dir,
+                },
+            },
+            CREATE_INITIAL_SUPERUSER=CACHE_SETTINGS,
+        )
+        cls._cache_settings.enable()
+        cls.addClassCleanup(cls._cache_settings.disable)
+        super().setUpClass()
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "bootstrap": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "create_initial_superuser_cache",
+        },
+    },
+    CREATE_INITIAL_SUPERUSER=CACHE_SETTINGS,
+)
+class DatabaseSuperuserExistsCacheTests(SuperuserExistsCacheTestsMixin, TestCase):
+    """Cache tests against the database cache backend."""
+
+    def setUp(self):
+        """Create the cache table inside the test transaction."""
+        call_command("createcachetable", "create_initial_superuser_cache", verbosity=0)
+        super().setUp()
+
+    def test_miss_queries_database_and_stores_answer(self):
+        """Test that a cache miss falls through to the database."""
+        # The database cache shares the connection, so only check the outcome.
+        self.assertFalse(self.backend._superuser_exists(self.User))
+        self.assertIs(get_superuser_exists(), False)
+
+    def test_cached_answer_skips_database(self):
+        """Test that a worker with an empty latch trusts the cache."""
+        set_superuser_exists(True)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(self.backend._superuser_exists(self.User))
+
+        self.assertTrue(superuser_latch.is_set())
+
+
+class DisabledSuperuserExistsCacheTests(TestCase):
+    """Test cases for the default, cache-less mode."""
+
+    def test_disabled_by_default(self):
+        """Test that nothing is cached without a configured alias."""
+        set_superuser_exists(True)
+
+        self.assertIsNone(get_superuser_exists())
@@ -0,0 +1,74 @@
+"""Tests for the superuser existence query plan check."""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import checks
+from django.db import connection
+from django.test import TransactionTestCase
+
+from create_initial_superuser.checks import W001, check_superuser_query_plan
+from create_initial_superuser.indexes import (
+    install_superuser_index,
+    remove_superuser_index,
+)
+
+
+class SuperuserQueryPlanCheckTests(TransactionTestCase):
+    """Test cases for the deploy check that EXPLAINs the existence query."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.User = get_user_model()
+        # The rowid estimate makes this look like a 20000 row table.
+        self.User.objects.create_user(pk=20000, username="last")
+        self.addCleanup(remove_superuser_index)
+
+    def test_warns_about_full_scan(self):
+        """Test that a scan of a large table is reported with its size."""
+        (warning,) = check_superuser_query_plan(databases=["default"])
+
+        self.assertEqual(warning.id, W001)
+        self.assertIn("auth_user table (about 20000 rows)", warning.msg)
+        self.assertIn("install_superuser_index", warning.hint)
+        self.assertIn("SCAN auth_user", warning.hint)
+
+    def test_no_warning_with_index(self):
+        """Test that the partial index silences the check."""
+        install_superuser_index()
+
+        self.assertEqual(check_superuser_query_plan(databases=["default"]), [])
+
+    def test_no_warning_for_small_table(self):
+        """Test that small tables are not worth a warning."""
+        with mock.patch("create_initial_superuser.checks.LARGE_TABLE_ROWS", 50000):
+            self.assertEqual(check_superuser_query_plan(databases=["default"]), [])
+
+    def test_uses_analyze_statistics(self):
+        """Test that ANALYZE statistics take precedence over the rowid."""
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.addCleanup(self._drop_statistics)
+
+        with mock.patch("create_initial_superuser.checks.LARGE_TABLE_ROWS", 1):
+            (warning,) = check_superuser_query_plan(databases=["default"])
+
+        self.assertIn("(about 1 rows)", warning.msg)
+
+    def _drop_statistics(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM sqlite_stat1")
+
+    def test_opt_in(self):
+        """Test that the check only runs for --deploy with a database."""
+
+        def run(**kwargs):
+            return [
+                message for message in checks.run_checks(**kwargs) if message.id == W001
+            ]
+
+        self.assertEqual(run(databases=["default"]), [])
+        self.assertEqual(run(include_deployment_checks=True), [])
+        self.assertEqual(
+            len(run(databases=["default"], include_deployment_checks=True)), 1
+        )
@@ -0,0 +1,166 @@
+"""Tests for the create_initial_superuser management command."""
+
+import os
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from create_initial_superuser.management.commands.create_initial_superuser import (
+    EXIT_ALREADY_PRESENT,
+    EXIT_CREATED,
+    Command,
+)
+from create_initial_superuser.state import superuser_latch
+from tests.base import BootstrapTestCase
+
+
+@override_settings(
+    DEBUG=False,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class CreateInitialSuperuserCommandTests(BootstrapTestCase):
+    """Test cases for the create_initial_superuser command."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        environ = mock.patch.dict(
+            os.environ,
+            {
+                "DJANGO_SUPERUSER_USERNAME": "admin",
+                "DJANGO_SUPERUSER_PASSWORD": "adminpass",
+            },
+        )
+        environ.start()
+        self.addCleanup(environ.stop)
+
+    def call(self, *args):
+        """Run the command and return it with its output."""
+        command = Command()
+        stdout = StringIO()
+        call_command(command, *args, stdout=stdout)
+        return command, stdout.getvalue()
+
+    def test_creates_superuser_from_environment(self):
+        """Test that the superuser is created from environment variables."""
+        command, output = self.call()
+
+        user = self.User.objects.get(username="admin")
+        self.assertTrue(user.is_superuser)
+        self.assertTrue(user.is_staff)
+        self.assertTrue(user.check_password("adminpass"))
+        self.assertEqual(command.exit_code, EXIT_CREATED)
+        self.assertIn("Created initial superuser 'admin'", output)
+
+    def test_cli_options_override_environment(self):
+        """Test that --username and --email take precedence."""
+        self.call("--username", "root", "--email", "root@example.com")
+
+        user = self.User.objects.get(is_superuser=True)
+        self.assertEqual(user.username, "root")
+        self.assertEqual(user.email, "root@example.com")
+
+    def test_email_from_environment(self):
+        """Test that DJANGO_SUPERUSER_EMAIL sets the email."""
+        with mock.patch.dict(os.environ, {"DJANGO_SUPERUSER_EMAIL": "a@example.com"}):
+            self.call()
+
+        self.assertEqual(self.User.objects.get().email, "a@example.com")
+
+    def test_existing_superuser_is_single_query_noop(self):
+        """Test that an existing superuser costs one query and exits with 3."""
+        self.User.objects.create_superuser(username="other", password="otherpass")
+        superuser_latch.reset()
+
+        with self.assertNumQueries(1):
+            command, output = self.call()
+
+        self.assertEqual(command.exit_code, EXIT_ALREADY_PRESENT)
+        self.assertIn("already exists", output)
+        self.assertEqual(self.User.objects.count(), 1)
+
+    def test_missing_password(self):
+        """Test that a missing password is an error."""
+        with mock.patch.dict(os.environ, {"DJANGO_SUPERUSER_PASSWORD": ""}):
+            with self.assertRaisesMessage(CommandError, "DJANGO_SUPERUSER_PASSWORD"):
+                self.call()
+
+        self.assertFalse(self.User.objects.exists())
+
+    def test_missing_username(self):
+        """Test that a missing username is an error."""
+        with mock.patch.dict(os.environ, {"DJANGO_SUPERUSER_USERNAME": ""}):
+            with self.assertRaisesMessage(CommandError, "username is required"):
+                self.call()
+
+    def test_username_taken_by_regular_user(self):
+        """Test that a non-superuser holding the username is an error."""
+        self.User.objects.create_user(username="admin", password="regularpass")
+
+        with self.assertRaisesMessage(CommandError, "not a superuser"):
+            self.call()
+
+    def test_password_hash_from_environment(self):
+        """Test that a pre-hashed password is stored as-is without hashing."""
+        encoded = make_password("adminpass")
+        environ = {
+            "DJANGO_SUPERUSER_PASSWORD": "",
+            "DJANGO_SUPERUSER_PASSWORD_HASH": encoded,
+        }
+
+        with mock.patch.dict(os.environ, environ), mock.patch(
+            "create_initial_superuser.backends.make_password",
+            side_effect=AssertionError("password was hashed"),
+        ):
+            command, _ = self.call()
+
+        user = self.User.objects.get(username="admin")
+        self.assertEqual(user.password, encoded)
+        self.assertTrue(user.check_password("adminpass"))
+        self.assertEqual(command.exit_code, EXIT_CREATED)
+
+    def test_password_hash_from_settings(self):
+        """Test that the PASSWORD_HASH option is used when no password is set."""
+        encoded = make_password("adminpass")
+
+        with mock.patch.dict(os.environ, {"DJANGO_SUPERUSER_PASSWORD": ""}):
+            with self.settings(CREATE_INITIAL_SUPERUSER={"PASSWORD_HASH": encoded}):
+                self.call()
+
+        self.assertEqual(self.User.objects.get().password, encoded)
+
+    def test_invalid_password_hash(self):
+        """Test that a plain-text or unknown hash is rejected."""
+        environ = {
+            "DJANGO_SUPERUSER_PASSWORD": "",
+            "DJANGO_SUPERUSER_PASSWORD_HASH": "adminpass",
+        }
+
+        with mock.patch.dict(os.environ, environ):
+            with self.assertRaisesMessage(CommandError, "PASSWORD_HASH is not"):
+                self.call()
+
+        self.assertFalse(self.User.objects.exists())
+
+    def test_password_and_hash_are_exclusive(self):
+        """Test that setting both a password and a hash is an error."""
+        environ = {"DJANGO_SUPERUSER_PASSWORD_HASH": make_password("adminpass")}
+
+        with mock.patch.dict(os.environ, environ):
+            with self.assertRaisesMessage(CommandError, "only one of"):
+                self.call()
+
+    def test_exit_status(self):
+        """Test the process exit status of run_from_argv()."""
+        argv = ["manage.py", "create_initial_superuser", "--verbosity", "0"]
+
+        Command().run_from_argv(argv)
+        with self.assertRaises(SystemExit) as exit_info:
+            Command().run_from_argv(argv)
+
+        self.assertEqual(exit_info.exception.code, EXIT_ALREADY_PRESENT)
@@ -0,0 +1,79 @@
+"""Stress tests for concurrent initial superuser creation."""
+
+import multiprocessing
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from tests import concurrency
+
+
+class ConcurrentBootstrapTests(SimpleTestCase):
+    """Concurrent first logins against a file-backed SQLite database."""
+
+    def setUp(self):
+        """Create and migrate a fresh database file."""
+        self.context = multiprocessing.get_context("spawn")
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        self.db_path = str(Path(tmp_dir) / "bootstrap.sqlite3")
+
+        process = self.context.Process(target=concurrency.migrate, args=(self.db_path,))
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+
+    def _collect(self, processes, results):
+        outcomes = []
+        for _ in processes:
+            outcomes.extend(results.get(timeout=60))
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+        return outcomes
+
+    def _assert_exactly_one_superuser(self, outcomes, attempts):
+        self.assertEqual(len(outcomes), attempts)
+        self.assertEqual([error for _, _, error in outcomes if error], [])
+        winners = [username for username, is_superuser, _ in outcomes if is_superuser]
+        self.assertEqual(len(winners), 1)
+
+        with sqlite3.connect(self.db_path) as db:
+            rows = db.execute(
+                "SELECT username FROM auth_user WHERE is_superuser"
+            ).fetchall()
+        self.assertEqual(rows, [(winners[0],)])
+
+    def test_concurrent_threads_create_one_superuser(self):
+        """Test that simultaneous logins on many threads create one superuser."""
+        results = self.context.Queue()
+        process = self.context.Process(
+            target=concurrency.login_in_threads, args=(self.db_path, 16, results)
+        )
+        process.start()
+
+        outcomes = self._collect([process], results)
+
+        self._assert_exactly_one_superuser(outcomes, 16)
+
+    def test_concurrent_processes_create_one_superuser(self):
+        """Test that simultaneous logins in many processes create one superuser."""
+        count = 8
+        results = self.context.Queue()
+        barrier = self.context.Barrier(count)
+        processes = [
+            self.context.Process(
+                target=concurrency.login_in_process,
+                args=(self.db_path, index, barrier, results),
+            )
+            for index in range(count)
+        ]
+        for process in processes:
+            process.start()
+
+        outcomes = self._collect(processes, results)
+
+        self._assert_exactly_one_superuser(outcomes, count)
@@ -0,0 +1,266 @@
+"""Tests for the compiled CREATE_INITIAL_SUPERUSER configuration."""
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.conf import get_config, reload_config
+from tests.base import BootstrapTestCase
+
+
+class BootstrapConfigTests(SimpleTestCase):
+    """Test cases for building the config from settings."""
+
+    def assertImproperlyConfigured(self, options, message):
+        """Assert that ``options`` are rejected with ``message``."""
+        with self.settings(CREATE_INITIAL_SUPERUSER=options):
+            with self.assertRaisesMessage(ImproperlyConfigured, message):
+                get_config()
+
+    @override_settings(DEBUG=True, CREATE_INITIAL_SUPERUSER={})
+    def test_defaults(self):
+        """Test the values used when the setting is empty."""
+        config = get_config()
+
+        self.assertTrue(config.enabled)
+        self.assertEqual(dict(config.user_defaults), {})
+        self.assertTrue(config.email_from_username)
+        self.assertEqual(config.hasher, "default")
+        self.assertIsNone(config.cache_alias)
+        self.assertEqual(config.cache_timeout, 300)
+        self.assertIsNone(config.hashing_executor)
+        self.assertIsNone(config.throttle)
+        self.assertIsNone(config.sink)
+        self.assertIsNotNone(config.event_log)
+        self.assertFalse(config.warnings)
+        self.assertIsNone(config.tenant_resolver)
+        self.assertEqual(config.tenant_state_size, 1024)
+
+    @override_settings(DEBUG=False)
+    def test_enabled_follows_debug(self):
+        """Test that creation is disabled when DEBUG is off by default."""
+        self.assertFalse(get_config().enabled)
+
+    @override_settings(DEBUG=False, CREATE_INITIAL_SUPERUSER={"ENABLED": True})
+    def test_enabled_overrides_debug(self):
+        """Test that ENABLED takes precedence over DEBUG."""
+        self.assertTrue(get_config().enabled)
+
+    def test_config_is_immutable(self):
+        """Test that the compiled config cannot be modified."""
+        config = get_config()
+
+        with self.assertRaises(AttributeError):
+            config.enabled = False
+        with self.assertRaises(TypeError):
+            config.user_defaults["first_name"] = "Admin"
+
+    def test_rebuilt_on_setting_changed(self):
+        """Test that override_settings replaces the compiled config."""
+        before = get_config()
+
+        with self.settings(CREATE_INITIAL_SUPERUSER={"CACHE_TIMEOUT": 60}):
+            self.assertEqual(get_config().cache_timeout, 60)
+
+        self.assertIsNot(get_config(), before)
+        self.assertEqual(get_config().cache_timeout, before.cache_timeout)
+
+    @override_settings(
+        CREATE_INITIAL_SUPERUSER={
+            "HASHING_EXECUTOR": {"MAX_WORKERS": 1},
+            "THROTTLE": {"RATE": 2},
+            "INSTRUMENTATION": {"SINK": "tests.test_instrumentation.RecordingSink"},
+        }
+    )
+    def test_reload_keeps_executor_and_sink(self):
+        """Test that unchanged executor, throttle, sink and log options reuse them."""
+        before = get_config()
+
+        after = reload_config()
+
+        self.assertIs(after.hashing_executor, before.hashing_executor)
+        self.assertIs(after.throttle, before.throttle)
+        self.assertIs(after.sink, before.sink)
+        self.assertIs(after.event_log, before.event_log)
+
+    def test_unknown_key(self):
+        """Test that misspelled keys are rejected."""
+        self.assertImproperlyConfigured(
+            {"USER_DEFAULT": {}}, "unknown top-level key(s): USER_DEFAULT"
+        )
+
+    def test_invalid_enabled(self):
+        """Test that ENABLED must be a boolean or None."""
+        self.assertImproperlyConfigured({"ENABLED": "yes"}, "ENABLED must be")
+
+    def test_unknown_hasher(self):
+        """Test that HASHER must name a hasher in PASSWORD_HASHERS."""
+        self.assertImproperlyConfigured({"HASHER": "nope"}, "HASHER 'nope'")
+
+    @override_settings(DEBUG=True)
+    def test_unknown_debug_hasher(self):
+        """Test that DEBUG_HASHER must name a hasher in PASSWORD_HASHERS."""
+        self.assertImproperlyConfigured({"DEBUG_HASHER": "nope"}, "DEBUG_HASHER 'nope'")
+
+    @override_settings(
+        DEBUG=False,
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.PBKDF2PasswordHasher"],
+        CREATE_INITIAL_SUPERUSER={"DEBUG_HASHER": "md5"},
+    )
+    def test_debug_hasher_ignored_without_debug(self):
+        """Test that an uninstalled DEBUG_HASHER is accepted with DEBUG off."""
+        self.assertIsNone(get_config().debug_hasher)
+
+        with self.settings(DEBUG=True):
+            with self.assertRaisesMessage(ImproperlyConfigured, "DEBUG_HASHER 'md5'"):
+                get_config()
+
+    def test_invalid_password_hash(self):
+        """Test that PASSWORD_HASH must be encoded by a configured hasher."""
+        self.assertImproperlyConfigured(
+            {"PASSWORD_HASH": "adminpass"}, "PASSWORD_HASH is not a password hash"
+        )
+
+    def test_unknown_cache_alias(self):
+        """Test that CACHE_ALIAS must be defined in CACHES."""
+        self.assertImproperlyConfigured(
+            {"CACHE_ALIAS": "missing"}, "CACHE_ALIAS 'missing'"
+        )
+
+    def test_invalid_cache_timeout(self):
+        """Test that CACHE_TIMEOUT must be positive."""
+        self.assertImproperlyConfigured({"CACHE_TIMEOUT": 0}, "CACHE_TIMEOUT")
+
+    def test_invalid_executor_options(self):
+        """Test that HASHING_EXECUTOR sizes are validated."""
+        self.assertImproperlyConfigured(
+            {"HASHING_EXECUTOR": {"MAX_WORKERS": 0}}, "MAX_WORKERS"
+        )
+        self.assertImproperlyConfigured(
+            {"HASHING_EXECUTOR": {"MAX_QUEUE": -1}}, "MAX_QUEUE"
+        )
+        self.assertImproperlyConfigured(
+            {"HASHING_EXECUTOR": {"WORKERS": 2}}, "unknown HASHING_EXECUTOR key(s)"
+        )
+
+    def test_invalid_throttle_options(self):
+        """Test that THROTTLE rates and sizes are validated."""
+        self.assertImproperlyConfigured({"THROTTLE": {"RATE": 0}}, "THROTTLE['RATE']")
+        self.assertImproperlyConfigured({"THROTTLE": {"BURST": 0}}, "THROTTLE['BURST']")
+        self.assertImproperlyConfigured(
+            {"THROTTLE": {"MAX_KEYS": 0}}, "THROTTLE['MAX_KEYS']"
+        )
+        self.assertImproperlyConfigured(
+            {"THROTTLE": {"LIMIT": 5}}, "unknown THROTTLE key(s)"
+        )
+        self.assertImproperlyConfigured(
+            {"THROTTLE": {"CLIENT_KEY": "tests.missing.client"}},
+            "cannot import THROTTLE['CLIENT_KEY']",
+        )
+        self.assertImproperlyConfigured(
+            {"THROTTLE": {"CLIENT_KEY": "tests.settings.SECRET_KEY"}},
+            "is not callable",
+        )
+
+    def test_logging_options(self):
+        """Test that LOGGING['QUEUE'] off stops the listener and is validated."""
+        event_log = get_config().event_log
+
+        with self.settings(
+            CREATE_INITIAL_SUPERUSER={"LOGGING": {"QUEUE": False, "WARNINGS": True}}
+        ):
+            config = get_config()
+            self.assertIsNone(config.event_log)
+            self.assertTrue(config.warnings)
+            self.assertIsNone(event_log.listener)
+
+        self.assertImproperlyConfigured({"LOGGING": True}, "LOGGING must be a dict")
+        self.assertImproperlyConfigured(
+            {"LOGGING": {"ASYNC": True}}, "unknown LOGGING key(s)"
+        )
+
+    def test_tenant_options(self):
+        """Test that TENANT_RESOLVER is imported and TENANT_STATE_SIZE validated."""
+        from tests.routers import tenant_database
+
+        with self.settings(
+            CREATE_INITIAL_SUPERUSER={
+                "TENANT_RESOLVER": "tests.routers.tenant_database",
+                "TENANT_STATE_SIZE": 8,
+            }
+        ):
+            self.assertIs(get_config().tenant_resolver, tenant_database)
+            self.assertEqual(get_config().tenant_state_size, 8)
+
+        self.assertImproperlyConfigured(
+            {"TENANT_RESOLVER": "tests.missing.resolve"},
+            "cannot import TENANT_RESOLVER",
+        )
+        self.assertImproperlyConfigured({"TENANT_STATE_SIZE": 0}, "TENANT_STATE_SIZE")
+
+    def test_unimportable_sink(self):
+        """Test that a bad SINK path fails when the config is built."""
+        self.assertImproperlyConfigured(
+            {"INSTRUMENTATION": {"SINK": "tests.missing.Sink"}},
+            "cannot import INSTRUMENTATION['SINK']",
+        )
+
+
+@override_settings(
+    DEBUG=True,
+    PASSWORD_HASHERS=[
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    ],
+)
+class BackendConfigTests(BootstrapTestCase):
+    """Test cases for the backend honouring the compiled config."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+
+    @override_settings(DEBUG=False, CREATE_INITIAL_SUPERUSER={"ENABLED": True})
+    def test_enabled_without_debug(self):
+        """Test that ENABLED=True creates the superuser with DEBUG off."""
+        user = self.backend.authenticate(None, username="admin", password="adminpass")
+
+        self.assertTrue(user.is_superuser)
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"ENABLED": False})
+    def test_disabled_with_debug(self):
+        """Test that ENABLED=False never creates a superuser."""
+        user = self.backend.authenticate(None, username="admin", password="adminpass")
+
+        self.assertIsNone(user)
+        self.assertFalse(self.User.objects.exists())
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"HASHER": "pbkdf2_sha1"})
+    def test_hasher(self):
+        """Test that the bootstrap password uses the configured hasher."""
+        user = self.backend.authenticate(None, username="admin", password="adminpass")
+
+        self.assertTrue(user.password.startswith("pbkdf2_sha1$"))
+        self.assertTrue(user.check_password("adminpass"))
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"EMAIL_FROM_USERNAME": False})
+    def test_email_from_username_disabled(self):
+        """Test that an email-like username is not copied when disabled."""
+        user = self.backend.authenticate(
+            None, username="admin@example.com", password="adminpass"
+        )
+
+        self.assertEqual(user.email, "")
+
+    @override_settings(
+        CREATE_INITIAL_SUPERUSER={"USER_DEFAULTS": {"first_name": "Admin"}}
+    )
+    def test_user_defaults(self):
+        """Test that USER_DEFAULTS are applied to the created superuser."""
+        user = self.backend.authenticate(None, username="admin", password="adminpass")
+
+        user.refresh_from_db()
+        self.assertEqual(user.first_name, "Admin")
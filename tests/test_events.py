@@ -0,0 +1,262 @@
+"""Tests for the structured bootstrap event log."""
+
+import logging
+import os
+import threading
+import unittest
+import warnings
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.events import QueuedEventLog, log_event
+from tests.base import BootstrapTestCase
+
+EVENTS = "create_initial_superuser.events"
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+class RecordingHandler(logging.Handler):
+    """Keep the records it handles and the threads it handled them on."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.append(threading.current_thread())
+
+
+class GateHandler(RecordingHandler):
+    """Block on every thread but ``caller`` until released."""
+
+    def __init__(self, caller):
+        super().__init__()
+        self.caller = caller
+        self.entered = threading.Event()
+        self.opened = threading.Event()
+
+    def handle(self, record):
+        # Wait before Handler.handle() takes the handler's lock, so that the
+        # caller can still write through this handler meanwhile.
+        if threading.current_thread() is not self.caller:
+            self.entered.set()
+            self.opened.wait(5)
+        return super().handle(record)
+
+
+class LogEventTests(SimpleTestCase):
+    """Test cases for log_event()."""
+
+    def test_fields_are_record_attributes(self):
+        """Test that the event and its fields are set on the record."""
+        with self.assertLogs(EVENTS, "INFO") as logs:
+            log_event(logging.INFO, "throttled", username="admin", address="10.0.0.1")
+
+        (record,) = logs.records
+        self.assertEqual(record.event, "throttled")
+        self.assertEqual(record.username, "admin")
+        self.assertEqual(record.address, "10.0.0.1")
+        self.assertEqual(
+            record.getMessage(),
+            "bootstrap throttled username='admin' address='10.0.0.1'",
+        )
+
+    def test_disabled_level_is_skipped(self):
+        """Test that events below the logger's level are not logged."""
+        with self.assertLogs(EVENTS, "INFO") as logs:
+            log_event(logging.DEBUG, "skipped", username="admin")
+            log_event(logging.INFO, "throttled", username="admin")
+
+        self.assertEqual([record.event for record in logs.records], ["throttled"])
+
+
+class QueuedEventLogTests(SimpleTestCase):
+    """Test cases for moving event output onto the listener thread."""
+
+    def setUp(self):
+        """Set up a parent and child logger with recording handlers."""
+        self.parent = logging.getLogger("tests.events")
+        self.child = logging.getLogger("tests.events.child")
+        self.parent_handler = RecordingHandler()
+        self.child_handler = RecordingHandler()
+        self.parent.addHandler(self.parent_handler)
+        self.child.addHandler(self.child_handler)
+        self.child.setLevel(logging.INFO)
+        # Keep the records out of the root logger's console output.
+        self.parent.propagate = False
+        self.addCleanup(setattr, self.parent, "propagate", True)
+        self.addCleanup(self.parent.removeHandler, self.parent_handler)
+        self.addCleanup(self.child.removeHandler, self.child_handler)
+        self.addCleanup(self.child.setLevel, logging.NOTSET)
+
+        self.event_log = QueuedEventLog(self.child)
+        self.event_log.start()
+        self.addCleanup(self.event_log.stop)
+
+    def test_handlers_run_on_listener_thread(self):
+        """Test that the logger's and its parents' handlers run on the listener."""
+        self.child.info("bootstrap %s", "created")
+        self.event_log.stop()
+
+        for handler in (self.child_handler, self.parent_handler):
+            (record,) = handler.records
+            self.assertEqual(record.getMessage(), "bootstrap created")
+            self.assertIsNot(handler.threads[0], threading.current_thread())
+
+    def test_stop_restores_logger(self):
+        """Test that stopping puts the handlers back and propagation on."""
+        self.assertFalse(self.child.propagate)
+        self.assertEqual(self.child.handlers, [self.event_log.handler])
+
+        self.event_log.stop()
+
+        self.assertTrue(self.child.propagate)
+        self.assertEqual(self.child.handlers, [self.child_handler])
+        self.assertIsNone(self.event_log.listener)
+
+    def test_listener_starts_on_first_record(self):
+        """Test that no thread is started until the process logs an event."""
+        self.assertIsNone(self.event_log.listener)
+
+        self.child.info("bootstrap %s", "created")
+
+        self.assertTrue(self.event_log.listener._thread.is_alive())
+
+    def test_full_queue_writes_on_calling_thread(self):
+        """Test that a record finding the queue full is written by the caller."""
+        self.event_log.stop()
+        gate = GateHandler(threading.current_thread())
+        self.child.addHandler(gate)
+        self.addCleanup(self.child.removeHandler, gate)
+        event_log = QueuedEventLog(self.child, maxsize=1)
+        event_log.start()
+        self.addCleanup(event_log.stop)
+        self.addCleanup(gate.opened.set)
+
+        self.child.info("bootstrap %s", "taken")
+        self.assertTrue(gate.entered.wait(5))
+        self.child.info("bootstrap %s", "queued")
+        self.child.info("bootstrap %s", "overflow")
+
+        self.assertEqual([r.getMessage() for r in gate.records], ["bootstrap overflow"])
+        self.assertEqual(gate.threads, [threading.current_thread()])
+
+        gate.opened.set()
+        event_log.stop()
+        self.assertEqual(
+            [r.getMessage() for r in gate.records],
+            ["bootstrap overflow", "bootstrap taken", "bootstrap queued"],
+        )
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork()")
+    def test_forked_child_writes_its_events(self):
+        """Test that a forked worker starts its own listener instead of queueing forever."""
+        self.child.info("bootstrap %s", "parent")
+
+        with warnings.catch_warnings():
+            # Python 3.12+ warns about forking a process with threads.
+            warnings.simplefilter("ignore", DeprecationWarning)
+            pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                self.child.info("bootstrap %s", "child")
+                thread = self.event_log.listener._thread
+                self.event_log.stop()
+                record = self.child_handler.records[-1]
+                if (
+                    record.getMessage() == "bootstrap child"
+                    and self.child_handler.threads[-1] is thread
+                    and self.event_log.queue.empty()
+                ):
+                    code = 0
+            finally:
+                os._exit(code)
+
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+    def test_listener_restarted_without_fork_hook(self):
+        """Test that a process change is noticed even if no at-fork hook ran."""
+        self.child.info("bootstrap %s", "before")
+        first = self.event_log.listener
+
+        # As in a child forked without running the hook.
+        self.event_log._pid = -1
+        self.child.info("bootstrap %s", "after")
+
+        self.assertIsNot(self.event_log.listener, first)
+        self.event_log.stop()
+        first.stop()
+        self.assertEqual(
+            sorted(r.getMessage() for r in self.child_handler.records),
+            ["bootstrap after", "bootstrap before"],
+        )
+
+
+@override_settings(DEBUG=True, PASSWORD_HASHERS=FAST_HASHERS)
+class BackendEventTests(BootstrapTestCase):
+    """Test cases for the events logged by the backend."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+
+    def test_skipped_and_fell_back(self):
+        """Test that a login with a superuser present logs skipped then fell_back."""
+        self.User.objects.create_superuser(username="admin", password="adminpass")
+
+        with self.assertLogs(EVENTS, "DEBUG") as logs:
+            user = self.backend.authenticate(
+                None, username="admin", password="wrongpass"
+            )
+
+        self.assertIsNone(user)
+        skipped, fell_back = logs.records
+        self.assertEqual(skipped.event, "skipped")
+        self.assertFalse(skipped.lost_race)
+        self.assertEqual(fell_back.event, "fell_back")
+        self.assertEqual(fell_back.levelno, logging.DEBUG)
+        self.assertFalse(fell_back.authenticated)
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"THROTTLE": {"RATE": 1.0, "BURST": 1}})
+    def test_throttled(self):
+        """Test that a throttled attempt is logged with the client's key."""
+        request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.1")
+        self.User.objects.create_superuser(username="admin", password="adminpass")
+        self.backend.authenticate(request, username="admin", password="adminpass")
+
+        with self.assertLogs(EVENTS, "INFO") as logs:
+            self.backend.authenticate(request, username="admin", password="adminpass")
+
+        (record,) = logs.records
+        self.assertEqual(record.event, "throttled")
+        self.assertEqual(record.client, "10.0.0.1")
+
+    def test_no_warning_by_default(self):
+        """Test that the creation is logged but not warned about by default."""
+        with warnings.catch_warnings(record=True) as warning_list:
+            warnings.simplefilter("always")
+            with self.assertLogs(EVENTS, "WARNING"):
+                self.backend.authenticate(None, username="admin", password="adminpass")
+
+        self.assertEqual(warning_list, [])
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"LOGGING": {"WARNINGS": True}})
+    def test_warnings_compatibility(self):
+        """Test that LOGGING['WARNINGS'] brings back the UserWarning."""
+        with warnings.catch_warnings(record=True) as warning_list:
+            warnings.simplefilter("always")
+            self.backend.authenticate(None, username="admin", password="adminpass")
+
+        (warning,) = warning_list
+        self.assertIs(warning.category, UserWarning)
+        self.assertIn("No superusers exist", str(warning.message))
+        self.assertIn("admin", str(warning.message))
+        self.assertEqual(warning.filename, __file__)
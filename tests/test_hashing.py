@@ -0,0 +1,318 @@
+"""Tests for the bounded password hashing executor."""
+
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import SimpleTestCase, override_settings
+
+from asgiref.sync import sync_to_async
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.hashing import (
+    HashingExecutor,
+    HashingExecutorSaturated,
+    get_hashing_executor,
+    validate_password_hash,
+)
+from tests.base import BootstrapTestCase
+
+# Seconds to wait for the pool threads before failing instead of hanging.
+WAIT_TIMEOUT = 5
+
+
+def wait_until(test, predicate):
+    """Spin until ``predicate()`` is true, failing ``test`` after a timeout."""
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not predicate():
+        if time.monotonic() > deadline:
+            test.fail(f"timed out after {WAIT_TIMEOUT}s waiting for the executor")
+        time.sleep(0.001)
+
+
+class HashingExecutorTests(SimpleTestCase):
+    """Test cases for HashingExecutor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.executor = HashingExecutor(max_workers=1, max_queue=1)
+        self.addCleanup(self.executor.shutdown)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def _occupy(self, count):
+        """
+        Start ``count`` blocking tasks from background threads.
+
+        Returns once the first task is running on the only worker and the
+        others have been queued behind it.
+        """
+        started = threading.Event()
+
+        def block():
+            started.set()
+            self.release.wait()
+
+        threads = [
+            threading.Thread(target=self.executor.run, args=(block,))
+            for _ in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+
+        def release_and_join():
+            self.release.set()
+            for thread in threads:
+                thread.join()
+
+        self.addCleanup(release_and_join)
+        self.assertTrue(started.wait(WAIT_TIMEOUT), "the first task never started")
+        wait_until(self, lambda: self.executor.stats()["submitted"] == count)
+
+    def test_run_returns_result(self):
+        """Test that run() returns the function result."""
+        self.assertEqual(self.executor.run(pow, 2, 10), 1024)
+
+        stats = self.executor.stats()
+        self.assertEqual(stats["submitted"], 1)
+        self.assertEqual(stats["completed"], 1)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_run_propagates_exceptions(self):
+        """Test that exceptions raised by the task reach the caller."""
+        with self.assertRaises(ZeroDivisionError):
+            self.executor.run(divmod, 1, 0)
+
+    def test_saturated_executor_fails_fast(self):
+        """Test that callers beyond workers plus queue are rejected."""
+        self._occupy(2)
+
+        with self.assertRaises(HashingExecutorSaturated):
+            self.executor.run(pow, 2, 10)
+
+        stats = self.executor.stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["queue_depth"], 1)
+
+    def test_slots_are_released(self):
+        """Test that finished work frees capacity again."""
+        self._occupy(2)
+        self.release.set()
+
+        wait_until(self, lambda: self.executor.stats()["completed"] == 2)
+
+        self.assertEqual(self.executor.run(pow, 2, 3), 8)
+        self.assertGreater(self.executor.stats()["wait_time_total"], 0)
+
+    def test_timeout(self):
+        """Test that a slow hash raises HashingExecutorSaturated."""
+        executor = HashingExecutor(max_workers=1, max_queue=0, timeout=0.01)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(self.release.set)
+
+        with self.assertRaises(HashingExecutorSaturated):
+            executor.run(self.release.wait)
+
+        self.assertEqual(executor.stats()["timed_out"], 1)
+
+
+class GetHashingExecutorTests(SimpleTestCase):
+    """Test cases for get_hashing_executor."""
+
+    def test_disabled_by_default(self):
+        """Test that hashing runs inline unless configured."""
+        self.assertIsNone(get_hashing_executor())
+
+    @override_settings(
+        CREATE_INITIAL_SUPERUSER={
+            "HASHING_EXECUTOR": {"MAX_WORKERS": 2, "MAX_QUEUE": 3, "TIMEOUT": 5}
+        }
+    )
+    def test_configured_executor(self):
+        """Test that the executor is built from settings and reused."""
+        executor = get_hashing_executor()
+
+        self.assertEqual(executor.max_workers, 2)
+        self.assertEqual(executor.max_queue, 3)
+        self.assertEqual(executor.timeout, 5)
+        self.assertIs(get_hashing_executor(), executor)
+
+
+@override_settings(
+    PASSWORD_HASHERS=[
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    ]
+)
+class ValidatePasswordHashTests(SimpleTestCase):
+    """Test cases for validate_password_hash."""
+
+    def test_valid_hash(self):
+        """Test that hashes from configured hashers are accepted."""
+        encoded = make_password("secret", hasher="pbkdf2_sha1")
+
+        self.assertEqual(validate_password_hash(encoded), "pbkdf2_sha1")
+
+    def test_invalid_hashes(self):
+        """Test that plain text, unusable, truncated and foreign hashes fail."""
+        for encoded in [
+            "secret",
+            make_password(None),
+            "pbkdf2_sha1$abc",
+            "bcrypt$$2b$12$abcdefghijklmnopqrstuv",
+        ]:
+            with self.subTest(encoded=encoded):
+                with self.assertRaises(ValueError):
+                    validate_password_hash(encoded)
+
+
+@override_settings(
+    CREATE_INITIAL_SUPERUSER={"HASHING_EXECUTOR": {"MAX_WORKERS": 1, "MAX_QUEUE": 0}},
+    PASSWORD_HASHERS=[
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    ],
+)
+class BackendHashingExecutorTests(BootstrapTestCase):
+    """Test cases for the backend running its hashing on the executor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+        self.executor = get_hashing_executor()
+
+    def _saturate(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        thread = threading.Thread(target=self.executor.run, args=(block,))
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        self.assertTrue(started.wait(WAIT_TIMEOUT), "the blocking task never started")
+
+    @override_settings(DEBUG=True)
+    def test_bootstrap_hashes_on_executor(self):
+        """Test that the initial superuser password is hashed on the pool."""
+        before = self.executor.stats()["completed"]
+
+        user = self.backend.authenticate(None, username="admin", password="adminpass")
+
+        self.assertTrue(user.is_superuser)
+        self.assertTrue(user.check_password("adminpass"))
+        self.assertEqual(self.executor.stats()["completed"], before + 1)
+
+    @override_settings(DEBUG=True)
+    def test_saturated_bootstrap_returns_none(self):
+        """Test that a saturated pool rejects the login without creating a user."""
+        self._saturate()
+
+        with self.assertLogs("create_initial_superuser.events", "WARNING") as logs:
+            user = self.backend.authenticate(
+                None, username="admin", password="adminpass"
+            )
+
+        self.assertIsNone(user)
+        self.assertFalse(self.User.objects.exists())
+        self.assertEqual([record.event for record in logs.records], ["rejected"])
+
+    def test_fallback_checks_password_on_executor(self):
+        """Test that the ModelBackend fallback verifies passwords on the pool."""
+        regular = self.User.objects.create_user(
+            username="regular", password="regularpass"
+        )
+        before = self.executor.stats()["completed"]
+
+        user = self.backend.authenticate(
+            None, username="regular", password="regularpass"
+        )
+        wrong = self.backend.authenticate(
+            None, username="regular", password="wrongpass"
+        )
+        unknown = self.backend.authenticate(
+            None, username="unknown", password="regularpass"
+        )
+
+        self.assertEqual(user, regular)
+        self.assertIsNone(wrong)
+        self.assertIsNone(unknown)
+        self.assertEqual(self.executor.stats()["completed"], before + 3)
+
+    def test_fallback_rejects_inactive_users(self):
+        """Test that inactive users are rejected like ModelBackend does."""
+        self.User.objects.create_user(
+            username="regular", password="regularpass", is_active=False
+        )
+
+        self.assertIsNone(
+            self.backend.authenticate(None, username="regular", password="regularpass")
+        )
+
+    def test_fallback_upgrades_password_hash(self):
+        """Test that outdated hashes are upgraded on successful login."""
+        regular = self.User.objects.create_user(username="regular")
+        regular.password = make_password("regularpass", hasher="pbkdf2_sha1")
+        regular.save()
+
+        self.backend.authenticate(None, username="regular", password="regularpass")
+
+        regular.refresh_from_db()
+        self.assertTrue(regular.password.startswith("md5$"))
+
+    def test_saturated_fallback_returns_none(self):
+        """Test that a saturated pool rejects fallback logins."""
+        self.User.objects.create_user(username="regular", password="regularpass")
+        self._saturate()
+
+        self.assertIsNone(
+            self.backend.authenticate(None, username="regular", password="regularpass")
+        )
+
+    async def test_async_fallback_checks_password_on_executor(self):
+        """Test that the async fallback verifies passwords on the pool too."""
+        await sync_to_async(self.User.objects.create_user)(
+            username="regular", password="regularpass"
+        )
+        before = self.executor.stats()["completed"]
+
+        user = await self.backend.aauthenticate(
+            None, username="regular", password="regularpass"
+        )
+
+        self.assertEqual(user.username, "regular")
+        self.assertEqual(self.executor.stats()["completed"], before + 1)
+
+    async def test_async_saturated_fallback_returns_none(self):
+        """Test that a saturated pool rejects async fallback logins."""
+        await sync_to_async(self.User.objects.create_user)(
+            username="regular", password="regularpass"
+        )
+        self._saturate()
+
+        with self.assertLogs("create_initial_superuser.events", "WARNING") as logs:
+            user = await self.backend.aauthenticate(
+                None, username="regular", password="regularpass"
+            )
+
+        self.assertIsNone(user)
+        self.assertEqual([record.event for record in logs.records], ["rejected"])
+
+    @override_settings(DEBUG=True)
+    async def test_async_saturated_bootstrap_returns_none(self):
+        """Test that a saturated pool rejects the async bootstrap login."""
+        self._saturate()
+
+        with self.assertLogs("create_initial_superuser.events", "WARNING"):
+            user = await self.backend.aauthenticate(
+                None, username="admin", password="adminpass"
+            )
+
+        self.assertIsNone(user)
+        self.assertFalse(await self.User.objects.aexists())
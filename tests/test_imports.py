@@ -0,0 +1,97 @@
+"""Import-time regression tests for the authentication backend."""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+from django.test import SimpleTestCase
+
+from create_initial_superuser import backends
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MARKER = "-- importing create_initial_superuser.backends --"
+
+# Sets up a minimal project, then imports the backend with get_user_model()
+# rigged to fail, after printing MARKER so that -X importtime lines for the
+# backend import can be told apart from Django's start-up.
+SCRIPT = textwrap.dedent(f"""
+    import sys
+
+    import django
+    from django.conf import settings
+
+    settings.configure(
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "create_initial_superuser",
+        ],
+        DATABASES={{
+            "default": {{"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+        }},
+    )
+    django.setup()
+
+    # ModelBackend resolves its own user model at import time.
+    import django.contrib.auth
+    import django.contrib.auth.backends
+
+    def get_user_model():
+        raise AssertionError("get_user_model() called at import time")
+
+    django.contrib.auth.get_user_model = get_user_model
+
+    sys.stderr.write({MARKER!r} + "\\n")
+    sys.stderr.flush()
+    import create_initial_superuser.backends
+    """)
+
+
+class BackendImportTests(SimpleTestCase):
+    """Test cases for what importing the backend costs."""
+
+    def import_backend(self):
+        """Import the backend in a fresh interpreter and return the modules it loads."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SCRIPT],
+            cwd=PROJECT_DIR,
+            env={**os.environ, "PYTHONPATH": PROJECT_DIR},
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        modules = set()
+        for line in result.stderr.split(MARKER, 1)[1].splitlines():
+            # "import time: <self us> | <cumulative us> | <indented name>"
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            name = line.rsplit("|", 1)[1].strip()
+            modules.add(name)
+            # The backend's own line comes after everything it imported.
+            if name == "create_initial_superuser.backends":
+                return modules
+        self.fail(f"No import time reported for the backend:\n{result.stderr}")
+
+    def test_import_is_light(self):
+        """Test that importing the backend loads nothing outside this package."""
+        modules = self.import_backend()
+
+        # Only the modules of this package, plus the stdlib's tiny
+        # __future__ module for postponed annotations.
+        self.assertEqual(
+            sorted(
+                m
+                for m in modules
+                if not m.startswith("create_initial_superuser.") and m != "__future__"
+            ),
+            [],
+        )
+
+    def test_no_module_level_user_model(self):
+        """Test that the user model and typing-only names are not bound at import."""
+        for name in ("User", "AbstractUser", "HttpRequest", "QuerySet"):
+            self.assertFalse(hasattr(backends, name), name)
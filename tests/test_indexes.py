@@ -0,0 +1,94 @@
+"""Tests for the optional partial index on superuser rows."""
+
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import NotSupportedError, connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.indexes import (
+    SUPERUSER_INDEX_NAME,
+    install_superuser_index,
+    remove_superuser_index,
+    superuser_index_exists,
+)
+from tests.base import LatchResetMixin
+
+
+class SuperuserIndexTests(LatchResetMixin, TransactionTestCase):
+    """Test cases for installing the index and the query plan it enables."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.addCleanup(remove_superuser_index)
+
+    def existence_check_plan(self):
+        """Return the query plan of the backend's superuser existence check."""
+        backend = CreateInitialSuperUserBackend()
+        with CaptureQueriesContext(connection) as queries:
+            backend._superuser_exists(self.User)
+        (query,) = queries.captured_queries
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {query['sql']}")
+            return " ".join(str(column) for row in cursor.fetchall() for column in row)
+
+    def test_existence_check_uses_index(self):
+        """Test that the existence check reads the index instead of the table."""
+        self.assertNotIn(SUPERUSER_INDEX_NAME, self.existence_check_plan())
+
+        self.assertTrue(install_superuser_index())
+
+        self.assertIn(SUPERUSER_INDEX_NAME, self.existence_check_plan())
+
+    def test_install_and_remove_are_idempotent(self):
+        """Test that repeated installs and removals are no-ops."""
+        self.assertTrue(install_superuser_index())
+        self.assertFalse(install_superuser_index())
+        self.assertTrue(superuser_index_exists())
+
+        self.assertTrue(remove_superuser_index())
+        self.assertFalse(remove_superuser_index())
+        self.assertFalse(superuser_index_exists())
+
+    def test_unsupported_database(self):
+        """Test that databases without partial indexes are refused."""
+        with mock.patch.object(connection.features, "supports_partial_indexes", False):
+            with self.assertRaisesMessage(NotSupportedError, "partial indexes"):
+                install_superuser_index()
+
+        with self.assertRaisesMessage(
+            NotSupportedError, "only supported on PostgreSQL"
+        ):
+            install_superuser_index(concurrently=True)
+        self.assertFalse(superuser_index_exists())
+
+    def test_command(self):
+        """Test that the command creates, reports and drops the index."""
+        stdout = StringIO()
+
+        call_command("install_superuser_index", stdout=stdout)
+        call_command("install_superuser_index", stdout=stdout)
+        self.assertTrue(superuser_index_exists())
+        call_command("install_superuser_index", "--remove", stdout=stdout)
+
+        self.assertFalse(superuser_index_exists())
+        self.assertEqual(
+            stdout.getvalue().splitlines(),
+            [
+                f"Created index {SUPERUSER_INDEX_NAME}.",
+                f"Already present: index {SUPERUSER_INDEX_NAME}.",
+                f"Dropped index {SUPERUSER_INDEX_NAME}.",
+            ],
+        )
+
+    def test_command_unsupported(self):
+        """Test that an unsupported request surfaces as a CommandError."""
+        with self.assertRaisesMessage(CommandError, "only supported on PostgreSQL"):
+            call_command("install_superuser_index", "--concurrently")
@@ -0,0 +1,141 @@
+"""Tests for the authentication stage instrumentation."""
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.instrumentation import (
+    InMemoryAggregator,
+    default_aggregator,
+    get_sink,
+)
+from create_initial_superuser.state import superuser_latch
+from tests.base import BootstrapTestCase
+
+
+class RecordingSink:
+    """Sink that keeps every call, used to test custom sink loading."""
+
+    def __init__(self):
+        self.calls = []
+
+    def record_stage(self, stage, seconds):
+        self.calls.append(("stage", stage))
+
+    def record_outcome(self, outcome):
+        self.calls.append(("outcome", outcome))
+
+
+class InMemoryAggregatorTests(SimpleTestCase):
+    """Test cases for InMemoryAggregator."""
+
+    def test_snapshot(self):
+        """Test that stages and outcomes are aggregated."""
+        aggregator = InMemoryAggregator()
+
+        aggregator.record_stage("hash", 0.5)
+        aggregator.record_stage("hash", 0.25)
+        aggregator.record_outcome("created")
+        aggregator.record_outcome("created")
+
+        self.assertEqual(
+            aggregator.snapshot(),
+            {
+                "stages": {"hash": {"count": 2, "total": 0.75, "max": 0.5}},
+                "outcomes": {"created": 2},
+            },
+        )
+
+    def test_reset(self):
+        """Test that reset() clears everything."""
+        aggregator = InMemoryAggregator()
+        aggregator.record_stage("hash", 0.5)
+        aggregator.record_outcome("created")
+
+        aggregator.reset()
+
+        self.assertEqual(aggregator.snapshot(), {"stages": {}, "outcomes": {}})
+
+
+class GetSinkTests(SimpleTestCase):
+    """Test cases for get_sink."""
+
+    def test_disabled_by_default(self):
+        """Test that instrumentation is off unless configured."""
+        self.assertIsNone(get_sink())
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"INSTRUMENTATION": {"ENABLED": False}})
+    def test_explicitly_disabled(self):
+        """Test that ENABLED=False turns instrumentation off."""
+        self.assertIsNone(get_sink())
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"INSTRUMENTATION": {"ENABLED": True}})
+    def test_default_sink(self):
+        """Test that the in-memory aggregator is the default sink."""
+        self.assertIs(get_sink(), default_aggregator)
+
+    @override_settings(
+        CREATE_INITIAL_SUPERUSER={
+            "INSTRUMENTATION": {"SINK": "tests.test_instrumentation.RecordingSink"}
+        }
+    )
+    def test_custom_sink(self):
+        """Test that a custom sink class is loaded once and reused."""
+        sink = get_sink()
+
+        self.assertIsInstance(sink, RecordingSink)
+        self.assertIs(get_sink(), sink)
+
+
+@override_settings(
+    DEBUG=True,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    CREATE_INITIAL_SUPERUSER={"INSTRUMENTATION": {"ENABLED": True}},
+)
+class BackendInstrumentationTests(BootstrapTestCase):
+    """Test cases for the stages and outcomes reported by the backend."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        default_aggregator.reset()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+
+    def test_bootstrap_login(self):
+        """Test the stages recorded when the initial superuser is created."""
+        self.backend.authenticate(None, username="admin", password="adminpass")
+
+        snapshot = default_aggregator.snapshot()
+        self.assertEqual(set(snapshot["stages"]), {"exists", "hash", "insert"})
+        self.assertEqual(snapshot["outcomes"], {"exists_query": 1, "created": 1})
+
+    def test_steady_state_login(self):
+        """Test the stages recorded for a latched login."""
+        self.User.objects.create_user(username="regular", password="regularpass")
+        superuser_latch.set()
+
+        self.backend.authenticate(None, username="regular", password="regularpass")
+
+        snapshot = default_aggregator.snapshot()
+        self.assertEqual(set(snapshot["stages"]), {"fallback"})
+        self.assertEqual(snapshot["outcomes"], {"latch_hit": 1, "fell_back": 1})
+
+    def test_lost_race(self):
+        """Test that finding a superuser under the lock counts as a lost race."""
+        self.User.objects.create_user(
+            username="admin", password="adminpass", is_superuser=True
+        )
+
+        self.backend._create_initial_superuser(self.User, "other", "otherpass")
+
+        self.assertEqual(default_aggregator.snapshot()["outcomes"], {"lost_race": 1})
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={})
+    def test_disabled_records_nothing(self):
+        """Test that nothing is recorded when instrumentation is disabled."""
+        superuser_latch.set()
+
+        self.backend.authenticate(None, username="regular", password="regularpass")
+
+        self.assertEqual(default_aggregator.snapshot(), {"stages": {}, "outcomes": {}})
@@ -0,0 +1,213 @@
+"""Tests for the Prometheus metrics sink and view."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.instrumentation import get_sink
+from create_initial_superuser.metrics import PrometheusSink
+from tests.base import BootstrapTestCase
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# Records one created login and a 10 ms hash, as a preforked worker would.
+WORKER = textwrap.dedent("""
+    from create_initial_superuser.metrics import PrometheusSink
+
+    sink = PrometheusSink()
+    sink.record_outcome("created")
+    sink.record_stage("hash", 0.01)
+    """)
+
+
+def run_worker(directory):
+    """Run WORKER in a fresh interpreter writing to ``directory``."""
+    subprocess.run(
+        [sys.executable, "-c", WORKER],
+        cwd=PROJECT_DIR,
+        env={
+            **os.environ,
+            "PYTHONPATH": PROJECT_DIR,
+            "PROMETHEUS_MULTIPROC_DIR": directory,
+        },
+        check=True,
+        timeout=60,
+    )
+
+
+def sample(name, registry=REGISTRY, **labels):
+    """Return the current value of a sample, 0 if it has not been recorded."""
+    return registry.get_sample_value(name, labels) or 0
+
+
+class PrometheusSinkTests(SimpleTestCase):
+    """Test cases for recording into the Prometheus metrics."""
+
+    def test_outcomes(self):
+        """Test that each outcome increments its counter."""
+        sink = PrometheusSink()
+        before = {
+            "created": sample(
+                "create_initial_superuser_authenticate_total", outcome="created"
+            ),
+            "creations": sample(
+                "create_initial_superuser_creations_total", result="created"
+            ),
+            "miss": sample(
+                "create_initial_superuser_exists_checks_total", result="miss"
+            ),
+            "latch": sample(
+                "create_initial_superuser_exists_checks_total", result="latch_hit"
+            ),
+        }
+
+        sink.record_outcome("created")
+        sink.record_outcome("exists_query")
+        sink.record_outcome("latch_hit")
+        sink.record_outcome("latch_hit")
+
+        self.assertEqual(
+            sample("create_initial_superuser_authenticate_total", outcome="created"),
+            before["created"] + 1,
+        )
+        self.assertEqual(
+            sample("create_initial_superuser_creations_total", result="created"),
+            before["creations"] + 1,
+        )
+        self.assertEqual(
+            sample("create_initial_superuser_exists_checks_total", result="miss"),
+            before["miss"] + 1,
+        )
+        self.assertEqual(
+            sample("create_initial_superuser_exists_checks_total", result="latch_hit"),
+            before["latch"] + 2,
+        )
+
+    def test_stage_histogram(self):
+        """Test that stage durations land in the histogram buckets."""
+        sink = PrometheusSink()
+        count = sample("create_initial_superuser_stage_seconds_count", stage="insert")
+        fast = sample(
+            "create_initial_superuser_stage_seconds_bucket", stage="insert", le="0.005"
+        )
+
+        sink.record_stage("insert", 0.002)
+        sink.record_stage("insert", 0.2)
+
+        self.assertEqual(
+            sample("create_initial_superuser_stage_seconds_count", stage="insert"),
+            count + 2,
+        )
+        self.assertEqual(
+            sample(
+                "create_initial_superuser_stage_seconds_bucket",
+                stage="insert",
+                le="0.005",
+            ),
+            fast + 1,
+        )
+
+    def test_multiprocess(self):
+        """Test that values written by separate worker processes are summed."""
+        with tempfile.TemporaryDirectory() as directory:
+            for _ in range(2):
+                run_worker(directory)
+
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry, path=directory)
+
+            self.assertEqual(
+                sample(
+                    "create_initial_superuser_authenticate_total",
+                    registry,
+                    outcome="created",
+                ),
+                2,
+            )
+            self.assertEqual(
+                sample(
+                    "create_initial_superuser_stage_seconds_count",
+                    registry,
+                    stage="hash",
+                ),
+                2,
+            )
+
+
+@override_settings(
+    DEBUG=True,
+    PASSWORD_HASHERS=FAST_HASHERS,
+    CREATE_INITIAL_SUPERUSER={
+        "INSTRUMENTATION": {"SINK": "create_initial_superuser.metrics.PrometheusSink"}
+    },
+)
+class MetricsViewTests(BootstrapTestCase):
+    """Test cases for the metrics exposition view."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+
+    def test_login_is_exposed(self):
+        """Test that a creating login shows up in the scraped metrics."""
+        created = sample("create_initial_superuser_creations_total", result="created")
+        with self.assertLogs("create_initial_superuser.events", "WARNING"):
+            user = CreateInitialSuperUserBackend().authenticate(
+                None, username="admin", password="adminpass"
+            )
+        self.assertTrue(user.is_superuser)
+
+        response = self.client.get("/bootstrap/metrics/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            f'create_initial_superuser_creations_total{{result="created"}} '
+            f"{created + 1}",
+            response.content.decode(),
+        )
+        self.assertIn(
+            'create_initial_superuser_stage_seconds_count{stage="hash"}',
+            response.content.decode(),
+        )
+
+    def test_get_only(self):
+        """Test that the view only answers GET and HEAD."""
+        with self.assertLogs("django.request", "WARNING"):
+            response = self.client.post("/bootstrap/metrics/")
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_multiprocess_registry(self):
+        """Test that the view aggregates the multiprocess directory when set."""
+        with tempfile.TemporaryDirectory() as directory:
+            run_worker(directory)
+            with mock.patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": directory}):
+                response = self.client.get("/bootstrap/metrics/")
+
+        self.assertIn(
+            'create_initial_superuser_authenticate_total{outcome="created"} 1.0',
+            response.content.decode(),
+        )
+        self.assertNotIn("python_gc_objects_collected_total", response.content.decode())
+
+    def test_reversible(self):
+        """Test that the URL pattern is namespaced."""
+        self.assertEqual(
+            reverse("create_initial_superuser:metrics"), "/bootstrap/metrics/"
+        )
+
+    def test_sink_is_selected(self):
+        """Test that the sink path in the settings builds a PrometheusSink."""
+        self.assertIsInstance(get_sink(), PrometheusSink)
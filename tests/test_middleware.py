@@ -0,0 +1,104 @@
+"""Tests for the first-run middleware."""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from create_initial_superuser.middleware import FIRST_RUN_MESSAGE, FirstRunMiddleware
+from create_initial_superuser.state import superuser_latch
+from tests.base import BootstrapTestCase
+
+FIRST_RUN_MIDDLEWARE = "create_initial_superuser.middleware.FirstRunMiddleware"
+
+
+def ok(request):
+    return HttpResponse("ok")
+
+
+@override_settings(
+    DEBUG=True,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    MIDDLEWARE=[*settings.MIDDLEWARE, FIRST_RUN_MIDDLEWARE],
+)
+class FirstRunMiddlewareTests(BootstrapTestCase):
+    """Test cases for FirstRunMiddleware."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.factory = RequestFactory()
+
+    def test_not_used_when_superuser_exists(self):
+        """Test that the middleware removes itself at startup after bootstrap."""
+        self.User.objects.create_superuser(username="admin", password="adminpass")
+        superuser_latch.reset()
+
+        with self.assertRaises(MiddlewareNotUsed):
+            FirstRunMiddleware(ok)
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"ENABLED": False})
+    def test_not_used_when_disabled(self):
+        """Test that nothing is redirected when first-login creation is off."""
+        with self.assertRaises(MiddlewareNotUsed):
+            FirstRunMiddleware(ok)
+
+    def test_redirects_to_login_with_banner(self):
+        """Test that pages redirect to the admin login, which shows the banner."""
+        response = self.client.get("/home/?page=2")
+
+        self.assertRedirects(
+            response,
+            "/admin/login/?next=%2Fhome%2F%3Fpage%3D2",
+            fetch_redirect_response=False,
+        )
+        login_page = self.client.get(response.url)
+        self.assertContains(login_page, FIRST_RUN_MESSAGE)
+
+    def test_exempt_requests(self):
+        """Test that the login page, static files and POSTs pass through."""
+        middleware = FirstRunMiddleware(ok)
+
+        for request in (
+            self.factory.get("/admin/login/"),
+            self.factory.get("/static/admin/css/base.css"),
+            self.factory.post("/home/"),
+        ):
+            self.assertEqual(middleware(request).status_code, 200, request)
+
+    def test_disables_itself_after_first_login(self):
+        """Test that logging in as the first superuser ends the first run."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/admin/login/", {"username": "admin", "password": "adminpass"}
+            )
+
+        response = self.client.get("/home/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.User.objects.filter(is_superuser=True).exists())
+
+    def test_superuser_created_elsewhere(self):
+        """Test that a superuser created by another process is noticed."""
+        middleware = FirstRunMiddleware(ok)
+        self.User.objects.create_superuser(username="admin", password="adminpass")
+        superuser_latch.reset()
+
+        response = middleware(self.factory.get("/home/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(middleware.done)
+
+    def test_no_queries_once_done(self):
+        """Test that requests after bootstrap cost no database work."""
+        middleware = FirstRunMiddleware(ok)
+        superuser_latch.set()
+        middleware(self.factory.get("/home/"))
+        superuser_latch.reset()
+
+        with self.assertNumQueries(0):
+            response = middleware(self.factory.get("/home/"))
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,198 @@
+"""Tests for router-aware, multi-database superuser bootstrap."""
+
+import os
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.cache import (
+    get_superuser_exists,
+    invalidate_superuser_exists,
+    set_superuser_exists,
+)
+from create_initial_superuser.seeding import build_users, seed_users
+from create_initial_superuser.state import superuser_latch
+from tests.base import BootstrapTestCase
+
+
+@override_settings(
+    DEBUG=True,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class RouterTestCase(BootstrapTestCase):
+    """Base class for tests that span both database aliases."""
+
+    databases = {"default", "other"}
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+
+    def login(self, username="admin", password="adminpass"):
+        """Authenticate, capturing the queries sent to each alias."""
+        with CaptureQueriesContext(
+            connections["default"]
+        ) as default, CaptureQueriesContext(connections["other"]) as other:
+            user = self.backend.authenticate(None, username=username, password=password)
+        return user, default, other
+
+
+@override_settings(DATABASE_ROUTERS=["tests.routers.OtherDatabaseRouter"])
+class OtherDatabaseRouterTests(RouterTestCase):
+    """Test cases for a router that moves users to another database."""
+
+    def test_bootstrap_uses_routed_database(self):
+        """Test that the check and the creation both go to the routed alias."""
+        user, default, other = self.login()
+
+        self.assertEqual(user._state.db, "other")
+        self.assertTrue(self.User.objects.using("other").get().is_superuser)
+        self.assertFalse(self.User.objects.using("default").exists())
+        self.assertEqual(len(default), 0)
+        self.assertGreater(len(other), 0)
+
+    def test_latch_is_per_database(self):
+        """Test that a latch for one alias does not answer for another."""
+        superuser_latch.set("default")
+
+        with self.captureOnCommitCallbacks(using="other", execute=True):
+            user, _, _ = self.login()
+
+        self.assertTrue(user.is_superuser)
+        self.assertTrue(superuser_latch.is_set("other"))
+
+    def test_fallback_uses_routed_database(self):
+        """Test that later logins authenticate against the routed alias."""
+        self.login()
+
+        user, default, _ = self.login()
+
+        self.assertEqual(user._state.db, "other")
+        self.assertEqual(len(default), 0)
+
+    def test_command_uses_routed_database(self):
+        """Test that the management command writes to the routed alias."""
+        environ = {
+            "DJANGO_SUPERUSER_USERNAME": "admin",
+            "DJANGO_SUPERUSER_PASSWORD": "adminpass",
+        }
+        with mock.patch.dict(os.environ, environ):
+            call_command("create_initial_superuser", verbosity=0)
+
+        self.assertTrue(self.User.objects.using("other").filter(username="admin"))
+        self.assertFalse(self.User.objects.using("default").exists())
+
+    def test_seeding_uses_routed_database(self):
+        """Test that seed_users writes to the routed alias by default."""
+        inserted = seed_users(build_users([{"username": "user0"}], self.User))
+
+        self.assertEqual(inserted, 1)
+        self.assertTrue(self.User.objects.using("other").filter(username="user0"))
+        self.assertFalse(self.User.objects.using("default").exists())
+
+
+@override_settings(DATABASE_ROUTERS=["tests.routers.SplitReadWriteRouter"])
+class SplitReadWriteRouterTests(RouterTestCase):
+    """Test cases for a router with separate read and write databases."""
+
+    def test_check_reads_and_creation_writes(self):
+        """Test db_for_read for the existence check and db_for_write for the insert."""
+        user, default, other = self.login()
+
+        self.assertEqual(user._state.db, "default")
+        self.assertEqual(len(other), 1)
+        self.assertIn("is_superuser", other[0]["sql"])
+        self.assertTrue(
+            any(query["sql"].startswith("INSERT") for query in default.captured_queries)
+        )
+
+    def test_creation_rechecks_write_database(self):
+        """Test that a lagging read database cannot cause a second superuser."""
+        self.User.objects.db_manager("default").create_superuser(
+            username="existing", password="existingpass"
+        )
+        superuser_latch.reset()
+
+        # The read database has no superuser, but the write database does.
+        user = self.backend._create_initial_superuser(self.User, "admin", "adminpass")
+
+        self.assertIsNone(user)
+        self.assertEqual(self.User.objects.using("default").count(), 1)
+
+    def test_demotion_resets_read_and_write_databases(self):
+        """Test that demoting a superuser forgets both aliases and no others."""
+        superuser = self.User.objects.db_manager("default").create_superuser(
+            username="admin", password="adminpass"
+        )
+        for alias in ("default", "other", "tenant0"):
+            superuser_latch.set(alias)
+
+        superuser.is_superuser = False
+        superuser.save()
+
+        self.assertFalse(superuser_latch.is_set("default"))
+        self.assertFalse(superuser_latch.is_set("other"))
+        self.assertTrue(superuser_latch.is_set("tenant0"))
+
+
+@override_settings(
+    CREATE_INITIAL_SUPERUSER={"CACHE_ALIAS": "bootstrap"},
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "bootstrap": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "router-tests",
+        },
+    },
+)
+class PerDatabaseCacheTests(RouterTestCase):
+    """Test cases for the existence cache keyed per database alias."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        invalidate_superuser_exists()
+
+    def test_answers_are_independent(self):
+        """Test that each alias has its own cached answer."""
+        set_superuser_exists(True, "other")
+
+        self.assertIs(get_superuser_exists("other"), True)
+        self.assertIsNone(get_superuser_exists("default"))
+
+    def test_invalidate_all(self):
+        """Test that invalidating without an alias clears every database."""
+        set_superuser_exists(True, "default")
+        set_superuser_exists(False, "other")
+
+        invalidate_superuser_exists()
+
+        self.assertIsNone(get_superuser_exists("default"))
+        self.assertIsNone(get_superuser_exists("other"))
+
+    def test_existence_check_uses_alias_key(self):
+        """Test that the backend reads and writes the answer for its alias."""
+        set_superuser_exists(True, "default")
+
+        self.assertFalse(self.backend._superuser_exists(self.User, using="other"))
+        self.assertIs(get_superuser_exists("other"), False)
+
+    def test_deletion_invalidates_its_database_only(self):
+        """Test that deleting a superuser keeps the other aliases' answers."""
+        superuser = self.User.objects.db_manager("other").create_superuser(
+            username="admin", password="adminpass"
+        )
+        set_superuser_exists(True, "default")
+        set_superuser_exists(True, "other")
+
+        superuser.delete()
+
+        self.assertIs(get_superuser_exists("default"), True)
+        self.assertIsNone(get_superuser_exists("other"))
@@ -0,0 +1,180 @@
+"""Tests for streaming bulk user seeding."""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from create_initial_superuser.seeding import (
+    SeedError,
+    batched,
+    build_users,
+    read_csv,
+    read_jsonl,
+    seed_users,
+)
+
+
+class PipelineTests(SimpleTestCase):
+    """Test cases for the generator stages."""
+
+    def test_batched(self):
+        """Test that items are grouped without dropping the remainder."""
+        self.assertEqual(list(batched(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(batched([], 2)), [])
+
+    def test_readers_are_lazy(self):
+        """Test that readers consume the stream one row at a time."""
+        stream = StringIO("username\nalice\nbob\n")
+        rows = read_csv(stream)
+
+        self.assertEqual(next(rows), {"username": "alice"})
+        self.assertNotEqual(stream.tell(), len(stream.getvalue()))
+
+    def test_read_jsonl(self):
+        """Test that blank lines are skipped and bad lines reported."""
+        rows = read_jsonl(StringIO('{"username": "alice"}\n\n{"username": "bob"}\n'))
+        self.assertEqual([row["username"] for row in rows], ["alice", "bob"])
+
+        with self.assertRaisesMessage(SeedError, "line 2: invalid JSON"):
+            list(read_jsonl(StringIO('{"username": "alice"}\n{oops\n')))
+
+    @override_settings(
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+    )
+    def test_build_users(self):
+        """Test that rows become users with converted values and hashed passwords."""
+        rows = [
+            {"username": "alice", "password": "secret", "is_staff": "1"},
+            {"username": "bob"},
+        ]
+
+        alice, bob = build_users(rows)
+
+        self.assertTrue(alice.check_password("secret"))
+        self.assertIs(alice.is_staff, True)
+        self.assertFalse(bob.has_usable_password())
+
+    @override_settings(
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+    )
+    def test_build_users_in_processes(self):
+        """Test that pool hashing keeps input order and produces valid hashes."""
+        rows = [{"username": f"user{i}", "password": f"pw{i}"} for i in range(7)]
+        rows[3]["password"] = ""
+
+        users = list(build_users(rows, processes=2, chunk_size=2))
+
+        self.assertEqual(
+            [user.username for user in users], [r["username"] for r in rows]
+        )
+        self.assertTrue(users[6].check_password("pw6"))
+        self.assertTrue(users[0].password.startswith("md5$"))
+        self.assertFalse(users[3].has_usable_password())
+
+    def test_build_users_rejects_unknown_fields(self):
+        """Test that a misspelled column is reported with its row number."""
+        with self.assertRaisesMessage(SeedError, "row 1: unknown field(s) usrname"):
+            list(build_users([{"usrname": "alice"}]))
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class SeedUsersTests(TestCase):
+    """Test cases for batched insertion."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.User = get_user_model()
+
+    def users(self, count):
+        """Yield ``count`` unsaved users."""
+        return build_users({"username": f"user{i}"} for i in range(count))
+
+    def test_batches_and_transactions(self):
+        """Test one INSERT per batch and one savepoint pair per transaction."""
+        progress = []
+
+        # 3 batches of up to 2 users in 2 transactions: 3 INSERTs plus a
+        # SAVEPOINT and RELEASE for each transaction.
+        with self.assertNumQueries(7):
+            inserted = seed_users(
+                self.users(5),
+                batch_size=2,
+                transaction_batches=2,
+                progress=lambda count, elapsed: progress.append(count),
+            )
+
+        self.assertEqual(inserted, 5)
+        self.assertEqual(self.User.objects.count(), 5)
+        self.assertEqual(progress, [4, 5])
+
+    def test_ignore_conflicts(self):
+        """Test that existing usernames can be skipped."""
+        self.User.objects.create_user(username="user0")
+
+        seed_users(self.users(3), ignore_conflicts=True)
+
+        self.assertEqual(self.User.objects.count(), 3)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class SeedUsersCommandTests(TestCase):
+    """Test cases for the seed_users management command."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.User = get_user_model()
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def write(self, name, content):
+        """Write ``content`` to a file in the temporary directory."""
+        path = os.path.join(self.tempdir.name, name)
+        with open(path, "w", newline="") as f:
+            f.write(content)
+        return path
+
+    def test_csv(self):
+        """Test seeding from a CSV file and the rows/sec report."""
+        path = self.write(
+            "users.csv",
+            "username,email,password\n"
+            "alice,alice@example.com,secret\n"
+            "bob,bob@example.com,secret\n",
+        )
+        stdout = StringIO()
+
+        call_command("seed_users", path, "--batch-size", "1", stdout=stdout)
+
+        alice = self.User.objects.get(username="alice")
+        self.assertEqual(alice.email, "alice@example.com")
+        self.assertTrue(alice.check_password("secret"))
+        self.assertIn("rows/sec", stdout.getvalue())
+        self.assertIn("Seeded 2 users.", stdout.getvalue())
+
+    def test_jsonl(self):
+        """Test seeding from a JSONL file with an explicit format."""
+        lines = [json.dumps({"username": f"user{i}"}) for i in range(3)]
+        path = self.write("users.txt", "\n".join(lines))
+
+        call_command("seed_users", path, "--format", "jsonl", verbosity=0)
+
+        self.assertEqual(self.User.objects.count(), 3)
+
+    def test_unknown_format(self):
+        """Test that an unrecognised extension needs --format."""
+        path = self.write("users.txt", "")
+
+        with self.assertRaisesMessage(CommandError, "pass --format"):
+            call_command("seed_users", path)
+
+    def test_invalid_row(self):
+        """Test that bad rows surface as a CommandError."""
+        path = self.write("users.csv", "username,nickname\nalice,al\n")
+
+        with self.assertRaisesMessage(CommandError, "unknown field(s) nickname"):
+            call_command("seed_users", path, verbosity=0)
@@ -0,0 +1,237 @@
+"""Tests for per-tenant bootstrap with one database per tenant."""
+
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from asgiref.sync import sync_to_async
+
+from create_initial_superuser.backends import (
+    CreateInitialSuperUserBackend,
+    _current_request,
+)
+from create_initial_superuser.hashing import HashingExecutor, HashingExecutorSaturated
+from create_initial_superuser.state import SuperuserLatch, superuser_latch
+from tests.base import BootstrapTestCase
+
+# The tenant databases are declared in tests/settings.py.
+TENANTS = [f"tenant{i}" for i in range(8)]
+TENANT_USER_MIDDLEWARE = "create_initial_superuser.middleware.TenantUserMiddleware"
+
+
+class SuperuserLatchTests(SimpleTestCase):
+    """Test cases for the bounded least-recently-used latch."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest alias is evicted once the latch is full."""
+        latch = SuperuserLatch(max_size=2)
+        latch.set("a")
+        latch.set("b")
+        latch.is_set("a")
+
+        latch.set("c")
+
+        self.assertEqual(len(latch), 2)
+        self.assertTrue(latch.is_set("a"))
+        self.assertFalse(latch.is_set("b"))
+        self.assertTrue(latch.is_set("c"))
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"TENANT_STATE_SIZE": 3})
+    def test_size_from_config(self):
+        """Test that TENANT_STATE_SIZE bounds a latch without max_size."""
+        latch = SuperuserLatch()
+
+        for alias in TENANTS:
+            latch.set(alias)
+
+        self.assertEqual(len(latch), 3)
+        self.assertTrue(latch.is_set(TENANTS[-1]))
+
+    def test_reset(self):
+        """Test resetting one alias and every alias."""
+        latch = SuperuserLatch(max_size=4)
+        latch.set("a")
+        latch.set("b")
+
+        latch.reset("a")
+        self.assertFalse(latch.is_set("a"))
+        self.assertTrue(latch.is_set("b"))
+
+        latch.reset()
+        self.assertEqual(len(latch), 0)
+
+
+@override_settings(
+    DEBUG=True,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    CREATE_INITIAL_SUPERUSER={"TENANT_RESOLVER": "tests.routers.tenant_database"},
+)
+class TenantBootstrapTests(BootstrapTestCase):
+    """Test cases for bootstrapping a superuser in each tenant's database."""
+
+    databases = {"default", *TENANTS}
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+        self.factory = RequestFactory()
+
+    def login(self, tenant, username="admin", password="adminpass"):
+        """Authenticate a request for ``tenant`` and commit its callbacks."""
+        request = self.factory.post("/admin/login/")
+        request.tenant_db = tenant
+        with self.captureOnCommitCallbacks(using=tenant, execute=True):
+            return self.backend.authenticate(
+                request, username=username, password=password
+            )
+
+    def test_each_tenant_gets_its_own_superuser(self):
+        """Test that every tenant database bootstraps independently."""
+        for tenant in TENANTS:
+            user = self.login(tenant, username=f"admin-{tenant}")
+
+            self.assertTrue(user.is_superuser)
+            self.assertEqual(user._state.db, tenant)
+
+        for tenant in TENANTS:
+            self.assertEqual(
+                list(
+                    self.User.objects.using(tenant).values_list("username", flat=True)
+                ),
+                [f"admin-{tenant}"],
+            )
+        self.assertFalse(self.User.objects.using("default").exists())
+
+    def test_fallback_uses_tenant_database(self):
+        """Test that later logins authenticate against the tenant's database."""
+        self.login(TENANTS[0])
+
+        user = self.login(TENANTS[0])
+        self.assertEqual(user._state.db, TENANTS[0])
+        self.assertIsNone(self.login(TENANTS[0], password="wrong"))
+
+        # Another tenant has no such user yet, so it bootstraps its own.
+        other = self.login(TENANTS[1], username="someone-else")
+        self.assertEqual(other._state.db, TENANTS[1])
+
+    @override_settings(
+        CREATE_INITIAL_SUPERUSER={
+            "TENANT_RESOLVER": "tests.routers.tenant_database",
+            "TENANT_STATE_SIZE": 3,
+        }
+    )
+    def test_latch_is_bounded(self):
+        """Test that only the most recent tenants stay latched."""
+        for tenant in TENANTS:
+            self.login(tenant)
+
+        self.assertEqual(len(superuser_latch), 3)
+        for tenant in TENANTS[-3:]:
+            self.assertTrue(superuser_latch.is_set(tenant))
+
+        # A latched tenant skips the existence query; an evicted one repeats
+        # it before falling back.
+        with CaptureQueriesContext(connections[TENANTS[-1]]) as latched:
+            self.login(TENANTS[-1])
+        with CaptureQueriesContext(connections[TENANTS[0]]) as evicted:
+            self.login(TENANTS[0])
+
+        self.assertEqual(len(latched), 1)
+        self.assertEqual(len(evicted), 2)
+        self.assertIn("is_superuser", evicted[0]["sql"])
+        self.assertTrue(superuser_latch.is_set(TENANTS[0]))
+
+    def test_request_without_tenant(self):
+        """Test that a resolver returning None leaves the choice to the routers."""
+        user = self.backend.authenticate(
+            self.factory.post("/admin/login/"), username="admin", password="adminpass"
+        )
+
+        self.assertEqual(user._state.db, "default")
+
+    @override_settings(
+        CREATE_INITIAL_SUPERUSER={"TENANT_RESOLVER": "tests.routers.tenant_header"},
+        MIDDLEWARE=[TENANT_USER_MIDDLEWARE, *settings.MIDDLEWARE],
+    )
+    def test_admin_login_session_uses_tenant_database(self):
+        """Test that the session of a tenant's bootstrap login holds."""
+        with self.captureOnCommitCallbacks(using=TENANTS[0], execute=True):
+            response = self.client.post(
+                "/admin/login/",
+                {"username": "admin", "password": "adminpass"},
+                headers={"X-Tenant": TENANTS[0]},
+            )
+        self.assertEqual(response.status_code, 302)
+
+        response = self.client.get("/admin/", headers={"X-Tenant": TENANTS[0]})
+
+        self.assertEqual(response.status_code, 200)
+        user = response.wsgi_request.user
+        self.assertEqual(user.get_username(), "admin")
+        self.assertEqual(user._state.db, TENANTS[0])
+
+        # The same session is not a user of another tenant.
+        response = self.client.get("/admin/", headers={"X-Tenant": TENANTS[1]})
+        self.assertEqual(response.status_code, 302)
+
+    async def test_aget_user_uses_tenant_database(self):
+        """Test that the async session user lookup uses the tenant's database."""
+        user = await sync_to_async(
+            self.User.objects.db_manager(TENANTS[3]).create_user
+        )(username="admin", password="adminpass")
+        request = self.factory.get("/admin/")
+        request.tenant_db = TENANTS[3]
+
+        token = _current_request.set(request)
+        try:
+            loaded = await self.backend.aget_user(user.pk)
+        finally:
+            _current_request.reset(token)
+
+        self.assertEqual(loaded, user)
+        self.assertEqual(loaded._state.db, TENANTS[3])
+
+    async def test_aauthenticate_uses_tenant_database(self):
+        """Test that the async path creates and authenticates in the tenant."""
+        request = self.factory.post("/admin/login/")
+        request.tenant_db = TENANTS[2]
+
+        created = await self.backend.aauthenticate(
+            request, username="admin", password="adminpass"
+        )
+        user = await self.backend.aauthenticate(
+            request, username="admin", password="adminpass"
+        )
+
+        self.assertEqual(created._state.db, TENANTS[2])
+        self.assertEqual(user._state.db, TENANTS[2])
+        self.assertFalse(await self.User.objects.using("default").aexists())
+
+    @override_settings(
+        CREATE_INITIAL_SUPERUSER={
+            "TENANT_RESOLVER": "tests.routers.tenant_database",
+            "HASHING_EXECUTOR": {"MAX_WORKERS": 1, "MAX_QUEUE": 0},
+        }
+    )
+    async def test_aauthenticate_saturated_executor(self):
+        """Test that a saturated executor rejects a tenant login instead of raising."""
+        request = self.factory.post("/admin/login/")
+        request.tenant_db = TENANTS[3]
+        await sync_to_async(self.User.objects.db_manager(TENANTS[3]).create_user)(
+            username="admin", password="adminpass", is_superuser=True
+        )
+
+        with mock.patch.object(
+            HashingExecutor, "run", side_effect=HashingExecutorSaturated
+        ):
+            user = await self.backend.aauthenticate(
+                request, username="admin", password="adminpass"
+            )
+
+        self.assertIsNone(user)
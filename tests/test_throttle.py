@@ -0,0 +1,231 @@
+"""Tests for the credential attempt throttle."""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.conf import get_config
+from create_initial_superuser.instrumentation import get_sink
+from create_initial_superuser.throttle import TokenBucketThrottle, get_throttle
+from tests.base import BootstrapTestCase
+
+
+def forwarded_for(request):
+    """Key clients by the address appended by one trusted reverse proxy."""
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+    if forwarded:
+        return forwarded.rsplit(",", 1)[-1].strip()
+    return request.META.get("REMOTE_ADDR")
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TokenBucketThrottleTests(SimpleTestCase):
+    """Test cases for the token buckets."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.throttle = TokenBucketThrottle(
+            rate=1.0, burst=2, max_keys=3, clock=self.clock
+        )
+
+    def test_burst_then_refill(self):
+        """Test that a key allows ``burst`` attempts and then one per second."""
+        self.assertTrue(self.throttle.allow("a"))
+        self.assertTrue(self.throttle.allow("a"))
+        self.assertFalse(self.throttle.allow("a"))
+
+        self.clock.now += 1.0
+        self.assertTrue(self.throttle.allow("a"))
+        self.assertFalse(self.throttle.allow("a"))
+
+        # Refilling never exceeds the burst.
+        self.clock.now += 60.0
+        self.assertTrue(self.throttle.allow("a"))
+        self.assertTrue(self.throttle.allow("a"))
+        self.assertFalse(self.throttle.allow("a"))
+
+    def test_every_key_must_allow(self):
+        """Test that an empty bucket rejects without draining the others."""
+        self.throttle.allow("ip", "alice")
+        self.throttle.allow("ip", "bob")
+
+        self.assertFalse(self.throttle.allow("ip", "carol"))
+        # carol's token was not taken by the rejected attempt.
+        self.assertTrue(self.throttle.allow("other-ip", "carol"))
+        self.assertTrue(self.throttle.allow("other-ip", "carol"))
+
+    def test_keys_are_lru_bounded(self):
+        """Test that the least recently used bucket is evicted."""
+        for key in ("a", "b", "c"):
+            self.throttle.allow(key)
+        self.throttle.allow("a")
+
+        self.throttle.allow("d")
+
+        self.assertEqual(len(self.throttle), 3)
+        self.assertNotIn("b", self.throttle._buckets)
+        self.assertIn("a", self.throttle._buckets)
+
+    def test_allow_request(self):
+        """Test that requests are keyed by REMOTE_ADDR by default and username."""
+        request = RequestFactory().post("/", REMOTE_ADDR="192.0.2.1")
+
+        self.throttle.allow_request(request, "admin")
+        self.throttle.allow_request(request, "admin")
+
+        self.assertEqual(
+            set(self.throttle._buckets),
+            {("client", "192.0.2.1"), ("username", "admin")},
+        )
+        self.assertFalse(self.throttle.allow_request(request, "admin"))
+
+    def test_request_less_attempts_skip_client_bucket(self):
+        """Test that attempts without a request are only keyed by username."""
+        self.assertTrue(self.throttle.allow_request(None, "alice"))
+        self.assertTrue(self.throttle.allow_request(None, "alice"))
+        self.assertFalse(self.throttle.allow_request(None, "alice"))
+
+        # Other request-less callers are not throttled by alice's attempts.
+        self.assertTrue(self.throttle.allow_request(None, "bob"))
+        self.assertNotIn(("client", None), self.throttle._buckets)
+
+    def test_client_key(self):
+        """Test that a client key callable replaces REMOTE_ADDR."""
+        throttle = TokenBucketThrottle(burst=1, client_key=forwarded_for)
+        factory = RequestFactory()
+
+        # Two clients behind the same proxy get separate buckets.
+        for client in ("198.51.100.1", "198.51.100.2"):
+            request = factory.post(
+                "/",
+                REMOTE_ADDR="10.0.0.1",
+                HTTP_X_FORWARDED_FOR=f"203.0.113.9, {client}",
+            )
+            self.assertTrue(throttle.allow_request(request, client))
+
+        self.assertEqual(
+            {key for kind, key in throttle._buckets if kind == "client"},
+            {"198.51.100.1", "198.51.100.2"},
+        )
+
+
+@override_settings(
+    DEBUG=True,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    CREATE_INITIAL_SUPERUSER={
+        "THROTTLE": {"RATE": 0.001, "BURST": 2},
+        "INSTRUMENTATION": {"ENABLED": True},
+    },
+)
+class BackendThrottleTests(BootstrapTestCase):
+    """Test cases for the backend rejecting throttled attempts."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        super().setUp()
+        get_throttle().reset()
+        get_sink().reset()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+        self.factory = RequestFactory()
+
+    def login(self, username="admin", password="adminpass", address="192.0.2.1"):
+        """Authenticate a request from ``address``."""
+        request = self.factory.post("/admin/login/", REMOTE_ADDR=address)
+        return self.backend.authenticate(request, username=username, password=password)
+
+    def test_rejects_without_hashing_or_querying(self):
+        """Test that a throttled attempt returns None before any work."""
+        self.login(username="a")
+        self.login(username="b")
+
+        with mock.patch(
+            "create_initial_superuser.backends.make_password",
+            side_effect=AssertionError("password was hashed"),
+        ), mock.patch(
+            "create_initial_superuser.backends.check_password",
+            side_effect=AssertionError("password was checked"),
+        ):
+            with self.assertNumQueries(0):
+                self.assertIsNone(self.login(username="c"))
+
+        self.assertEqual(get_sink().snapshot()["outcomes"]["throttled"], 1)
+
+    def test_bootstrap_window_flood(self):
+        """Test that a flood before bootstrap reaches creation only ``burst`` times."""
+        with mock.patch.object(
+            self.backend, "_superuser_exists", return_value=False
+        ), mock.patch.object(
+            self.backend, "_create_initial_superuser", return_value=None
+        ) as create:
+            for i in range(20):
+                self.login(username=f"bot{i}")
+
+        self.assertEqual(create.call_count, 2)
+
+    def test_username_bucket_spans_clients(self):
+        """Test that one username is limited across client addresses."""
+        self.login(address="192.0.2.1")
+        self.login(address="192.0.2.2", password="wrong")
+
+        self.assertIsNone(self.login(address="192.0.2.3"))
+        self.login(username="other", address="192.0.2.3")
+
+        self.assertEqual(get_sink().snapshot()["outcomes"]["throttled"], 1)
+
+    async def test_aauthenticate_is_throttled(self):
+        """Test that the async path applies the same throttle."""
+        request = self.factory.post("/admin/login/", REMOTE_ADDR="192.0.2.9")
+        for _ in range(2):
+            await self.backend.aauthenticate(request, username="x", password="y")
+
+        user = await self.backend.aauthenticate(request, username="x", password="y")
+
+        self.assertIsNone(user)
+        self.assertEqual(get_sink().snapshot()["outcomes"]["throttled"], 1)
+
+    def test_client_key_option(self):
+        """Test that THROTTLE['CLIENT_KEY'] keys clients behind a proxy."""
+        options = {
+            "THROTTLE": {
+                "RATE": 0.001,
+                "BURST": 1,
+                "CLIENT_KEY": "tests.test_throttle.forwarded_for",
+            },
+            "INSTRUMENTATION": {"ENABLED": True},
+        }
+        with self.settings(CREATE_INITIAL_SUPERUSER=options):
+            self.assertIs(get_throttle().client_key, forwarded_for)
+
+            def login(username, client):
+                request = self.factory.post(
+                    "/admin/login/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=client
+                )
+                return self.backend.authenticate(
+                    request, username=username, password="wrong"
+                )
+
+            login("a", "198.51.100.1")
+            login("b", "198.51.100.2")
+            login("c", "198.51.100.1")
+
+        # Only the third attempt, from a client that had used its token, is
+        # throttled, even though all three came through the same proxy.
+        self.assertEqual(get_sink().snapshot()["outcomes"]["throttled"], 1)
+
+    def test_disabled_by_default(self):
+        """Test that no throttle is configured without the THROTTLE option."""
+        with self.settings(CREATE_INITIAL_SUPERUSER={}):
+            self.assertIsNone(get_config().throttle)
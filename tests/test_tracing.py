@@ -0,0 +1,180 @@
+"""Tests for the optional OpenTelemetry spans."""
+
+import sys
+import unittest
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from create_initial_superuser.backends import CreateInitialSuperUserBackend
+from create_initial_superuser.conf import get_config, invalidate_config
+from create_initial_superuser.state import superuser_latch
+from create_initial_superuser.tracing import (
+    ATTR_DATABASE,
+    ATTR_OUTCOME,
+    NOOP_SPAN,
+    NOOP_TRACER,
+    TRACER_NAME,
+    build_tracer,
+)
+from tests.base import BootstrapTestCase
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+except ImportError:  # pragma: no cover
+    exporter = None
+else:
+    # A provider of the tests' own, handed to SpanTests only: the global
+    # provider can be set once per process, and would then record the spans
+    # of every other test too.
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+class NoopTracerTests(SimpleTestCase):
+    """Test cases for the fallback when tracing is off or unavailable."""
+
+    def test_noop_span(self):
+        """Test that the no-op tracer hands out one shared, inert span."""
+        with NOOP_TRACER.start_as_current_span("anything") as span:
+            span.set_attribute(ATTR_OUTCOME, "created")
+
+        self.assertIs(span, NOOP_SPAN)
+        self.assertFalse(span.is_recording())
+
+    def test_disabled(self):
+        """Test that TRACING False selects the no-op tracer."""
+        self.assertIs(build_tracer(False), NOOP_TRACER)
+        with self.settings(CREATE_INITIAL_SUPERUSER={"TRACING": False}):
+            self.assertIs(get_config().tracer, NOOP_TRACER)
+
+    def test_without_opentelemetry(self):
+        """Test that a missing opentelemetry package falls back to the no-op tracer."""
+        with mock.patch.dict(sys.modules, {"opentelemetry": None}):
+            self.assertIs(build_tracer(True), NOOP_TRACER)
+
+    def test_invalid_option(self):
+        """Test that TRACING must be a boolean."""
+        with self.settings(CREATE_INITIAL_SUPERUSER={"TRACING": "yes"}):
+            with self.assertRaisesMessage(
+                ImproperlyConfigured, "TRACING must be True or False"
+            ):
+                get_config()
+
+
+@override_settings(DEBUG=True, PASSWORD_HASHERS=FAST_HASHERS)
+class NoopTracerLoginTests(BootstrapTestCase):
+    """Test cases for logins without a tracing API."""
+
+    def test_authenticate_without_opentelemetry(self):
+        """Test that logins work unchanged with the no-op tracer."""
+        backend = CreateInitialSuperUserBackend()
+        with mock.patch.dict(sys.modules, {"opentelemetry": None}):
+            with self.settings(CREATE_INITIAL_SUPERUSER={}):
+                self.assertIs(get_config().tracer, NOOP_TRACER)
+                with self.assertLogs("create_initial_superuser.events", "WARNING"):
+                    user = backend.authenticate(
+                        None, username="admin", password="adminpass"
+                    )
+
+        self.assertTrue(user.is_superuser)
+
+
+@unittest.skipIf(exporter is None, "opentelemetry-sdk is not installed")
+@override_settings(DEBUG=True, PASSWORD_HASHERS=FAST_HASHERS)
+class SpanTests(BootstrapTestCase):
+    """Test cases for the spans recorded around each authentication stage."""
+
+    def setUp(self):
+        """Set up test fixtures, building the config with the local tracer."""
+        super().setUp()
+        tracer = provider.get_tracer(TRACER_NAME)
+        patcher = mock.patch(
+            "create_initial_superuser.tracing.build_tracer",
+            lambda enabled: tracer if enabled else NOOP_TRACER,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(invalidate_config)
+        invalidate_config()
+        exporter.clear()
+        self.User = get_user_model()
+        self.backend = CreateInitialSuperUserBackend()
+
+    def spans(self):
+        """Return the finished spans by short name, checking their parent."""
+        finished = exporter.get_finished_spans()
+        root = finished[-1]
+        self.assertEqual(root.name, "create_initial_superuser.authenticate")
+        for span in finished[:-1]:
+            self.assertEqual(span.parent.span_id, root.context.span_id)
+        return {span.name.rsplit(".", 1)[1]: dict(span.attributes) for span in finished}
+
+    def test_creation(self):
+        """Test the spans of the login that creates the initial superuser."""
+        self.backend.authenticate(None, username="admin", password="adminpass")
+
+        spans = self.spans()
+        self.assertEqual(list(spans), ["exists", "hash", "insert", "authenticate"])
+        self.assertEqual(
+            spans["exists"], {ATTR_DATABASE: "default", ATTR_OUTCOME: "exists_query"}
+        )
+        self.assertEqual(spans["hash"], {ATTR_DATABASE: "default"})
+        self.assertEqual(
+            spans["insert"], {ATTR_DATABASE: "default", ATTR_OUTCOME: "created"}
+        )
+        self.assertEqual(
+            spans["authenticate"], {ATTR_DATABASE: "default", ATTR_OUTCOME: "created"}
+        )
+
+    def test_fallback(self):
+        """Test the spans of a login once a superuser exists."""
+        self.User.objects.create_superuser(username="admin", password="adminpass")
+        superuser_latch.set()
+
+        self.backend.authenticate(None, username="admin", password="adminpass")
+
+        spans = self.spans()
+        self.assertEqual(list(spans), ["exists", "fallback", "authenticate"])
+        self.assertEqual(spans["exists"][ATTR_OUTCOME], "latch_hit")
+        self.assertEqual(
+            spans["fallback"], {ATTR_DATABASE: "default", ATTR_OUTCOME: "fell_back"}
+        )
+        self.assertEqual(spans["authenticate"][ATTR_OUTCOME], "fell_back")
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"THROTTLE": {"BURST": 1}})
+    def test_throttled(self):
+        """Test that a throttled login has a single span with its outcome."""
+        request = RequestFactory().post("/")
+        self.backend.authenticate(request, username="admin", password="wrongpass")
+        exporter.clear()
+
+        self.backend.authenticate(request, username="admin", password="wrongpass")
+
+        (span,) = exporter.get_finished_spans()
+        self.assertEqual(span.attributes[ATTR_OUTCOME], "throttled")
+
+    @override_settings(CREATE_INITIAL_SUPERUSER={"TRACING": False})
+    def test_tracing_disabled(self):
+        """Test that no spans are recorded with TRACING off."""
+        self.backend.authenticate(None, username="admin", password="adminpass")
+
+        self.assertEqual(exporter.get_finished_spans(), ())
+
+    async def test_async_creation(self):
+        """Test that the async path records the same spans."""
+        await self.backend.aauthenticate(None, username="admin", password="adminpass")
+
+        spans = self.spans()
+        self.assertEqual(list(spans), ["exists", "hash", "insert", "authenticate"])
+        self.assertEqual(spans["hash"], {ATTR_DATABASE: "default"})
+        self.assertEqual(spans["authenticate"][ATTR_OUTCOME], "created")
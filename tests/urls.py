@@ -1,8 +1,13 @@
 """URL configuration for tests."""
 
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
+
+from tests import views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("bootstrap/", include("create_initial_superuser.urls")),
+    path("async-login/", views.async_login),
+    path("home/", views.home),
 ]
@@ -0,0 +1,31 @@
+"""Views for tests."""
+
+from django.http import HttpResponse, JsonResponse
+
+try:
+    from django.contrib.auth import aauthenticate
+except ImportError:  # Django < 5.0
+    aauthenticate = None
+
+
+async def async_login(request):
+    """Authenticate the posted credentials through the async auth path."""
+    user = await aauthenticate(
+        request,
+        username=request.POST.get("username", ""),
+        password=request.POST.get("password", ""),
+    )
+    if user is None:
+        return JsonResponse({"authenticated": False})
+    return JsonResponse(
+        {
+            "authenticated": True,
+            "username": user.get_username(),
+            "is_superuser": user.is_superuser,
+        }
+    )
+
+
+def home(request):
+    """A plain page for the first-run middleware tests."""
+    return HttpResponse("home")